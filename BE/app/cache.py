@@ -0,0 +1,115 @@
+"""
+Caché en memoria con expiración (TTL) para consultas de lectura frecuente.
+Cada proceso worker mantiene su propia copia; las rutas de escritura la invalidan
+y el TTL acota el tiempo que otro worker puede servir datos desactualizados.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List
+
+# Tiempo de vida por defecto de cada entrada, en segundos
+CACHE_TTL = float(os.getenv("CACHE_TTL", "60"))
+# Workers de uvicorn: la invalidación de una escritura solo alcanza al worker que la atendió
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+_SIN_VALOR = object()
+_CACHES: List["TTLCache"] = []
+
+
+class TTLCache:
+    """
+    Caché LRU con tiempo de vida por entrada, segura entre hilos del threadpool.
+    Con ttl <= 0 queda desactivada: obtener_o_calcular siempre calcula y no guarda.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._datos: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Se incrementa en cada invalidación para descartar cálculos en curso
+        self._generacion = 0
+        _CACHES.append(self)
+
+    def get(self, clave: Hashable, default: Any = None) -> Any:
+        """Obtiene un valor vigente o `default` si no existe o expiró"""
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return default
+            expira, valor = entrada
+            if expira < time.monotonic():
+                del self._datos[clave]
+                return default
+            self._datos.move_to_end(clave)
+            return valor
+
+    def set(self, clave: Hashable, valor: Any) -> None:
+        """Guarda un valor, descartando el menos usado si se supera maxsize"""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._guardar(clave, valor)
+
+    def obtener_o_calcular(self, clave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor en caché o lo calcula y guarda.
+        Si hubo una invalidación mientras se calculaba, el resultado no se guarda.
+        """
+        if self.ttl <= 0:
+            return calcular()
+
+        valor = self.get(clave, _SIN_VALOR)
+        if valor is not _SIN_VALOR:
+            return valor
+
+        generacion = self._generacion
+        valor = calcular()
+        with self._lock:
+            if generacion == self._generacion:
+                self._guardar(clave, valor)
+        return valor
+
+    def clear(self) -> None:
+        """Invalida todas las entradas"""
+        with self._lock:
+            self._datos.clear()
+            self._generacion += 1
+
+    def _guardar(self, clave: Hashable, valor: Any) -> None:
+        self._datos[clave] = (time.monotonic() + self.ttl, valor)
+        self._datos.move_to_end(clave)
+        while len(self._datos) > self.maxsize:
+            self._datos.popitem(last=False)
+
+
+def limpiar_caches() -> None:
+    """Invalida todas las cachés registradas (p.ej. al recrear la base de datos en tests)"""
+    for cache in _CACHES:
+        cache.clear()
+
+
+# =========================================================
+# 🟦 CACHÉS DE LA APLICACIÓN
+# =========================================================
+# Listados que el frontend relee para sus selectores justo después de guardar: con
+# varios workers otro worker serviría el listado anterior, así que solo se cachean
+# (con TTL corto) cuando hay un único worker
+TTL_LISTADOS = 30 if WEB_CONCURRENCY == 1 else 0
+cache_catalogo_cuentas = TTLCache(ttl=TTL_LISTADOS)
+cache_clientes = TTLCache(ttl=TTL_LISTADOS)
+# Resumen de conteos de clientes para el dashboard (se invalida al escribir clientes)
+cache_estadisticas_clientes = TTLCache(ttl=30, maxsize=1)
+# Estadísticas y top de clientes de facturación (se invalidan al escribir facturas)
+cache_estadisticas_facturas = TTLCache()
+# Estadísticas del catálogo de productos (se invalidan al escribir productos o facturas)
+cache_estadisticas_productos = TTLCache()
+# Resumen del libro mayor (se invalida al escribir transacciones, asientos o cuentas;
+# el TTL corto acota lo que otro worker puede servir sin un asiento recién registrado)
+cache_libro_mayor = TTLCache(ttl=30)
+# Períodos abiertos para los desplegables del frontend
+cache_periodos_activos = TTLCache(ttl=30, maxsize=1)
+# PDFs de facturas indexados por ETag (el ETag cambia si cambia el contenido)
+cache_pdf_facturas = TTLCache(ttl=3600, maxsize=64)
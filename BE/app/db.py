@@ -14,10 +14,17 @@ load_dotenv()
 # Detectar modo test
 TESTING = os.getenv("TESTING", "false").lower() == "true"
 
+# Tamaño de la caché LRU de sentencias compiladas de SQLAlchemy (500 por defecto)
+QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+
 if TESTING:
     # En modo test, usar SQLite en memoria
     DATABASE_URL = "sqlite:///./test.db"
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
 else:
     # En producción, usar PostgreSQL
     POSTGRES_USER = os.getenv("POSTGRES_USER", "contable")
@@ -25,10 +32,29 @@ else:
     POSTGRES_HOST = os.getenv("POSTGRES_HOST", "contable_db17")
     POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
     POSTGRES_DB = os.getenv("POSTGRES_DB", "contable_db")
+    # Driver del dialecto PostgreSQL (psycopg2 por defecto; p.ej. psqlpy si está instalado)
+    DB_DRIVER = os.getenv("DB_DRIVER", "psycopg2")
     
     # Construir URL de base de datos para PostgreSQL
-    DATABASE_URL = f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
-    engine = create_engine(DATABASE_URL)
+    DATABASE_URL = f"postgresql+{DB_DRIVER}://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+
+    # Pool de conexiones: (DB_POOL_SIZE + DB_MAX_OVERFLOW) x número de workers
+    # no debe superar max_connections de PostgreSQL. Con el pool agotado, las
+    # peticiones fallan tras DB_POOL_TIMEOUT segundos en lugar de encolarse 30 s.
+    # Compatible con PgBouncer en modo transacción: psycopg2 no usa sentencias
+    # preparadas en el servidor. yield_per (stream_results) sí abre un cursor con
+    # nombre del lado servidor (DECLARE ... WITHOUT HOLD): solo es válido dentro de
+    # la transacción que lo creó, así que debe leerse completo antes de commit/rollback
+    # y nunca reutilizarse entre transacciones
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "3600")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "5")),
+        pool_pre_ping=True,
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
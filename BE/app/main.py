@@ -2,82 +2,164 @@
 Aplicación principal FastAPI para el sistema contable.
 Configura la API, middleware y rutas.
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from BE.app.routes import (
-    catalogo_cuentas, 
-    transacciones, 
-    asientos, 
-    reportes, 
-    periodos, 
-    factura_routes, 
-    libro_mayor,
-    cliente_routes,
-    producto_routes
+from BE.app.db import create_tables, engine
+# Los modelos se importan de inmediato para registrar las tablas en Base.metadata
+# (create_tables y los tests dependen de ello); son ligeros frente a los routers
+from BE.app.models import (  # noqa: F401
+    asiento,
+    catalogo_cuentas,
+    cliente,
+    factura_detalle,
+    factura_models,
+    periodo,
+    producto_servicio,
+    transaccion,
 )
-from BE.app.db import create_tables
+from anyio import to_thread
+import asyncio
+import importlib
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 # Detectar si estamos en modo test
 TESTING = os.getenv("TESTING", "false").lower() == "true"
 
+# Hilos disponibles para los endpoints síncronos (sesiones SQLAlchemy bloqueantes).
+# AnyIO limita por defecto a 40; debe ser >= al tamaño del pool de conexiones.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+
+# En producción (ENV=prod) no se exponen /docs, /redoc ni /openapi.json,
+# evitando construir el esquema OpenAPI de todos los routers
+PRODUCCION = os.getenv("ENV", "dev").lower() == "prod"
+DOCS_URL = None if PRODUCCION else "/docs"
+
+# Creación de tablas al arrancar: "sync" (bloqueante, por defecto), "async" (en segundo
+# plano) u "off" cuando el esquema se gestiona con inicializacion_completa_bd.sql.
+# Cada worker ejecuta el lifespan: con varios workers (WEB_CONCURRENCY > 1) usar "off"
+# y crear el esquema antes de arrancarlos (script SQL o un único paso previo), para que
+# los workers no compitan creando las mismas tablas ni atiendan peticiones sin ellas
+RUN_MIGRATIONS = os.getenv("RUN_MIGRATIONS", "sync").lower()
+
+# Routers de la API (módulos en BE.app.routes). Se importan en el lifespan para que
+# `import BE.app.main` no cargue servicios, esquemas ni ReportLab/xlsxwriter
+ROUTERS = (
+    "catalogo_cuentas",
+    "transacciones",
+    "asientos",
+    "reportes",
+    "periodos",
+    "factura_routes",
+    "libro_mayor",
+    "cliente_routes",
+    "producto_routes",
+)
+
+
+def incluir_routers(app: FastAPI):
+    """Importar y registrar los routers de la API (solo la primera vez)"""
+    if getattr(app.state, "routers_incluidos", False):
+        return
+    for modulo in ROUTERS:
+        app.include_router(importlib.import_module(f"BE.app.routes.{modulo}").router)
+    app.state.routers_incluidos = True
+
+
+# Módulos de BE.app.schemas con MODELOS_DIFERIDOS (schemas de respuesta con defer_build)
+SCHEMAS_DIFERIDOS = ("libro_mayor", "factura_schemas")
+
+
+def _registrar_error_migraciones(tarea: asyncio.Task):
+    """Registra en el log el fallo de la creación de tablas en segundo plano"""
+    if not tarea.cancelled() and tarea.exception() is not None:
+        logger.error("Error al crear las tablas al arrancar", exc_info=tarea.exception())
+
+
+def precalentar_schemas():
+    """Construye los schemas de respuesta diferidos (defer_build) fuera del arranque"""
+    for modulo in SCHEMAS_DIFERIDOS:
+        for modelo in importlib.import_module(f"BE.app.schemas.{modulo}").MODELOS_DIFERIDOS:
+            modelo.model_rebuild()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Ciclo de vida de la aplicación: configuración al arrancar y limpieza al apagar"""
+    # Los endpoints usan sesiones síncronas: FastAPI los ejecuta en el threadpool de AnyIO
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+    # El lifespan se ejecuta una vez por worker (y por cada TestClient en los tests)
+    incluir_routers(app)
+
+    # Configuración efectiva del pool de conexiones de este worker
+    logger.info(f"Pool de conexiones: {engine.pool.status()}")
+
+    # Los schemas diferidos se construyen en segundo plano ya aceptando peticiones
+    app.state.tarea_schemas = asyncio.create_task(asyncio.to_thread(precalentar_schemas))
+
+    # No crear tablas en modo test (los tests usan su propia BD)
+    if not TESTING:
+        if RUN_MIGRATIONS == "async":
+            # Se guarda la referencia para que la tarea no sea recolectada
+            app.state.tarea_migraciones = asyncio.create_task(asyncio.to_thread(create_tables))
+            app.state.tarea_migraciones.add_done_callback(_registrar_error_migraciones)
+        elif RUN_MIGRATIONS == "sync":
+            create_tables()
+
+    # Los TypeAdapters de response_model se construyen al registrar las rutas;
+    # el esquema OpenAPI se genera en segundo plano para no pagarlo en /docs
+    if not PRODUCCION and not TESTING:
+        app.state.tarea_openapi = asyncio.create_task(asyncio.to_thread(app.openapi))
+    yield
+
+    # Al apagar: terminar los procesos de PDF/Excel para no dejarlos huérfanos
+    importlib.import_module("BE.app.routes.factura_routes").cerrar_pool_documentos()
+
+
 # Inicializar aplicación FastAPI
 app = FastAPI(
     title="Sistema Contable API",
     description="API para sistema de contabilidad con transacciones y asientos",
     version="1.0.0",
+    lifespan=lifespan,
+    openapi_url=None if PRODUCCION else "/openapi.json",
+    docs_url=DOCS_URL,
+    redoc_url=None if PRODUCCION else "/redoc",
 )
 
-# Configurar CORS - Permite todos los orígenes para desarrollo
-# TODO: Configurar orígenes específicos para producción
+# Configurar CORS - Orígenes permitidos separados por coma (por defecto el frontend Streamlit)
+CORS_ORIGINS = [
+    origen.strip()
+    for origen in os.getenv("CORS_ORIGINS", "http://localhost:8501").split(",")
+    if origen.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_credentials=False,
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+    allow_headers=["Content-Type", "Accept", "If-None-Match"],
 )
 
-# Incluir rutas de la API
-app.include_router(catalogo_cuentas.router)
-app.include_router(transacciones.router)
-app.include_router(asientos.router)
-app.include_router(reportes.router)
-app.include_router(periodos.router)
-app.include_router(factura_routes.router)
-app.include_router(libro_mayor.router)
-app.include_router(cliente_routes.router)
-app.include_router(producto_routes.router)
-
-@app.on_event("startup")
-def startup_event():
-    """Inicializar tablas de la base de datos al arrancar"""
-    # No crear tablas en modo test (los tests usan su propia BD)
-    if not TESTING:
-        create_tables()
+# Las rutas de la API se incluyen en el lifespan (ver incluir_routers)
 
+# Los endpoints sin acceso a BD son async: se atienden en el event loop sin
+# ocupar hilos del threadpool reservado a las sesiones síncronas
 @app.get("/")
-def read_root():
+async def read_root():
     """Endpoint raíz con información de la API"""
     return {
         "message": "Sistema Contable API",
         "version": "1.0.0",
-        "docs_url": "/docs",
-        "endpoints": {
-            "catalogo_cuentas": "/api/catalogo-cuentas",
-            "transacciones": "/api/transacciones", 
-            "asientos": "/api/asientos",
-            "reportes": "/api/reportes",
-            "periodos": "/api/periodos",
-            "facturas": "/api/facturas",
-            "libro_mayor": "/api/libro_mayor",
-            "clientes": "/api/clientes",
-            "productos": "/api/productos"
-        }
+        "docs_url": DOCS_URL,
     }
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """Endpoint de verificación de salud"""
     return {"status": "healthy"}
 
@@ -85,5 +167,5 @@ def health_check():
 # Leer PORT_BE desde .env usando python-dotenv
 # uvicorn app.main:app --host 0.0.0.0 --port ${PORT_BE} --reload
 
-# En producción, el Dockerfile especificará el comando CMD
-# TODO: Usar gunicorn/uvicorn workers en producción para mejor rendimiento
\ No newline at end of file
+# En producción, el Dockerfile ejecuta uvicorn con uvloop/httptools y
+# WEB_CONCURRENCY procesos worker
\ No newline at end of file
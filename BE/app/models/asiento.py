@@ -2,21 +2,26 @@
 Modelo SQLAlchemy para Asientos Contables.
 Define la estructura de la tabla de asientos contables.
 """
-from sqlalchemy import Column, Integer, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from BE.app.db import Base
+from BE.app.models.tipos import Centavos
 
 
 class Asiento(Base):
     __tablename__ = "asientos"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Filtros de listar_asientos: id_transaccion (solo o con id_cuenta) e id_cuenta
+        Index("idx_asientos_transaccion_cuenta", "id_transaccion", "id_cuenta"),
+        Index("idx_asientos_cuenta", "id_cuenta"),
+    )
     
     id_asiento = Column(Integer, primary_key=True, autoincrement=True)
     id_transaccion = Column(Integer, ForeignKey("transacciones.id_transaccion"), nullable=False)
     id_cuenta = Column(Integer, ForeignKey("catalogo_cuentas.id_cuenta"), nullable=False)
-    debe = Column(Numeric(15, 2), nullable=False, default=0.00)
-    haber = Column(Numeric(15, 2), nullable=False, default=0.00)
+    debe = Column(Centavos, nullable=False, default=0.00)
+    haber = Column(Centavos, nullable=False, default=0.00)
     
     # Relaciones
     transaccion = relationship("Transaccion", back_populates="asientos")
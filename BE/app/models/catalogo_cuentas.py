@@ -2,17 +2,22 @@
 Modelo SQLAlchemy para Catálogo de Cuentas.
 Define la estructura de la tabla de catálogo de cuentas.
 """
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Computed, Integer, String
 from BE.app.db import Base
 
 class CatalogoCuentas(Base):
     __tablename__ = "catalogo_cuentas"
-    __table_args__ = {'extend_existing': True}
     
     id_cuenta = Column(Integer, primary_key=True, autoincrement=True)
     codigo_cuenta = Column(String(20), unique=True, nullable=False, index=True)
     nombre_cuenta = Column(String(100), nullable=False)
     tipo_cuenta = Column(String(50), nullable=False)  # Activo, Pasivo, Capital, Ingreso, Egreso
+
+    # Código de cuenta mayor precalculado para las agrupaciones más usadas del
+    # libro mayor (primeros N dígitos, completado con ceros si el código es más corto)
+    codigo_mayor_2 = Column(String(2), Computed("substr(codigo_cuenta || '0000000000', 1, 2)", persisted=True), index=True)
+    codigo_mayor_4 = Column(String(4), Computed("substr(codigo_cuenta || '0000000000', 1, 4)", persisted=True), index=True)
+    codigo_mayor_6 = Column(String(6), Computed("substr(codigo_cuenta || '0000000000', 1, 6)", persisted=True), index=True)
     
     def __repr__(self):
         return f"<CatalogoCuentas(codigo='{self.codigo_cuenta}', nombre='{self.nombre_cuenta}', tipo='{self.tipo_cuenta}')>"
\ No newline at end of file
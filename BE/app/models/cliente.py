@@ -2,7 +2,7 @@
 Modelo de Cliente para el sistema de facturación.
 Tabla normalizada de clientes reutilizables.
 """
-from sqlalchemy import Column, String, Integer, TIMESTAMP, Text
+from sqlalchemy import Boolean, Column, Index, String, Integer, TIMESTAMP, Text, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -11,12 +11,21 @@ from BE.app.db import Base
 
 class Cliente(Base):
     __tablename__ = "clientes"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Orden y paginación por keyset de listar_clientes
+        Index("idx_clientes_nombre_id", "nombre", "id_cliente"),
+        # Índice parcial para el listado habitual (activo=SI ordenado por nombre)
+        Index(
+            "idx_clientes_activos_nombre_id", "nombre", "id_cliente",
+            postgresql_where=text("activo"),
+            sqlite_where=text("activo"),
+        ),
+    )
 
     id_cliente = Column(Integer, primary_key=True, autoincrement=True)
     
     # Información básica
-    nombre = Column(String(150), nullable=False, index=True)
+    nombre = Column(String(150), nullable=False)
     nit = Column(String(20), nullable=True, unique=True, index=True)
     
     # Contacto
@@ -30,7 +39,7 @@ class Cliente(Base):
     
     # Auditoría 
     fecha_registro = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False) 
-    activo = Column(String(10), nullable=False, default="SI")  # SI, NO
+    activo = Column(Boolean, nullable=False, default=True)  # Expuesto como SI/NO en la API
     
     # Relaciones
     facturas = relationship("Factura", back_populates="cliente_obj")
@@ -7,11 +7,11 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from BE.app.db import Base
+from BE.app.models.tipos import Centavos
 
 
 class FacturaDetalle(Base):
     __tablename__ = "factura_detalle"
-    __table_args__ = {'extend_existing': True}
 
     id_detalle = Column(Integer, primary_key=True, autoincrement=True)
     
@@ -33,16 +33,16 @@ class FacturaDetalle(Base):
     # Detalles del ítem
     descripcion = Column(Text, nullable=True)  # Descripción adicional o personalizada
     cantidad = Column(Numeric(12, 2), nullable=False, default=1.00)
-    precio_unitario = Column(Numeric(12, 2), nullable=False)
+    precio_unitario = Column(Centavos, nullable=False)
     
     # Descuentos a nivel de línea
     descuento_porcentaje = Column(Numeric(5, 2), nullable=True, default=0.00)  # Ej: 10.00 = 10%
-    descuento_monto = Column(Numeric(12, 2), nullable=True, default=0.00)
+    descuento_monto = Column(Centavos, nullable=True, default=0.00)
     
     # Subtotal e IVA por línea
-    subtotal = Column(Numeric(12, 2), nullable=False)  # cantidad * precio_unitario - descuento
-    iva = Column(Numeric(12, 2), nullable=False, default=0.00)
-    total = Column(Numeric(12, 2), nullable=False)  # subtotal + iva
+    subtotal = Column(Centavos, nullable=False)  # cantidad * precio_unitario - descuento
+    iva = Column(Centavos, nullable=False, default=0.00)
+    total = Column(Centavos, nullable=False)  # subtotal + iva
     
     # Relaciones
     factura = relationship("Factura", back_populates="detalles")
@@ -1,15 +1,16 @@
-from sqlalchemy import Column, String, Numeric, TIMESTAMP, ForeignKey, Text, Integer
+from sqlalchemy import Column, String, TIMESTAMP, ForeignKey, Text, Integer, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 
 from BE.app.db import Base
+from BE.app.models.tipos import Centavos
 
 
 class Factura(Base):
     __tablename__ = "facturas"
-    __table_args__ = {'extend_existing': True}
 
     id_factura = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     numero_factura = Column(String(50), nullable=False, unique=True)
@@ -30,10 +31,10 @@ class Factura(Base):
     email_cliente = Column(String(100), nullable=True)  # Deprecar
     
     # Montos (calculados desde factura_detalle)
-    subtotal = Column(Numeric(12, 2), nullable=False, default=0.00)
-    descuento = Column(Numeric(12, 2), nullable=False, default=0.00)
-    iva = Column(Numeric(12, 2), nullable=False, default=0.00)  # IVA 13%
-    monto_total = Column(Numeric(12, 2), nullable=False)
+    subtotal = Column(Centavos, nullable=False, default=0.00)
+    descuento = Column(Centavos, nullable=False, default=0.00)
+    iva = Column(Centavos, nullable=False, default=0.00)  # IVA 13%
+    monto_total = Column(Centavos, nullable=False)
     
     # Producto o Servicio (DEPRECAR - usar factura_detalle)
     producto_servicio = Column(Text, nullable=True)  # Mantener para facturas legacy
@@ -44,7 +45,13 @@ class Factura(Base):
     vendedor = Column(String(100), nullable=True)
     
     # Fechas 
-    fecha_emision = Column(TIMESTAMP,  server_default=func.now(), nullable=False)
+    # En SQLite (tests) se guarda sin microsegundos, igual que CURRENT_TIMESTAMP,
+    # para que las comparaciones del cursor de listar_facturas sean consistentes
+    fecha_emision = Column(
+        TIMESTAMP().with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite"),
+        server_default=func.now(),
+        nullable=False
+    )
     fecha_vencimiento = Column(TIMESTAMP, nullable=True)
     
     # Relación con transacciones (opcional)
@@ -53,4 +60,18 @@ class Factura(Base):
     # Relaciones
     cliente_obj = relationship("Cliente", back_populates="facturas")
     detalles = relationship("FacturaDetalle", back_populates="factura", cascade="all, delete-orphan")
+    transaccion = relationship("Transaccion")  # Cargar con joinedload cuando se necesite
+
+    __table_args__ = (
+        # Orden de listar_facturas: más recientes primero, id_factura como desempate
+        Index("idx_facturas_fecha_id", fecha_emision.desc(), id_factura.desc()),
+    )
+
+
+class FacturaContador(Base):
+    """Último correlativo de factura emitido por año (FACT-YYYY-NNNN)"""
+    __tablename__ = "factura_contador"
+
+    anio = Column(Integer, primary_key=True, autoincrement=False)
+    ultimo = Column(Integer, nullable=False)
 
@@ -2,7 +2,7 @@
 Modelo de Producto/Servicio para el sistema de facturación.
 Catálogo de productos y servicios vendibles.
 """
-from sqlalchemy import Column, String, Integer, Numeric, TIMESTAMP, Text
+from sqlalchemy import Boolean, Column, Index, String, Integer, Numeric, TIMESTAMP, Text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -11,13 +11,12 @@ from BE.app.db import Base
 
 class ProductoServicio(Base):
     __tablename__ = "productos_servicios"
-    __table_args__ = {'extend_existing': True}
 
     id_producto = Column(Integer, primary_key=True, autoincrement=True)
     
     # Información básica
     codigo = Column(String(50), nullable=True, unique=True, index=True)  # SKU o código interno
-    nombre = Column(String(150), nullable=False, index=True)
+    nombre = Column(String(150), nullable=False)
     descripcion = Column(Text, nullable=True)
     
     # Tipo
@@ -34,13 +33,25 @@ class ProductoServicio(Base):
     stock_minimo = Column(Numeric(12, 2), nullable=True, default=0.00)
     
     # Impuestos
-    aplica_iva = Column(String(10), nullable=False, default="SI")  # SI, NO
+    aplica_iva = Column(Boolean, nullable=False, default=True)  # Expuesto como SI/NO en la API
     
     # Estado
-    activo = Column(String(10), nullable=False, default="SI")  # SI, NO
+    activo = Column(Boolean, nullable=False, default=True)  # Expuesto como SI/NO en la API
     
     # Auditoría
     fecha_registro = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     
     # Relaciones
     detalles_factura = relationship("FacturaDetalle", back_populates="producto")
+
+    __table_args__ = (
+        # Listado: orden y paginación por keyset de listar_productos
+        Index("idx_productos_nombre_id", nombre, id_producto),
+        # Alertas de bajo stock: índice parcial en el orden de la paginación por keyset
+        Index(
+            "idx_productos_bajo_stock",
+            stock_actual,
+            id_producto,
+            postgresql_where=(tipo == "PRODUCTO") & activo & (stock_actual < stock_minimo),
+        ),
+    )
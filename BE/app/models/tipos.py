@@ -0,0 +1,30 @@
+"""
+Tipos de columna SQLAlchemy compartidos por los modelos.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+
+_CENTAVO = Decimal("0.01")
+
+
+class Centavos(TypeDecorator):
+    """
+    Monto monetario almacenado como BIGINT en centavos.
+    En Python se maneja como Decimal con 2 decimales, igual que Numeric(12, 2):
+    la conversión ocurre solo al enviar/leer valores, y SUM()/AVG() en SQL
+    operan sobre enteros de 8 bytes en lugar de NUMERIC.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int((Decimal(str(value)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return (Decimal(str(value)) / 100).quantize(_CENTAVO, rounding=ROUND_HALF_UP)
@@ -2,21 +2,20 @@
 Modelo SQLAlchemy para Transacciones.
 Define la estructura de la tabla de transacciones.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, DateTime, Text, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from BE.app.db import Base
 
 class Transaccion(Base):
     __tablename__ = "transacciones"
-    __table_args__ = {'extend_existing': True}
     
     id_transaccion = Column(Integer, primary_key=True, autoincrement=True)
     fecha_transaccion = Column(DateTime, nullable=False)
     descripcion = Column(Text, nullable=False)
     tipo = Column(String(10), nullable=False)  # INGRESO, EGRESO
     moneda = Column(String(3), nullable=False, default='USD')
-    fecha_creacion = Column(DateTime, nullable=False, default=func.now())
+    fecha_creacion = Column(DateTime, nullable=False, server_default=func.now())
     usuario_creacion = Column(String(50), nullable=False)
     id_periodo = Column(Integer, ForeignKey("periodos_contables.id_periodo"))
     categoria = Column(String, nullable=False)
@@ -24,6 +23,14 @@ class Transaccion(Base):
     # Relaciones
     periodo = relationship("PeriodoContable", back_populates="transacciones")
     asientos = relationship("Asiento", back_populates="transaccion", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Orden de get_transacciones: más recientes primero, id_transaccion como desempate,
+        # solo o precedido de los filtros por período y por tipo/categoría
+        Index("idx_transacciones_fecha_id", fecha_transaccion.desc(), id_transaccion.desc()),
+        Index("idx_transacciones_periodo_fecha", id_periodo, fecha_transaccion.desc(), id_transaccion.desc()),
+        Index("idx_transacciones_tipo_categoria_fecha", tipo, categoria, fecha_transaccion.desc(), id_transaccion.desc()),
+    )
     
     # TODO: Implementar restricciones CHECK en producción:
     # CHECK (tipo IN ('INGRESO','EGRESO'))
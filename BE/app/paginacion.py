@@ -0,0 +1,39 @@
+"""
+Cursores opacos para paginación por keyset (sin OFFSET).
+El cursor codifica los valores de orden de la última fila de la página anterior;
+el cliente lo recibe en la cabecera X-Next-Cursor y lo reenvía en `cursor`.
+"""
+import base64
+import json
+from datetime import date
+from decimal import InvalidOperation
+from typing import Any, Callable, Tuple
+
+from fastapi import HTTPException, status
+
+# Cabecera con el cursor de la página siguiente (ausente en la última página)
+CABECERA_CURSOR = "X-Next-Cursor"
+
+
+def codificar_cursor(*valores: Any) -> str:
+    """Codifica los valores de orden de una fila como texto opaco (base64 URL-safe)"""
+    crudo = json.dumps([v.isoformat() if isinstance(v, date) else str(v) for v in valores])
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, *tipos: Callable[[str], Any]) -> Tuple[Any, ...]:
+    """
+    Decodifica un cursor convirtiendo cada valor con su tipo
+    (p.ej. datetime.fromisoformat, UUID, int, Decimal). Cursor inválido → HTTP 400.
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if not isinstance(valores, list) or len(valores) != len(tipos):
+            raise ValueError("número de valores incorrecto")
+        return tuple(tipo(valor) for tipo, valor in zip(tipos, valores))
+    except (ValueError, TypeError, InvalidOperation) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cursor de paginación inválido: {e}"
+        )
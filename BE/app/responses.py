@@ -0,0 +1,63 @@
+"""
+Clases de respuesta HTTP compartidas por las rutas de la API.
+"""
+import hashlib
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import Request, status
+from fastapi.responses import JSONResponse, Response
+
+
+def _serializar_no_nativo(valor: Any) -> Any:
+    """Convierte los tipos que orjson no serializa de forma nativa (Decimal)"""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo no serializable a JSON: {type(valor).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    Respuesta JSON serializada con orjson (datetime, date y UUID nativos).
+    Pensada para endpoints que devuelven dict/list sin response_model: al
+    retornarla directamente se evita el recorrido de jsonable_encoder.
+    No se usa como default_response_class: con response_model, FastAPI ya
+    serializa a JSON en pydantic-core y una clase propia desactivaría esa vía.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return serializar_json(content)
+
+
+def serializar_json(contenido: Any) -> bytes:
+    """Serializa a JSON con orjson (mismo formato que ORJSONResponse)"""
+    return orjson.dumps(
+        contenido,
+        default=_serializar_no_nativo,
+        option=orjson.OPT_NON_STR_KEYS,
+    )
+
+
+# =========================================================
+# 🟦 ETAG / 304 NOT MODIFIED
+# =========================================================
+def etag_coincide(request: Request, etag: str) -> bool:
+    """Indica si el cliente ya tiene esta versión (cabecera If-None-Match)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    etiquetas = [e.strip().removeprefix("W/") for e in if_none_match.split(",")]
+    return "*" in etiquetas or etag in etiquetas
+
+
+def respuesta_con_etag(request: Request, cuerpo: bytes, media_type: str = "application/json") -> Response:
+    """
+    Respuesta con ETag calculado sobre el cuerpo ya serializado.
+    Si el cliente envía el mismo ETag en If-None-Match se responde 304 sin cuerpo.
+    """
+    etag = f'"{hashlib.md5(cuerpo, usedforsecurity=False).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_coincide(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cuerpo, media_type=media_type, headers=headers)
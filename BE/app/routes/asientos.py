@@ -5,6 +5,8 @@ Proporciona endpoints CRUD para gestionar asientos contables.
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from BE.app.db import get_db
+from BE.app.cache import cache_libro_mayor
+from BE.app.responses import ORJSONResponse
 from BE.app.schemas.asiento import AsientoCreate, AsientoRead, AsientoUpdate
 from BE.app.services.asiento_service import (
     create_asiento, get_asiento, get_asientos, update_asiento, delete_asiento
@@ -17,11 +19,12 @@ router = APIRouter(prefix="/api/asientos", tags=["Asientos"])
 
 
 # Crear asiento simple (facturas son independientes)
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", status_code=status.HTTP_201_CREATED, response_class=ORJSONResponse)
 def crear_asiento(asiento: AsientoCreate, db: Session = Depends(get_db)):
     """Crear un nuevo asiento contable. Las facturas se manejan independientemente."""
     nuevo_asiento = create_asiento(db, asiento)
-    return {"id_asiento": nuevo_asiento.id_asiento}
+    cache_libro_mayor.clear()
+    return ORJSONResponse({"id_asiento": nuevo_asiento.id_asiento}, status_code=status.HTTP_201_CREATED)
 
 
 # Crear asiento asociado a una transacción específica
@@ -43,7 +46,9 @@ def crear_asiento_para_transaccion(
     Returns:
         Asiento creado con su información completa
     """
-    return create_asiento_transaccion(db, asiento, id_transaccion)
+    nuevo_asiento = create_asiento_transaccion(db, asiento, id_transaccion)
+    cache_libro_mayor.clear()
+    return nuevo_asiento
 
 
 @router.get("/", response_model=List[AsientoRead])
@@ -77,11 +82,14 @@ def actualizar_asiento(
         db: Session = Depends(get_db)
 ):
     """Actualizar un asiento contable existente"""
-    return update_asiento(db, asiento_id, asiento)
+    asiento_actualizado = update_asiento(db, asiento_id, asiento)
+    cache_libro_mayor.clear()
+    return asiento_actualizado
 
 
 @router.delete("/{asiento_id}", status_code=status.HTTP_204_NO_CONTENT)
 def eliminar_asiento(asiento_id: int, db: Session = Depends(get_db)):
     """Eliminar un asiento contable"""
     delete_asiento(db, asiento_id)
+    cache_libro_mayor.clear()
     return None
\ No newline at end of file
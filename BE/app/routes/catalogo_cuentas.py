@@ -2,9 +2,11 @@
 Rutas de API para operaciones del Catálogo de Cuentas.
 Proporciona endpoints CRUD para gestionar el catálogo de cuentas.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from BE.app.db import get_db
+from BE.app.cache import cache_catalogo_cuentas, cache_libro_mayor
 from BE.app.schemas.catalogo_cuentas import CatalogoCuentaCreate, CatalogoCuentaRead, CatalogoCuentaUpdate
 from BE.app.services.catalogo_service import (
     create_cuenta, get_cuenta, get_cuentas, update_cuenta, delete_cuenta
@@ -13,15 +15,26 @@ from typing import List
 
 router = APIRouter(prefix="/api/catalogo-cuentas", tags=["Catalogo de Cuentas"])
 
+_LISTA_CUENTAS = TypeAdapter(List[CatalogoCuentaRead])
+
 @router.post("/", response_model=CatalogoCuentaRead, status_code=status.HTTP_201_CREATED)
 def crear_cuenta(cuenta: CatalogoCuentaCreate, db: Session = Depends(get_db)):
     """Crear una nueva cuenta en el catálogo de cuentas"""
-    return create_cuenta(db, cuenta)
+    nueva_cuenta = create_cuenta(db, cuenta)
+    cache_catalogo_cuentas.clear()
+    cache_libro_mayor.clear()
+    return nueva_cuenta
 
 @router.get("/", response_model=List[CatalogoCuentaRead])
 def listar_cuentas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Obtener todas las cuentas con paginación"""
-    return get_cuentas(db, skip=skip, limit=limit)
+    """Obtener todas las cuentas con paginación (el JSON se guarda en caché, se invalida al escribir)"""
+    cuerpo = cache_catalogo_cuentas.obtener_o_calcular(
+        (skip, limit),
+        lambda: _LISTA_CUENTAS.dump_json(
+            _LISTA_CUENTAS.validate_python(get_cuentas(db, skip=skip, limit=limit), from_attributes=True)
+        )
+    )
+    return Response(content=cuerpo, media_type="application/json")
 
 @router.get("/{cuenta_id}", response_model=CatalogoCuentaRead)
 def obtener_cuenta(cuenta_id: int, db: Session = Depends(get_db)):
@@ -31,10 +44,15 @@ def obtener_cuenta(cuenta_id: int, db: Session = Depends(get_db)):
 @router.put("/{cuenta_id}", response_model=CatalogoCuentaRead)
 def actualizar_cuenta(cuenta_id: int, cuenta: CatalogoCuentaUpdate, db: Session = Depends(get_db)):
     """Actualizar una cuenta existente"""
-    return update_cuenta(db, cuenta_id, cuenta)
+    cuenta_actualizada = update_cuenta(db, cuenta_id, cuenta)
+    cache_catalogo_cuentas.clear()
+    cache_libro_mayor.clear()
+    return cuenta_actualizada
 
 @router.delete("/{cuenta_id}", status_code=status.HTTP_204_NO_CONTENT)
 def eliminar_cuenta(cuenta_id: int, db: Session = Depends(get_db)):
     """Eliminar una cuenta"""
     delete_cuenta(db, cuenta_id)
+    cache_catalogo_cuentas.clear()
+    cache_libro_mayor.clear()
     return None
\ No newline at end of file
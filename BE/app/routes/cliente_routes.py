@@ -2,12 +2,16 @@
 Rutas de API para operaciones de Clientes.
 Proporciona endpoints CRUD para gestión de clientes.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from BE.app.db import get_db
+from BE.app.cache import cache_clientes, cache_estadisticas_clientes, cache_estadisticas_facturas
+from BE.app.paginacion import CABECERA_CURSOR, codificar_cursor, decodificar_cursor
+from BE.app.responses import ORJSONResponse
 from BE.app.schemas.cliente_schemas import ClienteCreate, ClienteUpdate, ClienteOut, ClienteResumen
+from BE.app.schemas.filas import desde_fila
 from BE.app.services.cliente_service import (
     crear_cliente,
     obtener_cliente_por_id,
@@ -35,7 +39,10 @@ def crear_nuevo_cliente(
     - Valida NIT único
     - Tipo: INDIVIDUAL o EMPRESA
     """
-    return crear_cliente(db, cliente)
+    nuevo_cliente = crear_cliente(db, cliente)
+    cache_clientes.clear()
+    cache_estadisticas_clientes.clear()
+    return nuevo_cliente
 
 
 # =========================================================
@@ -43,8 +50,10 @@ def crear_nuevo_cliente(
 # =========================================================
 @router.get("/", response_model=List[ClienteResumen])
 def listar_todos_clientes(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description="Obsoleto: usar cursor"),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description=f"Cursor de la cabecera {CABECERA_CURSOR}"),
     busqueda: Optional[str] = Query(None, description="Buscar en nombre, NIT o email"),
     tipo: Optional[str] = Query(None, description="INDIVIDUAL o EMPRESA"),
     activo: Optional[str] = Query(None, description="SI o NO"),
@@ -55,8 +64,24 @@ def listar_todos_clientes(
     - busqueda: busca en nombre, NIT y email
     - tipo: filtra por INDIVIDUAL o EMPRESA
     - activo: filtra por SI o NO
+    Si hay más resultados, la cabecera X-Next-Cursor trae el cursor de la página siguiente.
+    
+    El resultado se guarda en caché y se invalida al crear/modificar clientes.
     """
-    return listar_clientes(db, skip, limit, busqueda, tipo, activo)
+    despues_de = decodificar_cursor(cursor, str, int) if cursor else None
+    clientes = cache_clientes.obtener_o_calcular(
+        (skip, limit, busqueda, tipo, activo, despues_de),
+        lambda: [
+            desde_fila(ClienteResumen, c)
+            for c in listar_clientes(db, skip, limit, busqueda, tipo, activo, despues_de)
+        ]
+    )
+
+    if len(clientes) == limit:
+        ultimo = clientes[-1]
+        response.headers[CABECERA_CURSOR] = codificar_cursor(ultimo.nombre, ultimo.id_cliente)
+
+    return clientes
 
 
 # =========================================================
@@ -67,8 +92,9 @@ def obtener_cliente(
     cliente_id: int,
     db: Session = Depends(get_db)
 ):
-    """Obtiene un cliente específico por ID"""
-    return obtener_cliente_por_id(db, cliente_id)
+    """Obtiene un cliente específico por ID (fila de la BD: se construye sin validar)"""
+    cliente = obtener_cliente_por_id(db, cliente_id)
+    return desde_fila(ClienteOut, cliente)
 
 
 # =========================================================
@@ -99,7 +125,11 @@ def actualizar_cliente_existente(
     db: Session = Depends(get_db)
 ):
     """Actualiza los datos de un cliente"""
-    return actualizar_cliente(db, cliente_id, cliente)
+    cliente_actualizado = actualizar_cliente(db, cliente_id, cliente)
+    cache_clientes.clear()
+    cache_estadisticas_clientes.clear()
+    cache_estadisticas_facturas.clear()  # El top de clientes muestra nombre y NIT
+    return cliente_actualizado
 
 
 # =========================================================
@@ -114,7 +144,10 @@ def desactivar_cliente_existente(
     Desactiva un cliente (marca como inactivo).
     Mejor práctica que eliminarlo.
     """
-    return desactivar_cliente(db, cliente_id)
+    cliente_desactivado = desactivar_cliente(db, cliente_id)
+    cache_clientes.clear()
+    cache_estadisticas_clientes.clear()
+    return cliente_desactivado
 
 
 # =========================================================
@@ -130,17 +163,23 @@ def eliminar_cliente_existente(
     Solo permitido si no tiene facturas asociadas.
     """
     eliminar_cliente(db, cliente_id)
+    cache_clientes.clear()
+    cache_estadisticas_clientes.clear()
     return None
 
 
 # =========================================================
 # 🟦 ESTADÍSTICAS DE CLIENTES
 # =========================================================
-@router.get("/estadisticas/resumen")
+@router.get("/estadisticas/resumen", response_class=ORJSONResponse)
 def obtener_estadisticas(db: Session = Depends(get_db)):
     """
     Obtiene estadísticas generales de clientes.
     - Total, activos, inactivos
     - Individuales vs empresas
+    
+    Se guarda en caché 30 segundos y se invalida al crear/modificar clientes.
     """
-    return obtener_estadisticas_clientes(db)
+    return ORJSONResponse(cache_estadisticas_clientes.obtener_o_calcular(
+        "resumen", lambda: obtener_estadisticas_clientes(db)
+    ))
@@ -2,43 +2,281 @@
 Rutas de API para operaciones de Facturas.
 Proporciona endpoints CRUD y de descarga de facturas.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
 from BE.app.db import get_db
+from BE.app.cache import cache_estadisticas_facturas, cache_estadisticas_productos, cache_pdf_facturas
+from BE.app.paginacion import CABECERA_CURSOR, codificar_cursor, decodificar_cursor
+from BE.app.responses import ORJSONResponse, etag_coincide
 from BE.app.models.factura_models import Factura
-from BE.app.models.transaccion import Transaccion
 from BE.app.schemas.factura_schemas import (
     FacturaCreate, 
+    FacturaCreateNormalizada,
     FacturaUpdate, 
     FacturaOut, 
     FacturaResumen,
     FacturaConDetallesCreate
 )
+from BE.app.schemas.filas import desde_fila
 from BE.app.services.facturacion_service import (
     crear_factura,
     obtener_factura_por_id,
+    obtener_factura_con_detalles,
     listar_facturas,
     actualizar_factura,
     eliminar_factura,
     obtener_estadisticas_facturacion,
     obtener_top_clientes
 )
-import json
-
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+import asyncio
+import hashlib
 import io
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from types import SimpleNamespace
+
+import orjson
 
 router = APIRouter(prefix="/api/facturas", tags=["Facturas"])
 
+# Límites para documentos generados en memoria (PDF/Excel)
+MAX_NOTAS_CHARS = 10_000
+MAX_DETALLES = 500
+# Por encima de este tamaño el PDF en construcción pasa de memoria a disco
+PDF_SPOOL_MAX_BYTES = 2 * 1024 * 1024
+
+# Procesos para generar PDF/Excel (CPU intensivo) sin competir por el GIL del threadpool.
+# Cada worker de uvicorn tiene su propio pool: por defecto se reparten los CPUs entre
+# los WEB_CONCURRENCY workers en lugar de crear cpu_count procesos en cada uno
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+DOCUMENTOS_WORKERS = int(os.getenv(
+    "DOCUMENTOS_WORKERS", str(max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY))
+))
+# El worker ya tiene hilos (threadpool, conexiones) al crear el pool: fork copiaría
+# locks tomados por otros hilos, así que los procesos se crean con forkserver/spawn
+_CONTEXTO_PROCESOS = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+_pool_documentos: Optional[ProcessPoolExecutor] = None
+
+@lru_cache(maxsize=None)
+def _recursos_pdf() -> SimpleNamespace:
+    """
+    Importa ReportLab y construye los estilos del PDF la primera vez que se usan
+    (una vez por proceso): los workers que no generan PDFs no pagan su carga.
+    """
+    from reportlab import rl_config
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+
+    # Sin validación de atributos en cada Paragraph/Table (solo útil al depurar)
+    rl_config.shapeChecking = 0
+
+    styles = getSampleStyleSheet()
+    titulo = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=28,
+        textColor=colors.HexColor('#1f4788'),
+        spaceAfter=10,
+        alignment=1,  # Centrado
+        fontName='Helvetica-Bold'
+    )
+    subtitulo = ParagraphStyle(
+        'Subtitle',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#666666'),
+        alignment=1,
+        spaceAfter=20
+    )
+    productos_encabezado = ParagraphStyle('ProductosHeader', parent=styles['Normal'], fontSize=10, fontName='Helvetica-Bold', textColor=colors.whitesmoke)
+    legacy = ParagraphStyle('Legacy', parent=styles['Normal'], fontSize=9, textColor=colors.HexColor('#666666'))
+    totales_encabezado = ParagraphStyle('TotalesHeader', parent=styles['Normal'], fontSize=11, fontName='Helvetica-Bold', textColor=colors.whitesmoke)
+    notas = ParagraphStyle('Notas', parent=styles['Normal'], fontSize=9, textColor=colors.HexColor('#666666'))
+    pie = ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.HexColor('#999999'), alignment=1)
+
+    # Tablas (comandos fijos, compartidos entre documentos)
+    tabla_empresa = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f0f0f0')),
+        ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#1f4788')),
+        ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ('LEFTPADDING', (0, 0), (-1, -1), 10),
+    ])
+    tabla_info = TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8eef7')),
+        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('LINEABOVE', (0, 6), (-1, 6), 2, colors.HexColor('#1f4788')),
+    ])
+    tabla_productos = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f4788')),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (1, 1), (1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9f9f9')])
+    ])
+    tabla_totales = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f4788')),
+        ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e8eef7')),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, -1), (-1, -1), 12),
+    ])
+
+    return SimpleNamespace(
+        normal=styles['Normal'],
+        titulo=titulo,
+        subtitulo=subtitulo,
+        productos_encabezado=productos_encabezado,
+        legacy=legacy,
+        totales_encabezado=totales_encabezado,
+        notas=notas,
+        pie=pie,
+        tabla_empresa=tabla_empresa,
+        tabla_info=tabla_info,
+        tabla_productos=tabla_productos,
+        tabla_totales=tabla_totales,
+    )
+
+
+# Especificaciones de formato del Excel (xlsxwriter crea los Format desde cada workbook)
+_XLSX_BORDE = {'border': 1}
+_XLSX_FORMATOS = {
+    'titulo': {'bold': True, 'font_size': 18, 'font_color': '#FFFFFF', 'bg_color': '#1f4788',
+               'align': 'center', 'valign': 'vcenter'},
+    'numero': {'bold': True, 'font_size': 12, 'align': 'center'},
+    'empresa': {'bold': True, 'font_size': 11, 'align': 'center', 'bg_color': '#F0F0F0'},
+    'encabezado': {'bold': True, 'font_size': 11, 'font_color': '#FFFFFF', 'bg_color': '#4472C4'},
+    'encabezado_tabla': {'bold': True, 'font_size': 11, 'font_color': '#FFFFFF', 'bg_color': '#4472C4',
+                         'align': 'center', **_XLSX_BORDE},
+    'encabezado_totales': {'bold': True, 'font_size': 11, 'font_color': '#FFFFFF', 'bg_color': '#4472C4',
+                           'align': 'right'},
+    'etiqueta': {'bold': True, 'font_size': 10, **_XLSX_BORDE},
+    'etiqueta_simple': {'bold': True, 'font_size': 10},
+    'borde': _XLSX_BORDE,
+    'centro': {'align': 'center', **_XLSX_BORDE},
+    'cantidad': {'num_format': '#,##0.00', 'align': 'center', **_XLSX_BORDE},
+    'moneda': {'num_format': '$#,##0.00', 'align': 'right', **_XLSX_BORDE},
+    'concepto': {'align': 'right', **_XLSX_BORDE},
+    'total_etiqueta': {'bold': True, 'font_size': 12, 'bg_color': '#E8EEF7', 'align': 'right', **_XLSX_BORDE},
+    'total_monto': {'bold': True, 'font_size': 12, 'bg_color': '#E8EEF7', 'num_format': '$#,##0.00',
+                    'align': 'right', **_XLSX_BORDE},
+    'texto_largo': {'text_wrap': True},
+}
+
+
+def _validar_tamano_documento(factura: Factura):
+    """Rechaza facturas demasiado grandes para generar el documento en memoria"""
+    if len(factura.notas or "") > MAX_NOTAS_CHARS or len(factura.detalles) > MAX_DETALLES:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Factura demasiado grande para exportar (máx. {MAX_DETALLES} líneas y {MAX_NOTAS_CHARS} caracteres de notas)"
+        )
+
+
+def _obtener_pool_documentos() -> ProcessPoolExecutor:
+    """Crea el pool de procesos la primera vez que se genera un documento"""
+    global _pool_documentos
+    if _pool_documentos is None:
+        _pool_documentos = ProcessPoolExecutor(
+            max_workers=DOCUMENTOS_WORKERS, mp_context=_CONTEXTO_PROCESOS
+        )
+    return _pool_documentos
+
+
+def cerrar_pool_documentos():
+    """Termina los procesos del pool de documentos (al apagar o recargar el worker)"""
+    global _pool_documentos
+    if _pool_documentos is not None:
+        _pool_documentos.shutdown(cancel_futures=True)
+        _pool_documentos = None
+
+
+async def _generar_en_proceso(generador, factura: SimpleNamespace) -> bytes:
+    """Ejecuta un generador de documentos en el pool de procesos"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_obtener_pool_documentos(), generador, factura)
+
+
+def _instantanea_factura(factura: Factura) -> SimpleNamespace:
+    """
+    Copia serializable (pickle) de los datos de la factura usados en los documentos.
+    Montos y fechas se convierten una sola vez (float y texto) para PDF y Excel.
+    """
+    return SimpleNamespace(
+        numero_factura=factura.numero_factura,
+        cliente=factura.cliente,
+        nit_cliente=factura.nit_cliente,
+        direccion_cliente=factura.direccion_cliente,
+        telefono_cliente=factura.telefono_cliente,
+        email_cliente=factura.email_cliente,
+        fecha_emision_texto=factura.fecha_emision.strftime("%d/%m/%Y %H:%M") if factura.fecha_emision else "N/A",
+        fecha_vencimiento_texto=factura.fecha_vencimiento.strftime("%d/%m/%Y") if factura.fecha_vencimiento else "N/A",
+        condiciones_pago=factura.condiciones_pago,
+        vendedor=factura.vendedor,
+        notas=factura.notas,
+        producto_servicio=factura.producto_servicio,
+        subtotal=float(factura.subtotal),
+        descuento=float(factura.descuento),
+        iva=float(factura.iva),
+        monto_total=float(factura.monto_total),
+        detalles=[
+            SimpleNamespace(
+                producto=SimpleNamespace(nombre=d.producto.nombre) if d.producto else None,
+                cantidad=float(d.cantidad),
+                precio_unitario=float(d.precio_unitario),
+                descuento_monto=float(d.descuento_monto or 0),
+                total=float(d.total),
+            )
+            for d in factura.detalles
+        ],
+    )
+
+
+def _etag_factura(factura: Factura) -> str:
+    """ETag calculado a partir de los datos que aparecen en el documento"""
+    partes = [
+        factura.id_factura, factura.numero_factura,
+        factura.cliente, factura.nit_cliente, factura.direccion_cliente,
+        factura.telefono_cliente, factura.email_cliente,
+        factura.fecha_emision, factura.fecha_vencimiento,
+        factura.condiciones_pago, factura.vendedor, factura.notas, factura.producto_servicio,
+        factura.subtotal, factura.descuento, factura.iva, factura.monto_total,
+    ]
+    for detalle in factura.detalles:
+        partes += [
+            detalle.id_detalle, detalle.producto.nombre if detalle.producto else None,
+            detalle.cantidad, detalle.precio_unitario, detalle.descuento_monto, detalle.total,
+        ]
+    digest = hashlib.md5("|".join(map(str, partes)).encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
 
 # =========================================================
 # 🟦 CREAR FACTURA SIMPLE (LEGACY)
@@ -52,7 +290,9 @@ def crear_nueva_factura(
     Crea una nueva factura simple (legacy).
     Soporta cliente manual o id_cliente de tabla normalizada.
     """
-    return crear_factura(db, factura)
+    nueva_factura = crear_factura(db, factura)
+    cache_estadisticas_facturas.clear()
+    return nueva_factura
 
 
 # =========================================================
@@ -70,8 +310,8 @@ def crear_factura_con_detalles(
     - Actualiza inventario de productos físicos
     - Crea líneas en tabla factura_detalle
     """
-    # Convertir a FacturaCreate
-    factura_create = FacturaCreate(
+    # Convertir a FacturaCreate (forma normalizada)
+    factura_create = FacturaCreateNormalizada(
         id_cliente=factura_data.id_cliente,
         condiciones_pago=factura_data.condiciones_pago,
         vendedor=factura_data.vendedor,
@@ -81,38 +321,47 @@ def crear_factura_con_detalles(
     )
     
     # Convertir detalles a formato dict
-    detalles = [detalle.dict() for detalle in factura_data.detalles]
+    detalles = [detalle.model_dump() for detalle in factura_data.detalles]
     
-    return crear_factura(db, factura_create, detalles)
+    nueva_factura = crear_factura(db, factura_create, detalles)
+    cache_estadisticas_facturas.clear()
+    cache_estadisticas_productos.clear()  # La factura descuenta stock
+    return nueva_factura
 
 
 # =========================================================
 # 🟦 LISTAR FACTURAS
 # =========================================================
-@router.get("/", response_model=List[FacturaResumen])
+@router.get("/", response_model=List[FacturaResumen], response_class=ORJSONResponse)
 def listar_todas_facturas(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     cliente: Optional[str] = Query(None),
     fecha_desde: Optional[datetime] = Query(None),
     fecha_hasta: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None, description=f"Cursor de la cabecera {CABECERA_CURSOR} (reemplaza skip)"),
     db: Session = Depends(get_db)
 ):
-    """Lista facturas con filtros opcionales"""
+    """
+    Lista facturas con filtros opcionales, de la más reciente a la más antigua.
+    Si hay más resultados, la cabecera X-Next-Cursor trae el cursor de la página siguiente.
+    """
+    despues_de = decodificar_cursor(cursor, datetime.fromisoformat, UUID) if cursor else None
     facturas = listar_facturas(
-        db, skip, limit, cliente, fecha_desde, fecha_hasta
+        db, skip, limit, cliente, fecha_desde, fecha_hasta, despues_de
     )
     
-    return [
-        FacturaResumen(
-            id_factura=f.id_factura,
-            numero_factura=f.numero_factura,
-            cliente=f.cliente_obj.nombre if f.cliente_obj else (f.cliente or "Sin cliente"),
-            monto_total=f.monto_total,
-            fecha_emision=f.fecha_emision
-        )
-        for f in facturas
-    ]
+    headers = {}
+    if len(facturas) == limit:
+        ultima = facturas[-1]
+        headers[CABECERA_CURSOR] = codificar_cursor(ultima.fecha_emision, ultima.id_factura)
+    
+    # Las filas ya tienen la forma de FacturaResumen (response_model queda para la
+    # documentación): se serializan directo con orjson, sin validar cada una
+    return ORJSONResponse(
+        [{**f._mapping, "estado": "Generada"} for f in facturas],
+        headers=headers
+    )
 
 
 # =========================================================
@@ -132,7 +381,8 @@ def obtener_una_factura(
             detail=f"Factura {factura_id} no encontrada"
         )
     
-    return factura
+    # Fila propia de la BD: se construye sin validar (FacturaOut no tiene validadores)
+    return desde_fila(FacturaOut, factura)
 
 
 # =========================================================
@@ -145,7 +395,9 @@ def actualizar_una_factura(
     db: Session = Depends(get_db)
 ):
     """Actualiza una factura existente"""
-    return actualizar_factura(db, factura_id, factura_update)
+    factura_actualizada = actualizar_factura(db, factura_id, factura_update)
+    cache_estadisticas_facturas.clear()
+    return factura_actualizada
 
 
 # =========================================================
@@ -158,26 +410,30 @@ def eliminar_una_factura(
 ):
     """Elimina una factura"""
     eliminar_factura(db, factura_id)
+    cache_estadisticas_facturas.clear()
     return None
 
 
 # =========================================================
 # 🟦 ESTADÍSTICAS DE FACTURACIÓN
 # =========================================================
-@router.get("/estadisticas/resumen", response_model=dict)
+@router.get("/estadisticas/resumen", response_model=dict, response_class=ORJSONResponse)
 def estadisticas_facturacion(
     fecha_desde: Optional[datetime] = Query(None),
     fecha_hasta: Optional[datetime] = Query(None),
     db: Session = Depends(get_db)
 ):
     """Obtiene estadísticas de facturación"""
-    return obtener_estadisticas_facturacion(db, fecha_desde, fecha_hasta)
+    return ORJSONResponse(cache_estadisticas_facturas.obtener_o_calcular(
+        ("resumen", fecha_desde, fecha_hasta),
+        lambda: obtener_estadisticas_facturacion(db, fecha_desde, fecha_hasta)
+    ))
 
 
 # =========================================================
 # 🟦 TOP CLIENTES
 # =========================================================
-@router.get("/estadisticas/top-clientes", response_model=List[dict])
+@router.get("/estadisticas/top-clientes", response_model=List[dict], response_class=ORJSONResponse)
 def top_clientes(
     limite: int = Query(10, ge=1, le=100),
     fecha_desde: Optional[datetime] = Query(None),
@@ -185,113 +441,74 @@ def top_clientes(
     db: Session = Depends(get_db)
 ):
     """Obtiene los clientes con más compras"""
-    return obtener_top_clientes(db, limite, fecha_desde, fecha_hasta)
+    return ORJSONResponse(cache_estadisticas_facturas.obtener_o_calcular(
+        ("top-clientes", limite, fecha_desde, fecha_hasta),
+        lambda: obtener_top_clientes(db, limite, fecha_desde, fecha_hasta)
+    ))
 
 
 # =========================================================
 # 🟦 DESCARGAR FACTURA EN PDF
 # =========================================================
-@router.get("/{factura_id}/descargar-pdf")
-def descargar_factura_pdf(
-    factura_id: UUID,
-    db: Session = Depends(get_db)
-):
-    """Genera y descarga factura en formato PDF profesional"""
-    factura = obtener_factura_por_id(db, factura_id)
+def _generar_pdf(factura: SimpleNamespace) -> bytes:
+    """Construye el PDF de la factura (CPU intensivo: ejecutar fuera del event loop)"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
     
-    if not factura:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Factura {factura_id} no encontrada"
-        )
+    est = _recursos_pdf()
     
-    # Crear PDF en memoria
-    pdf_buffer = io.BytesIO()
+    # Crear PDF en memoria (o en disco si excede PDF_SPOOL_MAX_BYTES)
+    pdf_buffer = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_BYTES)
     doc = SimpleDocTemplate(pdf_buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
     elements = []
-    styles = getSampleStyleSheet()
+    normal_style = est.normal
     
     # ========== ENCABEZADO ==========
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        textColor=colors.HexColor('#1f4788'),
-        spaceAfter=10,
-        alignment=1,  # Centrado
-        fontName='Helvetica-Bold'
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'Subtitle',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#666666'),
-        alignment=1,
-        spaceAfter=20
-    )
-    
-    title = Paragraph("FACTURA", title_style)
+    title = Paragraph("FACTURA", est.titulo)
     elements.append(title)
-    elements.append(Paragraph(f"No. {factura.numero_factura}", subtitle_style))
+    elements.append(Paragraph(f"No. {factura.numero_factura}", est.subtitulo))
     elements.append(Spacer(1, 0.2*inch))
     
     # ========== INFORMACIÓN DE LA EMPRESA (Placeholder) ==========
     empresa_data = [[
-        Paragraph("<b>EMPRESA S.A. DE C.V.</b><br/>NIT: 0000-000000-000-0<br/>Dirección: Ciudad Capital<br/>Tel: (000) 0000-0000", styles['Normal'])
+        Paragraph("<b>EMPRESA S.A. DE C.V.</b><br/>NIT: 0000-000000-000-0<br/>Dirección: Ciudad Capital<br/>Tel: (000) 0000-0000", normal_style)
     ]]
     empresa_table = Table(empresa_data, colWidths=[6*inch])
-    empresa_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f0f0f0')),
-        ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#1f4788')),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('LEFTPADDING', (0, 0), (-1, -1), 10),
-    ]))
+    empresa_table.setStyle(est.tabla_empresa)
     elements.append(empresa_table)
     elements.append(Spacer(1, 0.2*inch))
     
     # ========== INFORMACIÓN DE CLIENTE Y FACTURA ==========
     info_data = [
-        [Paragraph("<b>CLIENTE:</b>", styles['Normal']), factura.cliente or "N/A"],
-        [Paragraph("<b>NIT:</b>", styles['Normal']), factura.nit_cliente or "C/F"],
-        [Paragraph("<b>Dirección:</b>", styles['Normal']), factura.direccion_cliente or "N/A"],
-        [Paragraph("<b>Teléfono:</b>", styles['Normal']), factura.telefono_cliente or "N/A"],
-        [Paragraph("<b>Email:</b>", styles['Normal']), factura.email_cliente or "N/A"],
+        [Paragraph("<b>CLIENTE:</b>", normal_style), factura.cliente or "N/A"],
+        [Paragraph("<b>NIT:</b>", normal_style), factura.nit_cliente or "C/F"],
+        [Paragraph("<b>Dirección:</b>", normal_style), factura.direccion_cliente or "N/A"],
+        [Paragraph("<b>Teléfono:</b>", normal_style), factura.telefono_cliente or "N/A"],
+        [Paragraph("<b>Email:</b>", normal_style), factura.email_cliente or "N/A"],
         ["", ""],
-        [Paragraph("<b>Fecha Emisión:</b>", styles['Normal']), factura.fecha_emision.strftime("%d/%m/%Y %H:%M") if factura.fecha_emision else "N/A"],
-        [Paragraph("<b>Fecha Vencimiento:</b>", styles['Normal']), factura.fecha_vencimiento.strftime("%d/%m/%Y") if factura.fecha_vencimiento else "N/A"],
-        [Paragraph("<b>Condiciones Pago:</b>", styles['Normal']), factura.condiciones_pago or "Contado"],
-        [Paragraph("<b>Vendedor:</b>", styles['Normal']), factura.vendedor or "N/A"],
+        [Paragraph("<b>Fecha Emisión:</b>", normal_style), factura.fecha_emision_texto],
+        [Paragraph("<b>Fecha Vencimiento:</b>", normal_style), factura.fecha_vencimiento_texto],
+        [Paragraph("<b>Condiciones Pago:</b>", normal_style), factura.condiciones_pago or "Contado"],
+        [Paragraph("<b>Vendedor:</b>", normal_style), factura.vendedor or "N/A"],
     ]
     
     info_table = Table(info_data, colWidths=[2*inch, 4*inch])
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8eef7')),
-        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('LINEABOVE', (0, 6), (-1, 6), 2, colors.HexColor('#1f4788')),
-    ]))
+    info_table.setStyle(est.tabla_info)
     
     elements.append(info_table)
     elements.append(Spacer(1, 0.3*inch))
     
     # ========== TABLA DE PRODUCTOS/SERVICIOS ==========
     if hasattr(factura, 'detalles') and factura.detalles:
-        productos_header_style = ParagraphStyle('ProductosHeader', parent=styles['Normal'], fontSize=10, fontName='Helvetica-Bold', textColor=colors.whitesmoke)
         productos_data = [
             [
-                Paragraph("#", productos_header_style),
-                Paragraph("PRODUCTO/SERVICIO", productos_header_style),
-                Paragraph("CANT.", productos_header_style),
-                Paragraph("P. UNIT.", productos_header_style),
-                Paragraph("DESC.", productos_header_style),
-                Paragraph("TOTAL", productos_header_style)
+                Paragraph("#", est.productos_encabezado),
+                Paragraph("PRODUCTO/SERVICIO", est.productos_encabezado),
+                Paragraph("CANT.", est.productos_encabezado),
+                Paragraph("P. UNIT.", est.productos_encabezado),
+                Paragraph("DESC.", est.productos_encabezado),
+                Paragraph("TOTAL", est.productos_encabezado)
             ]
         ]
         
@@ -300,108 +517,68 @@ def descargar_factura_pdf(
             productos_data.append([
                 str(idx),
                 producto_nombre,
-                f"{float(detalle.cantidad):.2f}",
-                f"${float(detalle.precio_unitario):,.2f}",
-                f"{float(detalle.descuento_monto):,.2f}" if detalle.descuento_monto else "$0.00",
-                f"${float(detalle.total):,.2f}"
+                f"{detalle.cantidad:.2f}",
+                f"${detalle.precio_unitario:,.2f}",
+                f"{detalle.descuento_monto:,.2f}" if detalle.descuento_monto else "$0.00",
+                f"${detalle.total:,.2f}"
             ])
         
         productos_table = Table(productos_data, colWidths=[0.4*inch, 2.5*inch, 0.8*inch, 1*inch, 0.8*inch, 1*inch])
-        productos_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f4788')),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('ALIGN', (1, 1), (1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9f9f9')])
-        ]))
+        productos_table.setStyle(est.tabla_productos)
         
         elements.append(productos_table)
         elements.append(Spacer(1, 0.3*inch))
     elif factura.producto_servicio:
         # Si es factura legacy
-        legacy_style = ParagraphStyle('Legacy', parent=styles['Normal'], fontSize=9, textColor=colors.HexColor('#666666'))
-        elements.append(Paragraph("<b>Descripción del Servicio:</b>", styles['Normal']))
-        elements.append(Paragraph(factura.producto_servicio, legacy_style))
+        elements.append(Paragraph("<b>Descripción del Servicio:</b>", normal_style))
+        elements.append(Paragraph(factura.producto_servicio, est.legacy))
         elements.append(Spacer(1, 0.3*inch))
     
     # ========== TOTALES ==========
-    totales_header_style = ParagraphStyle('TotalesHeader', parent=styles['Normal'], fontSize=11, fontName='Helvetica-Bold', textColor=colors.whitesmoke)
     totales_data = [
-        [Paragraph("CONCEPTO", totales_header_style), Paragraph("MONTO", totales_header_style)],
-        ["Subtotal", f"${float(factura.subtotal):,.2f}"],
-        ["Descuento", f"-${float(factura.descuento):,.2f}"],
-        ["IVA (13%)", f"${float(factura.iva):,.2f}"],
+        [Paragraph("CONCEPTO", est.totales_encabezado), Paragraph("MONTO", est.totales_encabezado)],
+        ["Subtotal", f"${factura.subtotal:,.2f}"],
+        ["Descuento", f"-${factura.descuento:,.2f}"],
+        ["IVA (13%)", f"${factura.iva:,.2f}"],
         ["", ""],
-        [Paragraph("<b>TOTAL A PAGAR</b>", styles['Normal']), Paragraph(f"<b>${float(factura.monto_total):,.2f}</b>", styles['Normal'])],
+        [Paragraph("<b>TOTAL A PAGAR</b>", normal_style), Paragraph(f"<b>${factura.monto_total:,.2f}</b>", normal_style)],
     ]
     
     totales_table = Table(totales_data, colWidths=[4*inch, 2*inch])
-    totales_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f4788')),
-        ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e8eef7')),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, -1), (-1, -1), 12),
-    ]))
+    totales_table.setStyle(est.tabla_totales)
     
     elements.append(totales_table)
     elements.append(Spacer(1, 0.3*inch))
     
     # ========== NOTAS ==========
     if factura.notas:
-        elements.append(Paragraph("<b>NOTAS:</b>", styles['Normal']))
+        elements.append(Paragraph("<b>NOTAS:</b>", normal_style))
         elements.append(Spacer(1, 0.1*inch))
-        notas_style = ParagraphStyle('Notas', parent=styles['Normal'], fontSize=9, textColor=colors.HexColor('#666666'))
-        elements.append(Paragraph(factura.notas, notas_style))
+        elements.append(Paragraph(factura.notas, est.notas))
         elements.append(Spacer(1, 0.2*inch))
     
     # ========== PIE DE PÁGINA ==========
-    footer_style = ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.HexColor('#999999'), alignment=1)
     elements.append(Spacer(1, 0.3*inch))
-    elements.append(Paragraph("____________________________________", footer_style))
-    elements.append(Paragraph("Firma y Sello", footer_style))
+    elements.append(Paragraph("____________________________________", est.pie))
+    elements.append(Paragraph("Firma y Sello", est.pie))
     elements.append(Spacer(1, 0.2*inch))
-    elements.append(Paragraph(f"Documento generado electrónicamente - {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", footer_style))
+    elements.append(Paragraph(f"Documento generado electrónicamente - {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", est.pie))
     
     # Generar PDF
     doc.build(elements)
-    pdf_buffer.seek(0)
-    
-    return StreamingResponse(
-        iter([pdf_buffer.getvalue()]),
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=Factura_{factura.numero_factura}.pdf"}
-    )
+    with pdf_buffer:
+        pdf_buffer.seek(0)
+        return pdf_buffer.read()
 
 
-# =========================================================
-# 🟦 DESCARGAR FACTURA EN EXCEL
-# =========================================================
-@router.get("/{factura_id}/descargar-excel")
-def descargar_factura_excel(
+@router.get("/{factura_id}/descargar-pdf")
+async def descargar_factura_pdf(
     factura_id: UUID,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    """Genera y descarga factura en formato Excel completo"""
-    try:
-        import openpyxl
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    except ImportError:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="openpyxl no está instalado"
-        )
-    
-    factura = obtener_factura_por_id(db, factura_id)
+    """Genera y descarga factura en formato PDF profesional"""
+    factura = await run_in_threadpool(obtener_factura_con_detalles, db, factura_id)
     
     if not factura:
         raise HTTPException(
@@ -409,54 +586,59 @@ def descargar_factura_excel(
             detail=f"Factura {factura_id} no encontrada"
         )
     
-    # Crear workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Factura"
-    
-    # Estilos
-    title_font = Font(size=18, bold=True, color="FFFFFF")
-    title_fill = PatternFill(start_color="1f4788", end_color="1f4788", fill_type="solid")
-    header_font = Font(size=11, bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    label_font = Font(size=10, bold=True)
-    total_font = Font(size=12, bold=True)
-    total_fill = PatternFill(start_color="E8EEF7", end_color="E8EEF7", fill_type="solid")
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
+    _validar_tamano_documento(factura)
+    
+    # La factura puede editarse: el navegador revalida siempre con el ETag
+    etag = _etag_factura(factura)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_coincide(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    # ReportLab es síncrono y CPU intensivo: se construye en el pool de procesos
+    # (o se reutiliza de la caché). El documento completo se envía en una sola respuesta
+    pdf_bytes = cache_pdf_facturas.get(etag)
+    if pdf_bytes is None:
+        pdf_bytes = await _generar_en_proceso(_generar_pdf, _instantanea_factura(factura))
+        cache_pdf_facturas.set(etag, pdf_bytes)
+    
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={
+            **headers,
+            "Content-Disposition": f"attachment; filename=Factura_{factura.numero_factura}.pdf",
+        }
     )
+
+
+# =========================================================
+# 🟦 DESCARGAR FACTURA EN EXCEL
+# =========================================================
+def _generar_excel(factura: SimpleNamespace) -> bytes:
+    """Construye el libro Excel de la factura (ejecutar fuera del event loop)"""
+    import xlsxwriter
+    
+    excel_buffer = io.BytesIO()
+    wb = xlsxwriter.Workbook(excel_buffer, {'in_memory': True})
+    ws = wb.add_worksheet("Factura")
+    
+    # Estilos (los formatos pertenecen al workbook: se crean desde las especificaciones)
+    fmt = {nombre: wb.add_format(spec) for nombre, spec in _XLSX_FORMATOS.items()}
     
     # ========== TÍTULO ==========
-    ws.merge_cells('A1:F1')
-    ws['A1'] = "FACTURA"
-    ws['A1'].font = title_font
-    ws['A1'].fill = title_fill
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
-    ws.row_dimensions[1].height = 30
+    ws.merge_range('A1:F1', "FACTURA", fmt['titulo'])
+    ws.set_row(0, 30)
     
     # Número de factura
-    ws.merge_cells('A2:F2')
-    ws['A2'] = f"No. {factura.numero_factura}"
-    ws['A2'].font = Font(size=12, bold=True)
-    ws['A2'].alignment = Alignment(horizontal='center')
+    ws.merge_range('A2:F2', f"No. {factura.numero_factura}", fmt['numero'])
     
     # ========== DATOS DE EMPRESA (Placeholder) ==========
     current_row = 4
-    ws.merge_cells(f'A{current_row}:F{current_row}')
-    ws[f'A{current_row}'] = "EMPRESA S.A. DE C.V. - NIT: 0000-000000-000-0"
-    ws[f'A{current_row}'].font = Font(size=11, bold=True)
-    ws[f'A{current_row}'].alignment = Alignment(horizontal='center')
-    ws[f'A{current_row}'].fill = PatternFill(start_color="F0F0F0", end_color="F0F0F0", fill_type="solid")
+    ws.merge_range(f'A{current_row}:F{current_row}', "EMPRESA S.A. DE C.V. - NIT: 0000-000000-000-0", fmt['empresa'])
     
     # ========== INFORMACIÓN DE CLIENTE ==========
     current_row = 6
-    ws[f'A{current_row}'] = "INFORMACIÓN DEL CLIENTE"
-    ws[f'A{current_row}'].font = header_font
-    ws[f'A{current_row}'].fill = header_fill
-    ws.merge_cells(f'A{current_row}:F{current_row}')
+    ws.merge_range(f'A{current_row}:F{current_row}', "INFORMACIÓN DEL CLIENTE", fmt['encabezado'])
     
     cliente_data = [
         ("Cliente:", factura.cliente or "N/A"),
@@ -468,153 +650,112 @@ def descargar_factura_excel(
     
     current_row += 1
     for label, value in cliente_data:
-        ws[f'A{current_row}'] = label
-        ws[f'A{current_row}'].font = label_font
-        ws[f'A{current_row}'].border = thin_border
-        ws[f'B{current_row}'] = value
-        ws[f'B{current_row}'].border = thin_border
-        ws.merge_cells(f'B{current_row}:F{current_row}')
+        ws.write(f'A{current_row}', label, fmt['etiqueta'])
+        ws.merge_range(f'B{current_row}:F{current_row}', value, fmt['borde'])
         current_row += 1
     
     # ========== INFORMACIÓN DE FACTURA ==========
     current_row += 1
-    ws[f'A{current_row}'] = "DETALLES DE LA FACTURA"
-    ws[f'A{current_row}'].font = header_font
-    ws[f'A{current_row}'].fill = header_fill
-    ws.merge_cells(f'A{current_row}:F{current_row}')
+    ws.merge_range(f'A{current_row}:F{current_row}', "DETALLES DE LA FACTURA", fmt['encabezado'])
     
     factura_data = [
-        ("Fecha Emisión:", factura.fecha_emision.strftime("%d/%m/%Y %H:%M") if factura.fecha_emision else "N/A"),
-        ("Fecha Vencimiento:", factura.fecha_vencimiento.strftime("%d/%m/%Y") if factura.fecha_vencimiento else "N/A"),
+        ("Fecha Emisión:", factura.fecha_emision_texto),
+        ("Fecha Vencimiento:", factura.fecha_vencimiento_texto),
         ("Condiciones Pago:", factura.condiciones_pago or "Contado"),
         ("Vendedor:", factura.vendedor or "N/A"),
     ]
     
     current_row += 1
     for label, value in factura_data:
-        ws[f'A{current_row}'] = label
-        ws[f'A{current_row}'].font = label_font
-        ws[f'A{current_row}'].border = thin_border
-        ws[f'B{current_row}'] = value
-        ws[f'B{current_row}'].border = thin_border
-        ws.merge_cells(f'B{current_row}:F{current_row}')
+        ws.write(f'A{current_row}', label, fmt['etiqueta'])
+        ws.merge_range(f'B{current_row}:F{current_row}', value, fmt['borde'])
         current_row += 1
     
     # ========== PRODUCTOS/SERVICIOS ==========
     if hasattr(factura, 'detalles') and factura.detalles:
         current_row += 2
-        ws[f'A{current_row}'] = "PRODUCTOS/SERVICIOS"
-        ws[f'A{current_row}'].font = header_font
-        ws[f'A{current_row}'].fill = header_fill
-        ws.merge_cells(f'A{current_row}:F{current_row}')
+        ws.merge_range(f'A{current_row}:F{current_row}', "PRODUCTOS/SERVICIOS", fmt['encabezado'])
         
         current_row += 1
         # Encabezados de tabla de productos
         productos_headers = ["#", "Producto/Servicio", "Cantidad", "P. Unitario", "Descuento", "Total"]
-        for col_idx, header in enumerate(productos_headers, start=1):
-            cell = ws.cell(row=current_row, column=col_idx)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal='center')
+        ws.write_row(f'A{current_row}', productos_headers, fmt['encabezado_tabla'])
         
         # Datos de productos
         current_row += 1
         for idx, detalle in enumerate(factura.detalles, 1):
             producto_nombre = detalle.producto.nombre if hasattr(detalle, 'producto') and detalle.producto else "Producto"
             
-            ws[f'A{current_row}'] = idx
-            ws[f'B{current_row}'] = producto_nombre
-            ws[f'C{current_row}'] = float(detalle.cantidad)
-            ws[f'D{current_row}'] = float(detalle.precio_unitario)
-            ws[f'E{current_row}'] = float(detalle.descuento_monto) if detalle.descuento_monto else 0.0
-            ws[f'F{current_row}'] = float(detalle.total)
-            
-            # Formato
-            for col in ['A', 'B', 'C', 'D', 'E', 'F']:
-                ws[f'{col}{current_row}'].border = thin_border
-            
-            ws[f'C{current_row}'].number_format = '#,##0.00'
-            ws[f'D{current_row}'].number_format = '$#,##0.00'
-            ws[f'E{current_row}'].number_format = '$#,##0.00'
-            ws[f'F{current_row}'].number_format = '$#,##0.00'
-            
-            ws[f'A{current_row}'].alignment = Alignment(horizontal='center')
-            ws[f'C{current_row}'].alignment = Alignment(horizontal='center')
-            ws[f'D{current_row}'].alignment = Alignment(horizontal='right')
-            ws[f'E{current_row}'].alignment = Alignment(horizontal='right')
-            ws[f'F{current_row}'].alignment = Alignment(horizontal='right')
+            ws.write_number(f'A{current_row}', idx, fmt['centro'])
+            ws.write_string(f'B{current_row}', producto_nombre, fmt['borde'])
+            ws.write_number(f'C{current_row}', detalle.cantidad, fmt['cantidad'])
+            ws.write_number(f'D{current_row}', detalle.precio_unitario, fmt['moneda'])
+            ws.write_number(f'E{current_row}', detalle.descuento_monto, fmt['moneda'])
+            ws.write_number(f'F{current_row}', detalle.total, fmt['moneda'])
             
             current_row += 1
     elif factura.producto_servicio:
         current_row += 2
-        ws.merge_cells(f'A{current_row}:F{current_row}')
-        ws[f'A{current_row}'] = "Descripción: " + factura.producto_servicio
-        ws[f'A{current_row}'].alignment = Alignment(wrap_text=True)
+        ws.merge_range(f'A{current_row}:F{current_row}', "Descripción: " + factura.producto_servicio, fmt['texto_largo'])
     
     # ========== TOTALES ==========
     current_row += 2
-    ws[f'D{current_row}'] = "CONCEPTO"
-    ws[f'E{current_row}'] = "MONTO"
-    ws[f'D{current_row}'].font = header_font
-    ws[f'E{current_row}'].font = header_font
-    ws[f'D{current_row}'].fill = header_fill
-    ws[f'E{current_row}'].fill = header_fill
-    ws[f'D{current_row}'].alignment = Alignment(horizontal='right')
-    ws[f'E{current_row}'].alignment = Alignment(horizontal='right')
+    ws.write(f'D{current_row}', "CONCEPTO", fmt['encabezado_totales'])
+    ws.write(f'E{current_row}', "MONTO", fmt['encabezado_totales'])
     
     totales = [
-        ("Subtotal", float(factura.subtotal)),
-        ("Descuento", -float(factura.descuento)),
-        ("IVA (13%)", float(factura.iva)),
-        ("TOTAL A PAGAR", float(factura.monto_total)),
+        ("Subtotal", factura.subtotal),
+        ("Descuento", -factura.descuento),
+        ("IVA (13%)", factura.iva),
+        ("TOTAL A PAGAR", factura.monto_total),
     ]
     
     current_row += 1
     for label, monto in totales:
-        ws[f'D{current_row}'] = label
-        ws[f'E{current_row}'] = monto
-        ws[f'E{current_row}'].number_format = '$#,##0.00'
-        ws[f'D{current_row}'].border = thin_border
-        ws[f'E{current_row}'].border = thin_border
-        ws[f'D{current_row}'].alignment = Alignment(horizontal='right')
-        ws[f'E{current_row}'].alignment = Alignment(horizontal='right')
-        
-        if label == "TOTAL A PAGAR":
-            ws[f'D{current_row}'].font = total_font
-            ws[f'E{current_row}'].font = total_font
-            ws[f'D{current_row}'].fill = total_fill
-            ws[f'E{current_row}'].fill = total_fill
-        
+        es_total = label == "TOTAL A PAGAR"
+        ws.write_string(f'D{current_row}', label, fmt['total_etiqueta' if es_total else 'concepto'])
+        ws.write_number(f'E{current_row}', monto, fmt['total_monto' if es_total else 'moneda'])
         current_row += 1
     
     # ========== NOTAS ==========
     if factura.notas:
         current_row += 2
-        ws.merge_cells(f'A{current_row}:F{current_row}')
-        ws[f'A{current_row}'] = "NOTAS:"
-        ws[f'A{current_row}'].font = label_font
+        ws.merge_range(f'A{current_row}:F{current_row}', "NOTAS:", fmt['etiqueta_simple'])
         current_row += 1
-        ws.merge_cells(f'A{current_row}:F{current_row}')
-        ws[f'A{current_row}'] = factura.notas
-        ws[f'A{current_row}'].alignment = Alignment(wrap_text=True)
+        ws.merge_range(f'A{current_row}:F{current_row}', factura.notas, fmt['texto_largo'])
     
     # Ajustar anchos
-    ws.column_dimensions['A'].width = 18
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 15
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 15
-    ws.column_dimensions['F'].width = 15
+    ws.set_column('A:A', 18)
+    ws.set_column('B:B', 25)
+    ws.set_column('C:C', 15)
+    ws.set_column('D:D', 20)
+    ws.set_column('E:F', 15)
     
     # Guardar en memoria
-    excel_buffer = io.BytesIO()
-    wb.save(excel_buffer)
-    excel_buffer.seek(0)
+    wb.close()
+    return excel_buffer.getvalue()
+
+
+@router.get("/{factura_id}/descargar-excel")
+async def descargar_factura_excel(
+    factura_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Genera y descarga factura en formato Excel completo"""
+    factura = await run_in_threadpool(obtener_factura_con_detalles, db, factura_id)
     
-    return StreamingResponse(
-        iter([excel_buffer.getvalue()]),
+    if not factura:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Factura {factura_id} no encontrada"
+        )
+    
+    _validar_tamano_documento(factura)
+    
+    excel_bytes = await _generar_en_proceso(_generar_excel, _instantanea_factura(factura))
+    
+    return Response(
+        content=excel_bytes,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename=Factura_{factura.numero_factura}.xlsx"}
     )
@@ -629,7 +770,7 @@ def descargar_factura_json(
     db: Session = Depends(get_db)
 ):
     """Genera y descarga factura completa en formato JSON con todos los detalles"""
-    factura = obtener_factura_por_id(db, factura_id)
+    factura = obtener_factura_con_detalles(db, factura_id)
     
     if not factura:
         raise HTTPException(
@@ -698,12 +839,11 @@ def descargar_factura_json(
             "total_linea": float(factura.subtotal) if factura.subtotal else 0.0
         })
     
-    # Convertir a JSON con formato bonito
-    json_content = json.dumps(factura_json, ensure_ascii=False, indent=2)
-    json_bytes = json_content.encode('utf-8')
+    # Convertir a JSON con formato bonito (orjson produce UTF-8 directamente)
+    json_bytes = orjson.dumps(factura_json, option=orjson.OPT_INDENT_2)
     
-    return StreamingResponse(
-        iter([json_bytes]),
+    return Response(
+        content=json_bytes,
         media_type="application/json",
         headers={
             "Content-Disposition": f"attachment; filename=Factura_{factura.numero_factura}.json",
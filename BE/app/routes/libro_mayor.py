@@ -2,9 +2,11 @@
 Rutas de API para el Libro Mayor.
 Proporciona endpoints para generar el libro mayor con agrupación por cuentas mayores.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session
 from BE.app.db import get_db
+from BE.app.cache import cache_libro_mayor
+from BE.app.responses import respuesta_con_etag
 from BE.app.services.libro_mayor_service import (
     generar_libro_mayor_completo, 
     obtener_resumen_por_digitos
@@ -15,8 +17,13 @@ from datetime import date
 
 router = APIRouter(prefix="/api", tags=["Libro Mayor"])
 
+def _serializar_libro_mayor(resultado: dict) -> bytes:
+    """Valida y serializa el libro mayor con LibroMayorResponse (mismo JSON que response_model)"""
+    return LibroMayorResponse.model_validate(resultado).model_dump_json().encode()
+
 @router.get("/libro_mayor", response_model=LibroMayorResponse)
 def obtener_libro_mayor(
+    request: Request,
     digitos: int = Query(4, ge=1, le=10, description="Número de dígitos para agrupar cuentas mayores"),
     fecha_inicio: Optional[date] = Query(None, description="Fecha de inicio para filtrar transacciones"),
     fecha_fin: Optional[date] = Query(None, description="Fecha fin para filtrar transacciones"),
@@ -61,7 +68,8 @@ def obtener_libro_mayor(
             incluir_detalle=incluir_detalle
         )
         
-        return resultado
+        # Con ETag: si el libro no cambió se responde 304 sin enviar el cuerpo
+        return respuesta_con_etag(request, _serializar_libro_mayor(resultado))
         
     except ValueError as e:
         raise HTTPException(
@@ -76,6 +84,7 @@ def obtener_libro_mayor(
 
 @router.get("/libro_mayor/resumen", response_model=LibroMayorResponse)
 def obtener_resumen_libro_mayor(
+    request: Request,
     digitos: int = Query(4, ge=1, le=10, description="Número de dígitos para agrupar"),
     fecha_inicio: Optional[date] = Query(None, description="Fecha de inicio"),
     fecha_fin: Optional[date] = Query(None, description="Fecha fin"),
@@ -83,17 +92,22 @@ def obtener_resumen_libro_mayor(
 ):
     """
     Obtener solo el resumen del Libro Mayor sin subcuentas.
-    Endpoint optimizado para obtener solo los totales por cuenta mayor.
+    Endpoint optimizado para obtener solo los totales por cuenta mayor
+    (el JSON se guarda en caché, se invalida al escribir transacciones, asientos
+    o cuentas; lleva ETag: 304 si no cambió).
     """
     try:
-        resultado = obtener_resumen_por_digitos(
-            db=db,
-            digitos=digitos,
-            fecha_inicio=fecha_inicio,
-            fecha_fin=fecha_fin
+        # La fecha de hoy forma parte de la clave: el resumen incluye fecha_generacion
+        cuerpo = cache_libro_mayor.obtener_o_calcular(
+            (digitos, fecha_inicio, fecha_fin, date.today()),
+            lambda: _serializar_libro_mayor(obtener_resumen_por_digitos(
+                db=db,
+                digitos=digitos,
+                fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_fin
+            ))
         )
-        
-        return resultado
+        return respuesta_con_etag(request, cuerpo)
         
     except ValueError as e:
         raise HTTPException(
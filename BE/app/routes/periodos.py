@@ -2,9 +2,12 @@
 Rutas de API para operaciones de Períodos Contables.
 Proporciona endpoints CRUD para gestionar períodos contables.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from BE.app.db import get_db
+from BE.app.cache import cache_periodos_activos
+from BE.app.responses import respuesta_con_etag
 from BE.app.schemas.periodo import PeriodoCreate, PeriodoRead, PeriodoUpdate
 from BE.app.services.periodo_service import (
     create_periodo, get_periodo, get_periodos, get_periodos_activos, 
@@ -14,10 +17,14 @@ from typing import List
 
 router = APIRouter(prefix="/api/periodos", tags=["Períodos Contables"])
 
+_LISTA_PERIODOS = TypeAdapter(List[PeriodoRead])
+
 @router.post("/", response_model=PeriodoRead, status_code=status.HTTP_201_CREATED)
 def crear_periodo(periodo: PeriodoCreate, db: Session = Depends(get_db)):
     """Crear un nuevo período contable"""
-    return create_periodo(db, periodo)
+    nuevo_periodo = create_periodo(db, periodo)
+    cache_periodos_activos.clear()
+    return nuevo_periodo
 
 @router.get("/", response_model=List[PeriodoRead])
 def listar_periodos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
@@ -25,9 +32,18 @@ def listar_periodos(skip: int = 0, limit: int = 100, db: Session = Depends(get_d
     return get_periodos(db, skip=skip, limit=limit)
 
 @router.get("/activos", response_model=List[PeriodoRead])
-def listar_periodos_activos(db: Session = Depends(get_db)):
-    """Obtener solo períodos con estado ABIERTO para transacciones"""
-    return get_periodos_activos(db)
+def listar_periodos_activos(request: Request, db: Session = Depends(get_db)):
+    """
+    Obtener solo períodos con estado ABIERTO para transacciones.
+    El JSON se guarda en caché (se invalida al escribir) y lleva ETag: 304 si no cambió.
+    """
+    cuerpo = cache_periodos_activos.obtener_o_calcular(
+        "activos",
+        lambda: _LISTA_PERIODOS.dump_json(
+            _LISTA_PERIODOS.validate_python(get_periodos_activos(db), from_attributes=True)
+        )
+    )
+    return respuesta_con_etag(request, cuerpo)
 
 @router.get("/{periodo_id}", response_model=PeriodoRead)
 def obtener_periodo(periodo_id: int, db: Session = Depends(get_db)):
@@ -37,10 +53,13 @@ def obtener_periodo(periodo_id: int, db: Session = Depends(get_db)):
 @router.put("/{periodo_id}", response_model=PeriodoRead)
 def actualizar_periodo(periodo_id: int, periodo: PeriodoUpdate, db: Session = Depends(get_db)):
     """Actualizar un período contable existente"""
-    return update_periodo(db, periodo_id, periodo)
+    periodo_actualizado = update_periodo(db, periodo_id, periodo)
+    cache_periodos_activos.clear()
+    return periodo_actualizado
 
 @router.delete("/{periodo_id}", status_code=status.HTTP_204_NO_CONTENT)
 def eliminar_periodo(periodo_id: int, db: Session = Depends(get_db)):
     """Eliminar un período contable"""
     delete_periodo(db, periodo_id)
+    cache_periodos_activos.clear()
     return None
\ No newline at end of file
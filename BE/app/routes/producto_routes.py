@@ -2,18 +2,22 @@
 Rutas de API para operaciones de Productos y Servicios.
 Proporciona endpoints CRUD para gestión del catálogo.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from decimal import Decimal
 
 from BE.app.db import get_db
+from BE.app.cache import cache_estadisticas_productos
+from BE.app.paginacion import CABECERA_CURSOR, codificar_cursor, decodificar_cursor
+from BE.app.responses import ORJSONResponse, respuesta_con_etag, serializar_json
 from BE.app.schemas.producto_servicio_schemas import (
     ProductoServicioCreate, 
     ProductoServicioUpdate, 
     ProductoServicioOut, 
     ProductoServicioResumen
 )
+from BE.app.schemas.filas import desde_fila
 from BE.app.services.producto_servicio_service import (
     crear_producto,
     obtener_producto_por_id,
@@ -43,7 +47,9 @@ def crear_nuevo_producto(
     - Valida código SKU único
     - Tipo: PRODUCTO o SERVICIO
     """
-    return crear_producto(db, producto)
+    nuevo_producto = crear_producto(db, producto)
+    cache_estadisticas_productos.clear()
+    return nuevo_producto
 
 
 # =========================================================
@@ -51,8 +57,10 @@ def crear_nuevo_producto(
 # =========================================================
 @router.get("/", response_model=List[ProductoServicioOut])
 def listar_todos_productos(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description="Obsoleto: usar cursor"),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description=f"Cursor de la cabecera {CABECERA_CURSOR}"),
     busqueda: Optional[str] = Query(None, description="Buscar en nombre, código o descripción"),
     tipo: Optional[str] = Query(None, description="PRODUCTO o SERVICIO"),
     categoria: Optional[str] = Query(None, description="Filtrar por categoría"),
@@ -67,8 +75,19 @@ def listar_todos_productos(
     - categoria: categoría específica
     - activo: SI o NO
     - bajo_stock: true para alertas de inventario
+    Si hay más resultados, la cabecera X-Next-Cursor trae el cursor de la página siguiente.
+    Las filas vienen de la base de datos: se construyen sin validar (model_construct).
     """
-    return listar_productos(db, skip, limit, busqueda, tipo, categoria, activo, bajo_stock)
+    despues_de = decodificar_cursor(cursor, str, int) if cursor else None
+    productos = listar_productos(
+        db, skip, limit, busqueda, tipo, categoria, activo, bajo_stock, despues_de
+    )
+
+    if len(productos) == limit:
+        ultimo = productos[-1]
+        response.headers[CABECERA_CURSOR] = codificar_cursor(ultimo.nombre, ultimo.id_producto)
+
+    return [ProductoServicioOut.model_construct(**p._mapping) for p in productos]
 
 
 # =========================================================
@@ -111,7 +130,9 @@ def actualizar_producto_existente(
     db: Session = Depends(get_db)
 ):
     """Actualiza los datos de un producto/servicio"""
-    return actualizar_producto(db, producto_id, producto)
+    producto_actualizado = actualizar_producto(db, producto_id, producto)
+    cache_estadisticas_productos.clear()
+    return producto_actualizado
 
 
 # =========================================================
@@ -129,7 +150,9 @@ def modificar_stock(
     - cantidad negativa: resta del stock (venta)
     Valida stock insuficiente.
     """
-    return actualizar_stock(db, producto_id, cantidad)
+    producto_actualizado = actualizar_stock(db, producto_id, cantidad)
+    cache_estadisticas_productos.clear()
+    return producto_actualizado
 
 
 # =========================================================
@@ -144,40 +167,60 @@ def desactivar_producto_existente(
     Desactiva un producto/servicio (marca como inactivo).
     Mejor práctica que eliminarlo.
     """
-    return desactivar_producto(db, producto_id)
+    producto_desactivado = desactivar_producto(db, producto_id)
+    cache_estadisticas_productos.clear()
+    return producto_desactivado
 
 
 # =========================================================
 # 🟩 OBTENER PRODUCTOS BAJO STOCK
 # =========================================================
 @router.get("/alertas/bajo-stock", response_model=List[ProductoServicioResumen])
-def productos_bajo_stock(db: Session = Depends(get_db)):
+def productos_bajo_stock(
+    response: Response,
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=f"Cursor de la cabecera {CABECERA_CURSOR}"),
+    db: Session = Depends(get_db)
+):
     """
     Lista productos con stock actual menor al mínimo.
     Útil para alertas de reabastecimiento.
+    Si hay más resultados, la cabecera X-Next-Cursor trae el cursor de la página siguiente.
     """
-    return obtener_productos_bajo_stock(db)
+    despues_de = decodificar_cursor(cursor, Decimal, int) if cursor else None
+    productos = obtener_productos_bajo_stock(db, limit, despues_de)
+
+    if len(productos) == limit:
+        ultimo = productos[-1]
+        response.headers[CABECERA_CURSOR] = codificar_cursor(ultimo.stock_actual, ultimo.id_producto)
+
+    return [desde_fila(ProductoServicioResumen, p) for p in productos]
 
 
 # =========================================================
 # 🟩 ESTADÍSTICAS DE PRODUCTOS
 # =========================================================
-@router.get("/estadisticas/resumen")
-def obtener_estadisticas(db: Session = Depends(get_db)):
+@router.get("/estadisticas/resumen", response_class=ORJSONResponse)
+def obtener_estadisticas(request: Request, db: Session = Depends(get_db)):
     """
     Obtiene estadísticas del catálogo.
     - Total productos/servicios
     - Activos vs inactivos
     - Valor total del inventario
     - Productos bajo stock
+    En caché: se invalida al escribir productos o al facturar (descuenta stock).
+    Lleva ETag: 304 si no cambió.
     """
-    return obtener_estadisticas_productos(db)
+    cuerpo = cache_estadisticas_productos.obtener_o_calcular(
+        "resumen", lambda: serializar_json(obtener_estadisticas_productos(db))
+    )
+    return respuesta_con_etag(request, cuerpo)
 
 
 # =========================================================
 # 🟩 CALCULAR PRECIO CON IVA
 # =========================================================
-@router.get("/{producto_id}/precio-iva")
+@router.get("/{producto_id}/precio-iva", response_class=ORJSONResponse)
 def obtener_precio_con_iva(
     producto_id: int,
     db: Session = Depends(get_db)
@@ -187,7 +230,7 @@ def obtener_precio_con_iva(
     Solo si aplica_iva es True.
     """
     precio = calcular_precio_con_iva(db, producto_id)
-    return {
+    return ORJSONResponse({
         "id_producto": producto_id,
         "precio_con_iva": precio
-    }
+    })
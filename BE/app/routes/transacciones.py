@@ -3,9 +3,12 @@ Rutas de API para operaciones de Transacciones.
 Proporciona endpoints CRUD para gestionar transacciones contables.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 from BE.app.db import get_db
+from BE.app.cache import cache_libro_mayor
+from BE.app.paginacion import CABECERA_CURSOR, codificar_cursor, decodificar_cursor
+from BE.app.responses import ORJSONResponse
 from BE.app.schemas.transaccion import (
     TransaccionCreate,
     TransaccionRead,
@@ -13,6 +16,7 @@ from BE.app.schemas.transaccion import (
 )
 from BE.app.services.transaccion_service import (
     create_transaccion,
+    create_transacciones_bulk,
     get_transaccion,
     get_transacciones,
     update_transaccion,
@@ -23,11 +27,14 @@ from datetime import datetime
 
 router = APIRouter(prefix="/api/transacciones", tags=["Transacciones"])
 
+# Máximo de transacciones por petición de carga masiva
+MAX_TRANSACCIONES_BULK = 1000
+
 
 # ============================================================
 # 🟢 POST — CREAR TRANSACCIÓN
 # ============================================================
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", status_code=status.HTTP_201_CREATED, response_class=ORJSONResponse)
 def crear_transaccion_route(
     transaccion: TransaccionCreate,
     db: Session = Depends(get_db)
@@ -37,11 +44,38 @@ def crear_transaccion_route(
     Las facturas se crean de forma independiente.
     """
     nueva_transaccion = create_transaccion(db, transaccion)
+    cache_libro_mayor.clear()
 
-    return {
+    return ORJSONResponse({
         "id_transaccion": nueva_transaccion.id_transaccion,
         "categoria": nueva_transaccion.categoria
-    }
+    }, status_code=status.HTTP_201_CREATED)
+
+
+# ============================================================
+# 🟢 POST — CREAR TRANSACCIONES EN LOTE
+# ============================================================
+@router.post("/bulk", status_code=status.HTTP_201_CREATED, response_class=ORJSONResponse)
+def crear_transacciones_bulk_route(
+    transacciones: List[TransaccionCreate],
+    db: Session = Depends(get_db)
+):
+    """
+    Crea varias transacciones en una sola operación (importaciones masivas).
+    Todas se insertan con un único INSERT y un solo commit: o se crean todas o ninguna.
+    """
+    if len(transacciones) > MAX_TRANSACCIONES_BULK:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Máximo {MAX_TRANSACCIONES_BULK} transacciones por petición"
+        )
+    if not transacciones:
+        return ORJSONResponse({"ids_transaccion": [], "total": 0}, status_code=status.HTTP_201_CREATED)
+
+    ids = create_transacciones_bulk(db, transacciones)
+    cache_libro_mayor.clear()
+
+    return ORJSONResponse({"ids_transaccion": ids, "total": len(ids)}, status_code=status.HTTP_201_CREATED)
 
 
 # ============================================================
@@ -49,8 +83,10 @@ def crear_transaccion_route(
 # ============================================================
 @router.get("/", response_model=List[TransaccionRead])
 def listar_transacciones_route(
-    skip: int = 0,
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description="Obsoleto: usar cursor"),
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description=f"Cursor de la cabecera {CABECERA_CURSOR}"),
     fecha_from: Optional[datetime] = Query(None, description="Filter from date"),
     fecha_to: Optional[datetime] = Query(None, description="Filter to date"),
     id_periodo: Optional[int] = Query(None, description="Filter by period ID"),
@@ -59,9 +95,12 @@ def listar_transacciones_route(
     db: Session = Depends(get_db)
 ):
     """
-    Lista transacciones con múltiples filtros opcionales.
+    Lista transacciones con múltiples filtros opcionales, de la más reciente a la más antigua.
+    Si hay más resultados, la cabecera X-Next-Cursor trae el cursor de la página siguiente.
+    Las filas vienen de la base de datos: se construyen sin validar (model_construct).
     """
-    return get_transacciones(
+    despues_de = decodificar_cursor(cursor, datetime.fromisoformat, int) if cursor else None
+    transacciones = get_transacciones(
         db,
         skip=skip,
         limit=limit,
@@ -69,9 +108,18 @@ def listar_transacciones_route(
         fecha_to=fecha_to,
         id_periodo=id_periodo,
         tipo=tipo,
-        categoria=categoria
+        categoria=categoria,
+        despues_de=despues_de
     )
 
+    if len(transacciones) == limit:
+        ultima = transacciones[-1]
+        response.headers[CABECERA_CURSOR] = codificar_cursor(
+            ultima.fecha_transaccion, ultima.id_transaccion
+        )
+
+    return [TransaccionRead.model_construct(**t._mapping) for t in transacciones]
+
 
 # ============================================================
 # 🟡 GET — OBTENER UNA TRANSACCIÓN POR ID
@@ -99,7 +147,9 @@ def actualizar_transaccion_route(
     """
     Actualiza una transacción existente.
     """
-    return update_transaccion(db, transaccion_id, transaccion)
+    transaccion_actualizada = update_transaccion(db, transaccion_id, transaccion)
+    cache_libro_mayor.clear()
+    return transaccion_actualizada
 
 
 # ============================================================
@@ -114,4 +164,5 @@ def eliminar_transaccion_route(
     Elimina una transacción y sus datos asociados según la política definida.
     """
     delete_transaccion(db, transaccion_id)
+    cache_libro_mayor.clear()
     return None
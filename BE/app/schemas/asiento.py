@@ -2,23 +2,26 @@
 Esquemas Pydantic para Asientos Contables.
 Define la validación de datos y serialización para requests y responses de la API.
 """
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import Optional
 from decimal import Decimal
 
+from BE.app.schemas.tipos import FloatDecimal
+
+CERO = Decimal("0.00")
+
 class AsientoBase(BaseModel):
     id_transaccion: int = Field(..., description="ID de la transacción asociada")
     id_cuenta: int = Field(..., description="ID de la cuenta asociada")
-    debe: Decimal = Field(default=Decimal("0.00"), ge=0, description="Monto del débito")
-    haber: Decimal = Field(default=Decimal("0.00"), ge=0, description="Monto del crédito")
+    debe: Decimal = Field(default=CERO, ge=0, description="Monto del débito")
+    haber: Decimal = Field(default=CERO, ge=0, description="Monto del crédito")
     
-    @validator('haber')
-    def validate_debe_haber(cls, v, values):
+    @model_validator(mode='after')
+    def validate_debe_haber(self):
         """Asegurar que exactamente uno de debe o haber sea mayor que 0"""
-        debe = values.get('debe', Decimal("0.00"))
-        if (debe > 0 and v > 0) or (debe == 0 and v == 0):
+        if (self.debe > 0) == (self.haber > 0):
             raise ValueError('Exactamente uno de debe o haber debe ser mayor que 0')
-        return v
+        return self
 
 class AsientoCreate(AsientoBase):
     pass
@@ -31,6 +34,7 @@ class AsientoUpdate(BaseModel):
 
 class AsientoRead(AsientoBase):
     id_asiento: int
+    debe: FloatDecimal
+    haber: FloatDecimal
     
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, frozen=True)
\ No newline at end of file
@@ -2,10 +2,16 @@
 Schemas Pydantic para Cliente
 """
 from typing import Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime
 import re
 
+from BE.app.schemas.tipos import SiNo
+
+# Patrón de email compilado una sola vez al importar el módulo
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+TIPOS_CLIENTE = frozenset({'INDIVIDUAL', 'EMPRESA'})
+
 
 class ClienteCreate(BaseModel):
     """Schema para crear un cliente nuevo"""
@@ -22,15 +28,14 @@ class ClienteCreate(BaseModel):
     def validar_email(cls, v):
         """Validar formato de email solo si se proporciona"""
         if v and v.strip():
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, v):
+            if not EMAIL_RE.match(v):
                 raise ValueError('Debe ser un email válido')
         return v if v and v.strip() else None
     
     @field_validator('tipo_cliente')
     @classmethod
     def validar_tipo(cls, v):
-        if v not in ['INDIVIDUAL', 'EMPRESA']:
+        if v not in TIPOS_CLIENTE:
             raise ValueError('Tipo debe ser INDIVIDUAL o EMPRESA')
         return v
 
@@ -44,11 +49,11 @@ class ClienteUpdate(BaseModel):
     email: Optional[str] = Field(None, max_length=100)
     tipo_cliente: Optional[str] = None
     notas: Optional[str] = None
-    activo: Optional[str] = Field(None, description="SI o NO")
+    activo: Optional[SiNo] = Field(None, description="SI o NO")
 
 
 class ClienteOut(BaseModel):
-    """Schema de respuesta de cliente"""
+    """Schema de respuesta de cliente (sin validadores: apto para model_construct)"""
     id_cliente: int
     nombre: str
     nit: Optional[str] = None
@@ -58,19 +63,20 @@ class ClienteOut(BaseModel):
     tipo_cliente: str
     notas: Optional[str] = None
     fecha_registro: datetime
-    activo: str
+    activo: SiNo
     
-    class Config:
-        from_attributes = True
+    # Inmutable: instantánea de solo lectura de la fila, construida sin validar
+    # (desde_fila/model_construct); ninguna ruta la modifica antes de serializarla
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class ClienteResumen(BaseModel):
-    """Schema resumido para listados"""
+    """Schema resumido para listados (sin validadores: apto para model_construct)"""
     id_cliente: int
     nombre: str
     nit: Optional[str] = None
     tipo_cliente: str
-    activo: str
+    activo: SiNo
     
-    class Config:
-        from_attributes = True
+    # Inmutable: las instancias se comparten entre peticiones vía cache_clientes
+    model_config = ConfigDict(from_attributes=True, frozen=True)
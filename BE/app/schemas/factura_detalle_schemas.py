@@ -2,10 +2,12 @@
 Schemas Pydantic para Detalle de Factura
 """
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from decimal import Decimal
 from uuid import UUID
 
+from BE.app.schemas.tipos import FloatDecimal
+
 
 class FacturaDetalleCreate(BaseModel):
     """Schema para crear una línea de detalle en la factura"""
@@ -33,17 +35,16 @@ class FacturaDetalleOut(BaseModel):
     id_factura: UUID
     id_producto: int
     descripcion: Optional[str] = None
-    cantidad: Decimal
-    precio_unitario: Decimal
-    descuento_porcentaje: Optional[Decimal] = None
-    descuento_monto: Optional[Decimal] = None
-    subtotal: Decimal
-    iva: Decimal
-    total: Decimal
+    cantidad: FloatDecimal
+    precio_unitario: FloatDecimal
+    descuento_porcentaje: Optional[FloatDecimal] = None
+    descuento_monto: Optional[FloatDecimal] = None
+    subtotal: FloatDecimal
+    iva: FloatDecimal
+    total: FloatDecimal
     
     # Información del producto (JOIN)
     producto_nombre: Optional[str] = None
     producto_codigo: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
@@ -1,36 +1,17 @@
-from typing import Optional, List
-from pydantic import BaseModel, Field, field_validator
+from typing import Annotated, Any, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, Tag
 from datetime import datetime
 from uuid import UUID
 from decimal import Decimal
-import re
 
+from BE.app.schemas.tipos import EmailOpcional, FloatDecimal
 
-class FacturaCreate(BaseModel):
-    """Schema para crear una factura nueva (soporta versión legacy y normalizada)"""
-    # Cliente (nuevo - normalizado)
-    id_cliente: Optional[int] = Field(None, description="ID del cliente (tabla clientes)")
-    
-    # Cliente legacy (compatibilidad hacia atrás)
-    cliente: Optional[str] = Field(None, min_length=1, max_length=150, description="Nombre del cliente (legacy)")
-    nit_cliente: Optional[str] = Field(None, max_length=20, description="NIT o RFC del cliente (legacy)")
-    direccion_cliente: Optional[str] = Field(None, max_length=255, description="Dirección del cliente")
-    telefono_cliente: Optional[str] = Field(None, max_length=20, description="Teléfono del cliente")
-    email_cliente: Optional[str] = Field(None, max_length=100, description="Email del cliente")
-    
+
+class FacturaCreateBase(BaseModel):
+    """Campos comunes a las dos formas de crear una factura simple"""
     # Producto o Servicio (legacy para facturas simples)
     producto_servicio: Optional[str] = Field(None, min_length=1, description="Descripción del producto o servicio (legacy)")
     
-    @field_validator('email_cliente')
-    @classmethod
-    def validar_email(cls, v):
-        """Validar formato de email solo si se proporciona"""
-        if v and v.strip():  # Solo validar si no está vacío
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, v):
-                raise ValueError('Debe ser un email válido (ejemplo: usuario@dominio.com)')
-        return v if v and v.strip() else None  # Convertir strings vacíos a None
-    
     # Montos (opcionales si se proporcionan detalles)
     subtotal: Optional[Decimal] = Field(None, ge=0, description="Subtotal antes de impuestos y descuentos")
     descuento: Optional[Decimal] = Field(0.00, ge=0, description="Descuento aplicado")
@@ -44,20 +25,57 @@ class FacturaCreate(BaseModel):
     fecha_vencimiento: Optional[datetime] = Field(None, description="Fecha de vencimiento")
 
 
+class FacturaCreateNormalizada(FacturaCreateBase):
+    """Factura con cliente de la tabla clientes (id_cliente)"""
+    id_cliente: int = Field(..., description="ID del cliente (tabla clientes)")
+
+
+class FacturaCreateLegacy(FacturaCreateBase):
+    """Factura con los datos del cliente escritos a mano (compatibilidad hacia atrás)"""
+    cliente: Optional[str] = Field(None, min_length=1, max_length=150, description="Nombre del cliente (legacy)")
+    nit_cliente: Optional[str] = Field(None, max_length=20, description="NIT o RFC del cliente (legacy)")
+    direccion_cliente: Optional[str] = Field(None, max_length=255, description="Dirección del cliente")
+    telefono_cliente: Optional[str] = Field(None, max_length=20, description="Teléfono del cliente")
+    email_cliente: EmailOpcional = Field(None, description="Email del cliente")
+
+
+# Campos de cliente que solo existen en la forma legacy
+CAMPOS_CLIENTE_LEGACY = frozenset(FacturaCreateLegacy.model_fields) - frozenset(FacturaCreateBase.model_fields)
+
+
+def _forma_factura(valor: Any) -> str:
+    """Elige la rama sin campo extra en el JSON: normalizada si trae id_cliente"""
+    if isinstance(valor, dict):
+        id_cliente = valor.get("id_cliente")
+    else:
+        id_cliente = getattr(valor, "id_cliente", None)
+    return "normalizada" if id_cliente is not None else "legacy"
+
+
+# Una factura simple valida solo los campos de su forma de cliente
+FacturaCreate = Annotated[
+    Union[
+        Annotated[FacturaCreateNormalizada, Tag("normalizada")],
+        Annotated[FacturaCreateLegacy, Tag("legacy")],
+    ],
+    Discriminator(_forma_factura),
+]
+
+
 class FacturaUpdate(BaseModel):
     """Schema para actualizar una factura (campos opcionales)"""
     cliente: Optional[str] = Field(None, min_length=1, max_length=150)
     nit_cliente: Optional[str] = Field(None, max_length=20)
     direccion_cliente: Optional[str] = Field(None, max_length=255)
     telefono_cliente: Optional[str] = Field(None, max_length=20)
-    email_cliente: Optional[str] = Field(None, max_length=100)
+    email_cliente: EmailOpcional = None
     notas: Optional[str] = None
     condiciones_pago: Optional[str] = Field(None, max_length=100)
     vendedor: Optional[str] = Field(None, max_length=100)
 
 
 class FacturaOut(BaseModel):
-    """Schema de respuesta de factura"""
+    """Schema de respuesta de factura (sin validadores: apto para model_construct)"""
     id_factura: UUID
     numero_factura: str
     
@@ -75,10 +93,10 @@ class FacturaOut(BaseModel):
     producto_servicio: Optional[str] = None
     
     # Montos
-    subtotal: Decimal
-    descuento: Decimal
-    iva: Decimal
-    monto_total: Decimal
+    subtotal: FloatDecimal
+    descuento: FloatDecimal
+    iva: FloatDecimal
+    monto_total: FloatDecimal
     
     # Información adicional
     notas: Optional[str] = None
@@ -92,29 +110,24 @@ class FacturaOut(BaseModel):
     # Relaciones (opcional)
     id_transaccion: Optional[int] = None
 
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            Decimal: lambda v: float(v),
-            datetime: lambda v: v.isoformat() if v else None
-        }
+    # El schema se construye en el precalentamiento del lifespan, no al importar
+    model_config = ConfigDict(from_attributes=True, frozen=True, defer_build=True)
 
 
 class FacturaResumen(BaseModel):
-    """Schema resumido de factura para listados"""
+    """Schema resumido de factura para listados (sin validadores: apto para model_construct)"""
     id_factura: UUID
     numero_factura: str
     cliente: str
-    monto_total: Decimal
+    monto_total: FloatDecimal
     fecha_emision: datetime
     estado: str = "Generada"
     
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            Decimal: lambda v: float(v),
-            datetime: lambda v: v.isoformat() if v else None
-        }
+    model_config = ConfigDict(from_attributes=True, frozen=True, defer_build=True)
+
+
+# Modelos con defer_build: main.precalentar_schemas los construye tras el arranque
+MODELOS_DIFERIDOS = (FacturaOut, FacturaResumen)
 
 
 # =========================================================
@@ -142,11 +155,3 @@ class FacturaConDetallesCreate(BaseModel):
     
     # Líneas de detalle
     detalles: List[DetalleFacturaItem] = Field(..., min_length=1, description="Líneas de productos/servicios")
-    
-    @field_validator('detalles')
-    @classmethod
-    def validar_detalles(cls, v):
-        if not v or len(v) == 0:
-            raise ValueError('Debe incluir al menos un producto/servicio')
-        return v
-
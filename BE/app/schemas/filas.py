@@ -0,0 +1,21 @@
+"""
+Construcción de schemas de respuesta a partir de filas propias de la base de datos.
+Solo para schemas sin validadores (lo indica su docstring): se usa model_construct.
+"""
+from functools import cache
+from typing import Any, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+@cache
+def _campos(modelo: Type[BaseModel]) -> Tuple[str, ...]:
+    """Nombres de campos del schema, calculados una sola vez por clase"""
+    return tuple(modelo.model_fields)
+
+
+def desde_fila(modelo: Type[M], fila: Any) -> M:
+    """Construye el schema sin validar leyendo cada campo como atributo de la fila ORM"""
+    return modelo.model_construct(**{campo: getattr(fila, campo) for campo in _campos(modelo)})
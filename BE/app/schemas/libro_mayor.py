@@ -2,71 +2,53 @@
 Esquemas Pydantic para el Libro Mayor.
 Define la estructura de datos para requests y responses del libro mayor.
 """
-from pydantic import BaseModel, Field, field_validator, ConfigDict, model_validator
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from typing import List, Optional
 from datetime import date
-from decimal import Decimal
+
+from BE.app.schemas.catalogo_cuentas import TipoCuenta
+from BE.app.schemas.tipos import FloatDecimal
 
 class SubcuentaResponse(BaseModel):
     """Esquema para una subcuenta en el libro mayor"""
     codigo_cuenta: str = Field(..., min_length=1, max_length=20, description="Código de la subcuenta")
     nombre_cuenta: str = Field(..., min_length=1, max_length=100, description="Nombre de la subcuenta")
-    tipo_cuenta: str = Field(..., description="Tipo de cuenta (Activo, Pasivo, Capital, Ingreso, Egreso)")
-    total_debe: Decimal = Field(..., ge=0, description="Total de débitos")
-    total_haber: Decimal = Field(..., ge=0, description="Total de créditos")
-    saldo: Decimal = Field(..., description="Saldo de la subcuenta (debe - haber, puede ser negativo)")
-    
-    @field_validator('tipo_cuenta')
-    @classmethod
-    def validate_tipo_cuenta(cls, v: str) -> str:
-        tipos_validos = {'Activo', 'Pasivo', 'Capital', 'Ingreso', 'Egreso'}
-        if v not in tipos_validos:
-            raise ValueError(f'Tipo de cuenta debe ser uno de: {tipos_validos}')
-        return v
+    tipo_cuenta: TipoCuenta = Field(..., description="Tipo de cuenta (Activo, Pasivo, Capital, Ingreso, Egreso)")
+    total_debe: FloatDecimal = Field(..., ge=0, description="Total de débitos")
+    total_haber: FloatDecimal = Field(..., ge=0, description="Total de créditos")
+    saldo: FloatDecimal = Field(..., description="Saldo de la subcuenta (debe - haber, puede ser negativo)")
+
+    model_config = ConfigDict(frozen=True, defer_build=True)
 
 class CuentaMayorResponse(BaseModel):
     """Esquema para una cuenta mayor en el libro mayor"""
     codigo_mayor: str = Field(..., min_length=1, max_length=10, description="Código de la cuenta mayor")
     nombre_mayor: str = Field(..., min_length=1, max_length=100, description="Nombre de la cuenta mayor")
-    total_debe: Decimal = Field(..., ge=0, description="Total de débitos agregado")
-    total_haber: Decimal = Field(..., ge=0, description="Total de créditos agregado")
-    saldo: Decimal = Field(..., description="Saldo agregado de la cuenta mayor (puede ser negativo)")
+    total_debe: FloatDecimal = Field(..., ge=0, description="Total de débitos agregado")
+    total_haber: FloatDecimal = Field(..., ge=0, description="Total de créditos agregado")
+    saldo: FloatDecimal = Field(..., description="Saldo agregado de la cuenta mayor (puede ser negativo)")
     subcuentas: List[SubcuentaResponse] = Field(default=[], description="Lista de subcuentas (si se solicita detalle)")
 
+    model_config = ConfigDict(frozen=True, defer_build=True)
+
 class ResumenLibroMayor(BaseModel):
     """Esquema para el resumen del libro mayor"""
     total_cuentas: int = Field(..., ge=0, description="Número total de cuentas mayores")
-    total_debe_general: Decimal = Field(..., ge=0, description="Suma total de débitos")
-    total_haber_general: Decimal = Field(..., ge=0, description="Suma total de créditos")
-    diferencia: Decimal = Field(..., ge=0, description="Diferencia absoluta entre debe y haber")
-    fecha_generacion: str = Field(..., description="Fecha de generación del reporte en formato ISO")
-    
-    @field_validator('fecha_generacion')
-    @classmethod
-    def validate_fecha_iso(cls, v: str) -> str:
-        try:
-            date.fromisoformat(v)
-            return v
-        except ValueError:
-            raise ValueError('La fecha debe estar en formato ISO (YYYY-MM-DD)')
+    total_debe_general: FloatDecimal = Field(..., ge=0, description="Suma total de débitos")
+    total_haber_general: FloatDecimal = Field(..., ge=0, description="Suma total de créditos")
+    diferencia: FloatDecimal = Field(..., ge=0, description="Diferencia absoluta entre debe y haber")
+    fecha_generacion: date = Field(..., description="Fecha de generación del reporte (ISO en JSON)")
+
+    model_config = ConfigDict(frozen=True, defer_build=True)
 
 class FiltrosAplicados(BaseModel):
     """Esquema para los filtros aplicados en la consulta"""
     digitos: int = Field(..., ge=1, le=10, description="Número de dígitos usado para agrupar")
-    fecha_inicio: Optional[str] = Field(None, description="Fecha inicio en formato ISO")
-    fecha_fin: Optional[str] = Field(None, description="Fecha fin en formato ISO")
+    fecha_inicio: Optional[date] = Field(None, description="Fecha inicio (ISO en JSON)")
+    fecha_fin: Optional[date] = Field(None, description="Fecha fin (ISO en JSON)")
     incluir_detalle: bool = Field(..., description="Si se incluyó detalle de subcuentas")
-    
-    @field_validator('fecha_inicio', 'fecha_fin')
-    @classmethod
-    def validate_fechas_iso(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None:
-            try:
-                date.fromisoformat(v)
-                return v
-            except ValueError:
-                raise ValueError('Las fechas deben estar en formato ISO (YYYY-MM-DD)')
-        return v
+
+    model_config = ConfigDict(frozen=True, defer_build=True)
 
 class LibroMayorResponse(BaseModel):
     """Esquema completo de respuesta del libro mayor"""
@@ -75,10 +57,11 @@ class LibroMayorResponse(BaseModel):
     filtros_aplicados: FiltrosAplicados = Field(..., description="Filtros aplicados en la consulta")
     
     model_config = ConfigDict(
-        # Convertir Decimal a float para JSON
-        json_encoders={Decimal: float},
         # Permitir uso de atributos de ORM
         from_attributes=True,
+        frozen=True,
+        # El schema se construye en el precalentamiento del lifespan, no al importar
+        defer_build=True,
         # Documentación adicional
         json_schema_extra={
             "example": {
@@ -109,6 +92,11 @@ class LibroMayorResponse(BaseModel):
         }
     )
 
+# Modelos con defer_build: main.precalentar_schemas los construye tras el arranque
+MODELOS_DIFERIDOS = (
+    SubcuentaResponse, CuentaMayorResponse, ResumenLibroMayor, FiltrosAplicados, LibroMayorResponse
+)
+
 class LibroMayorRequest(BaseModel):
     """Esquema para solicitar el libro mayor"""
     digitos: int = Field(4, ge=1, le=10, description="Número de dígitos para agrupar cuentas mayores")
@@ -117,21 +105,17 @@ class LibroMayorRequest(BaseModel):
     incluir_detalle: bool = Field(False, description="Incluir subcuentas en el detalle")
     
     @model_validator(mode='after')
-    def validate_rango_fechas(self):
+    def validate_fechas(self):
+        """Fechas no futuras y rango ordenado, en una sola pasada"""
+        hoy = date.today()
+        if any(f is not None and f > hoy for f in (self.fecha_inicio, self.fecha_fin)):
+            raise ValueError('Las fechas no pueden ser futuras')
         if self.fecha_fin is not None and self.fecha_inicio is not None:
             if self.fecha_fin < self.fecha_inicio:
                 raise ValueError('La fecha fin no puede ser anterior a la fecha inicio')
         return self
     
-    @field_validator('fecha_inicio', 'fecha_fin')
-    @classmethod
-    def validate_fechas_no_futuras(cls, v: Optional[date]) -> Optional[date]:
-        if v is not None and v > date.today():
-            raise ValueError('Las fechas no pueden ser futuras')
-        return v
-    
     model_config = ConfigDict(
-        json_encoders={date: lambda v: v.isoformat()},
         json_schema_extra={
             "example": {
                 "digitos": 4,
@@ -2,15 +2,18 @@
 Esquemas Pydantic para Períodos Contables.
 Define la validación de datos y serialización para requests y responses de la API.
 """
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Literal, Optional
 from datetime import date
 
+TipoPeriodo = Literal["MENSUAL", "TRIMESTRAL", "ANUAL"]
+EstadoPeriodo = Literal["ABIERTO", "CERRADO"]
+
 class PeriodoBase(BaseModel):
     fecha_inicio: date = Field(..., description="Fecha de inicio del período")
     fecha_fin: date = Field(..., description="Fecha de fin del período")
-    tipo_periodo: str = Field(..., pattern="^(MENSUAL|TRIMESTRAL|ANUAL)$", description="Tipo de período")
-    estado: str = Field(default="ABIERTO", pattern="^(ABIERTO|CERRADO)$", description="Estado del período")
+    tipo_periodo: TipoPeriodo = Field(..., description="Tipo de período")
+    estado: EstadoPeriodo = Field(default="ABIERTO", description="Estado del período")
     
     @field_validator('fecha_fin')
     @classmethod
@@ -25,11 +28,10 @@ class PeriodoCreate(PeriodoBase):
 class PeriodoUpdate(BaseModel):
     fecha_inicio: Optional[date] = None
     fecha_fin: Optional[date] = None
-    tipo_periodo: Optional[str] = Field(None, pattern="^(MENSUAL|TRIMESTRAL|ANUAL)$")
-    estado: Optional[str] = Field(None, pattern="^(ABIERTO|CERRADO)$")
+    tipo_periodo: Optional[TipoPeriodo] = None
+    estado: Optional[EstadoPeriodo] = None
 
 class PeriodoRead(PeriodoBase):
     id_periodo: int
     
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, frozen=True)
\ No newline at end of file
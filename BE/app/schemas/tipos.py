@@ -0,0 +1,44 @@
+"""
+Tipos anotados compartidos por los schemas Pydantic.
+"""
+from decimal import Decimal
+from typing import Annotated, Any, Optional
+
+from pydantic import BeforeValidator, EmailStr, PlainSerializer, StringConstraints, WithJsonSchema
+
+
+def _si_no_a_bool(valor: Any) -> Any:
+    """Acepta 'SI'/'NO' (contrato de la API) además de booleanos"""
+    if isinstance(valor, str):
+        if valor == "SI":
+            return True
+        if valor == "NO":
+            return False
+        raise ValueError("Debe ser SI o NO")
+    return valor
+
+
+# Montos: Decimal al validar, número en JSON (conversión hecha en pydantic-core)
+FloatDecimal = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
+
+# Columna BOOLEAN en la base de datos expuesta como "SI"/"NO" en la API
+SiNo = Annotated[
+    bool,
+    BeforeValidator(_si_no_a_bool),
+    PlainSerializer(lambda valor: "SI" if valor else "NO", return_type=str, when_used="json"),
+    WithJsonSchema({"type": "string", "enum": ["SI", "NO"]}),
+]
+
+
+def _vacio_a_none(valor: Any) -> Any:
+    """Un string vacío o solo con espacios equivale a no enviar el campo"""
+    if isinstance(valor, str) and not valor.strip():
+        return None
+    return valor
+
+
+# Email opcional validado por email-validator dentro de pydantic-core
+EmailOpcional = Annotated[
+    Optional[Annotated[EmailStr, StringConstraints(max_length=100)]],
+    BeforeValidator(_vacio_a_none),
+]
@@ -2,18 +2,21 @@
 Esquemas Pydantic para Transacciones.
 Define la validación de datos y serialización para requests y responses de la API.
 """
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Literal, Optional
 from datetime import datetime
 
+TipoTransaccion = Literal["INGRESO", "EGRESO"]
+CategoriaTransaccion = Literal["VENTA", "COMPRA", "SERVICIO", "OTRO"]
+
 class TransaccionBase(BaseModel):
     fecha_transaccion: datetime = Field(..., description="Fecha y hora de la transacción")
     descripcion: str = Field(..., min_length=1, description="Descripción de la transacción")
-    tipo: str = Field(..., pattern="^(INGRESO|EGRESO)$", description="Tipo de transacción")
+    tipo: TipoTransaccion = Field(..., description="Tipo de transacción")
     moneda: str = Field(default="USD", min_length=3, max_length=3, description="Código de moneda")
     usuario_creacion: str = Field(..., min_length=1, max_length=50, description="Usuario que creó la transacción")
     id_periodo: int = Field(..., description="ID del período contable asociado (requerido)")
-    categoria: str = Field(..., pattern="^(VENTA|COMPRA|SERVICIO|OTRO)$", description="Tipo de Categoria"    )
+    categoria: CategoriaTransaccion = Field(..., description="Tipo de Categoria")
 
 class TransaccionCreate(TransaccionBase):
     pass
@@ -21,18 +24,17 @@ class TransaccionCreate(TransaccionBase):
 class TransaccionUpdate(BaseModel):
     fecha_transaccion: Optional[datetime] = None
     descripcion: Optional[str] = Field(None, min_length=1)
-    tipo: Optional[str] = Field(None, pattern="^(INGRESO|EGRESO)$")
+    tipo: Optional[TipoTransaccion] = None
     moneda: Optional[str] = Field(None, min_length=3, max_length=3)
     usuario_creacion: Optional[str] = Field(None, min_length=1, max_length=50)
     id_periodo: Optional[int] = None
-    categoria: Optional[str] = Field(None, pattern="^(VENTA|COMPRA|SERVICIO|OTRO)$")
+    categoria: Optional[CategoriaTransaccion] = None
 
 class TransaccionRead(TransaccionBase):
     id_transaccion: int
     fecha_creacion: datetime
 
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
@@ -2,6 +2,7 @@
 Capa de servicios para operaciones de Asientos Contables.
 Maneja la lógica de negocio y operaciones de base de datos para asientos contables.
 """
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
@@ -22,21 +23,15 @@ def validate_asiento_business_rules(debe: Decimal, haber: Decimal):
 
 def create_asiento(db: Session, asiento_data: AsientoCreate) -> Asiento:
     """Crear un nuevo asiento contable"""
-    # Validar que la transacción existe
-    transaccion = db.query(Transaccion).filter(
-        Transaccion.id_transaccion == asiento_data.id_transaccion
-    ).first()
-    if not transaccion:
+    # Validar que la transacción existe (SELECT EXISTS, sin cargar la fila)
+    if not db.query(exists().where(Transaccion.id_transaccion == asiento_data.id_transaccion)).scalar():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Transacción no encontrada"
         )
     
     # Validar que la cuenta existe
-    cuenta = db.query(CatalogoCuentas).filter(
-        CatalogoCuentas.id_cuenta == asiento_data.id_cuenta
-    ).first()
-    if not cuenta:
+    if not db.query(exists().where(CatalogoCuentas.id_cuenta == asiento_data.id_cuenta)).scalar():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cuenta no encontrada"
@@ -46,7 +41,7 @@ def create_asiento(db: Session, asiento_data: AsientoCreate) -> Asiento:
     validate_asiento_business_rules(asiento_data.debe, asiento_data.haber)
     
     try:
-        db_asiento = Asiento(**asiento_data.dict())
+        db_asiento = Asiento(**asiento_data.model_dump())
         db.add(db_asiento)
         db.commit()
         db.refresh(db_asiento)
@@ -88,14 +83,11 @@ def get_asientos(
 def update_asiento(db: Session, asiento_id: int, asiento_data: AsientoUpdate) -> Asiento:
     """Actualizar un asiento contable existente"""
     asiento = get_asiento(db, asiento_id)
-    update_data = asiento_data.dict(exclude_unset=True)
+    update_data = asiento_data.model_dump(exclude_unset=True)
     
     # Validate transaction exists if being updated
     if 'id_transaccion' in update_data:
-        transaccion = db.query(Transaccion).filter(
-            Transaccion.id_transaccion == update_data['id_transaccion']
-        ).first()
-        if not transaccion:
+        if not db.query(exists().where(Transaccion.id_transaccion == update_data['id_transaccion'])).scalar():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Transaction not found"
@@ -103,10 +95,7 @@ def update_asiento(db: Session, asiento_id: int, asiento_data: AsientoUpdate) ->
     
     # Validate account exists if being updated
     if 'id_cuenta' in update_data:
-        cuenta = db.query(CatalogoCuentas).filter(
-            CatalogoCuentas.id_cuenta == update_data['id_cuenta']
-        ).first()
-        if not cuenta:
+        if not db.query(exists().where(CatalogoCuentas.id_cuenta == update_data['id_cuenta'])).scalar():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Account not found"
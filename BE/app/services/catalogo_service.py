@@ -12,7 +12,7 @@ from typing import List, Optional
 def create_cuenta(db: Session, cuenta_data: CatalogoCuentaCreate) -> CatalogoCuentas:
     """Crear una nueva cuenta en el catálogo de cuentas"""
     try:
-        db_cuenta = CatalogoCuentas(**cuenta_data.dict())
+        db_cuenta = CatalogoCuentas(**cuenta_data.model_dump())
         db.add(db_cuenta)
         db.commit()
         db.refresh(db_cuenta)
@@ -41,7 +41,7 @@ def get_cuentas(db: Session, skip: int = 0, limit: int = 100) -> List[CatalogoCu
 def update_cuenta(db: Session, cuenta_id: int, cuenta_data: CatalogoCuentaUpdate) -> CatalogoCuentas:
     """Actualizar una cuenta existente"""
     cuenta = get_cuenta(db, cuenta_id)
-    update_data = cuenta_data.dict(exclude_unset=True)
+    update_data = cuenta_data.model_dump(exclude_unset=True)
     
     try:
         for key, value in update_data.items():
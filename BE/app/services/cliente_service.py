@@ -3,9 +3,9 @@ Servicio de gestión de clientes.
 Lógica de negocio para CRUD de clientes.
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy import exists, func, or_, tuple_
 from fastapi import HTTPException, status
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from BE.app.models.cliente import Cliente
 from BE.app.schemas.cliente_schemas import ClienteCreate, ClienteUpdate
@@ -76,13 +76,15 @@ def listar_clientes(
     limit: int = 100,
     busqueda: Optional[str] = None,
     tipo: Optional[str] = None,
-    activo: Optional[str] = None
+    activo: Optional[str] = None,
+    despues_de: Optional[Tuple[str, int]] = None
 ) -> List[Cliente]:
     """
     Lista clientes con filtros opcionales.
     busqueda: busca en nombre, NIT, email
     tipo: INDIVIDUAL o EMPRESA
     activo: SI o NO
+    despues_de: (nombre, id_cliente) de la última fila de la página anterior (con cursor se ignora skip)
     """
     query = db.query(Cliente)
     
@@ -103,9 +105,16 @@ def listar_clientes(
     
     # Filtro por estado activo
     if activo and activo in ['SI', 'NO']:
-        query = query.filter(Cliente.activo == activo)
-    
-    return query.order_by(Cliente.nombre).offset(skip).limit(limit).all()
+        query = query.filter(Cliente.activo if activo == 'SI' else ~Cliente.activo)
+
+    # Paginación por keyset sobre idx_clientes_*nombre_id; skip solo se usa sin cursor
+    query = query.order_by(Cliente.nombre, Cliente.id_cliente)
+    if despues_de:
+        query = query.filter(tuple_(Cliente.nombre, Cliente.id_cliente) > despues_de)
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
 
 
 # =========================================================
@@ -133,7 +142,7 @@ def actualizar_cliente(
             )
     
     # Actualizar campos proporcionados
-    update_data = cliente_update.dict(exclude_unset=True)
+    update_data = cliente_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(cliente, field, value)
     
@@ -152,7 +161,7 @@ def desactivar_cliente(db: Session, cliente_id: int) -> Cliente:
     Mejor práctica: marcar como inactivo en lugar de eliminar.
     """
     cliente = obtener_cliente_por_id(db, cliente_id)
-    cliente.activo = "NO"
+    cliente.activo = False
     
     db.commit()
     db.refresh(cliente)
@@ -167,13 +176,12 @@ def eliminar_cliente(db: Session, cliente_id: int) -> bool:
     """
     cliente = obtener_cliente_por_id(db, cliente_id)
     
-    # Verificar que no tenga facturas
+    # Verificar que no tenga facturas (EXISTS se detiene en la primera; el conteo solo para el mensaje)
     from BE.app.models.factura_models import Factura
-    facturas_count = db.query(func.count(Factura.id_factura)).filter(
-        Factura.id_cliente == cliente_id
-    ).scalar()
-    
-    if facturas_count > 0:
+    if db.query(exists().where(Factura.id_cliente == cliente_id)).scalar():
+        facturas_count = db.query(func.count(Factura.id_factura)).filter(
+            Factura.id_cliente == cliente_id
+        ).scalar()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"No se puede eliminar el cliente porque tiene {facturas_count} factura(s) asociada(s). Use desactivar en su lugar."
@@ -198,10 +206,13 @@ def buscar_cliente_por_nit(db: Session, nit: str) -> Optional[Cliente]:
 # =========================================================
 def obtener_estadisticas_clientes(db: Session):
     """Obtiene estadísticas generales de clientes"""
-    total = db.query(func.count(Cliente.id_cliente)).scalar()
-    activos = db.query(func.count(Cliente.id_cliente)).filter(Cliente.activo == "SI").scalar()
-    individuales = db.query(func.count(Cliente.id_cliente)).filter(Cliente.tipo_cliente == "INDIVIDUAL").scalar()
-    empresas = db.query(func.count(Cliente.id_cliente)).filter(Cliente.tipo_cliente == "EMPRESA").scalar()
+    # Un solo recorrido de la tabla con COUNT(*) FILTER (WHERE ...)
+    total, activos, individuales, empresas = db.query(
+        func.count(Cliente.id_cliente),
+        func.count().filter(Cliente.activo),
+        func.count().filter(Cliente.tipo_cliente == "INDIVIDUAL"),
+        func.count().filter(Cliente.tipo_cliente == "EMPRESA"),
+    ).one()
     
     return {
         "total_clientes": total,
@@ -3,49 +3,51 @@ Servicio de facturación con lógica de negocio completa.
 Maneja la creación, actualización y cálculos de facturas con arquitectura normalizada.
 Soporta multi-línea de productos/servicios y gestión de inventario.
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy import Row, bindparam, func, insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from fastapi import HTTPException, status
 from decimal import Decimal
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import uuid
 
-from BE.app.models.factura_models import Factura
+from BE.app.models.factura_models import Factura, FacturaContador
 from BE.app.models.factura_detalle import FacturaDetalle
 from BE.app.models.cliente import Cliente
 from BE.app.models.producto_servicio import ProductoServicio
-from BE.app.schemas.factura_schemas import FacturaCreate, FacturaUpdate
+from BE.app.models.tipos import Centavos
+from BE.app.schemas.factura_schemas import (
+    CAMPOS_CLIENTE_LEGACY, FacturaCreate, FacturaCreateLegacy, FacturaUpdate
+)
 
 
 # =========================================================
 # 🟦 GENERACIÓN DE NÚMERO DE FACTURA
 # =========================================================
+# INSERT de cada dialecto con soporte de ON CONFLICT ... DO UPDATE
+_INSERT_CON_UPSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
 def generar_numero_factura(db: Session) -> str:
     """
     Genera un número de factura único en formato: FACT-YYYY-NNNN
     Ejemplo: FACT-2025-0001
+    
+    El correlativo sale de factura_contador con un único upsert atómico
+    (INSERT ... ON CONFLICT DO UPDATE ... RETURNING): la fila del año queda
+    bloqueada hasta el commit, así dos facturas concurrentes nunca leen el mismo número.
     """
     año_actual = datetime.now().year
     
-    # Buscar el último número del año actual
-    ultima_factura = db.query(Factura).filter(
-        Factura.numero_factura.like(f"FACT-{año_actual}-%")
-    ).order_by(Factura.numero_factura.desc()).first()
-    
-    if ultima_factura:
-        # Extraer el número secuencial
-        partes = ultima_factura.numero_factura.split('-')
-        if len(partes) == 3:
-            try:
-                ultimo_num = int(partes[2])
-                nuevo_num = ultimo_num + 1
-            except ValueError:
-                nuevo_num = 1
-        else:
-            nuevo_num = 1
-    else:
-        nuevo_num = 1
+    sentencia = _INSERT_CON_UPSERT[db.get_bind().dialect.name](FacturaContador).values(
+        anio=año_actual, ultimo=1
+    )
+    sentencia = sentencia.on_conflict_do_update(
+        index_elements=[FacturaContador.anio],
+        set_={"ultimo": FacturaContador.ultimo + 1}
+    ).returning(FacturaContador.ultimo)
+    nuevo_num = db.execute(sentencia).scalar_one()
     
     # Formatear con 4 dígitos: FACT-2025-0001
     return f"FACT-{año_actual}-{nuevo_num:04d}"
@@ -86,7 +88,7 @@ def crear_factura(
     Crea una nueva factura normalizada con cliente y detalles de productos.
     
     Args:
-        factura_data: Datos de la factura (ahora debe incluir id_cliente)
+        factura_data: FacturaCreateNormalizada (id_cliente) o FacturaCreateLegacy (datos del cliente)
         detalles: Lista de líneas con {id_producto, cantidad, precio_unitario, descuento_%}
     
     Proceso:
@@ -97,15 +99,20 @@ def crear_factura(
     5. Crea líneas de detalle
     6. Actualiza stock de productos (si aplica)
     """
-    # 1. Validar cliente
-    if factura_data.id_cliente:
-        cliente = db.query(Cliente).filter(Cliente.id_cliente == factura_data.id_cliente).first()
+    # 1. Validar cliente (forma normalizada) o tomar sus datos escritos (forma legacy)
+    if isinstance(factura_data, FacturaCreateLegacy):
+        id_cliente = None
+        datos_cliente = factura_data.model_dump(include=CAMPOS_CLIENTE_LEGACY)
+    else:
+        id_cliente = factura_data.id_cliente
+        datos_cliente = {}
+        cliente = db.query(Cliente).filter(Cliente.id_cliente == id_cliente).first()
         if not cliente:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Cliente ID {factura_data.id_cliente} no encontrado"
+                detail=f"Cliente ID {id_cliente} no encontrado"
             )
-        if cliente.activo != 'SI':
+        if not cliente.activo:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cliente {cliente.nombre} está inactivo"
@@ -123,49 +130,79 @@ def crear_factura(
     subtotal_calculado = Decimal('0.00')
     iva_calculado = Decimal('0.00')
     
+    filas_detalle = []
     if detalles:
+        # Todos los productos de la factura en una sola consulta (IN) en lugar de una por línea,
+        # bloqueados (FOR UPDATE, en orden de id) hasta el commit para que el stock no cambie
+        # entre la validación y el descuento
+        ids_producto = {detalle['id_producto'] for detalle in detalles}
+        productos = {
+            producto.id_producto: producto
+            for producto in db.query(ProductoServicio)
+            .options(raiseload('*'))
+            .filter(ProductoServicio.id_producto.in_(ids_producto))
+            .order_by(ProductoServicio.id_producto)
+            .with_for_update()
+        }
+        faltantes = ids_producto - productos.keys()
+        if faltantes:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Producto ID {', '.join(map(str, sorted(faltantes)))} no encontrado"
+            )
+
+        # Cantidad total a descontar por producto físico (sumando líneas repetidas)
+        descuentos_stock = {}
+        
+        # Una sola pasada: valida, calcula la línea y acumula los totales de la factura
         for detalle in detalles:
-            producto = db.query(ProductoServicio).filter(
-                ProductoServicio.id_producto == detalle['id_producto']
-            ).first()
+            producto = productos[detalle['id_producto']]
             
-            if not producto:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Producto ID {detalle['id_producto']} no encontrado"
-                )
-            
-            if producto.activo != 'SI':
+            if not producto.activo:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Producto {producto.nombre} está inactivo"
                 )
             
-            # Validar stock para productos físicos
+            # Validar stock para productos físicos contra el total pedido en toda la factura
             if producto.tipo == 'PRODUCTO':
                 stock_actual = producto.stock_actual or 0
-                if stock_actual < detalle['cantidad']:
+                solicitado = descuentos_stock.get(producto.id_producto, 0) + detalle['cantidad']
+                if stock_actual < solicitado:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Stock insuficiente para {producto.nombre}. Disponible: {stock_actual}, Solicitado: {detalle['cantidad']}"
+                        detail=f"Stock insuficiente para {producto.nombre}. Disponible: {stock_actual}, Solicitado: {solicitado}"
                     )
+                descuentos_stock[producto.id_producto] = solicitado
             
             # Calcular línea
             precio = detalle.get('precio_unitario', producto.precio_unitario)
             cantidad = Decimal(str(detalle['cantidad']))
             desc_porcentaje = Decimal(str(detalle.get('descuento_porcentaje', 0)))
+            desc_monto = detalle.get('descuento_monto', Decimal('0.00'))
             
             subtotal_linea = precio * cantidad
-            desc_monto = round(subtotal_linea * (desc_porcentaje / Decimal('100')), 2)
-            subtotal_linea = subtotal_linea - desc_monto
+            desc_total = desc_monto + round(subtotal_linea * (desc_porcentaje / Decimal('100')), 2)
+            subtotal_linea = subtotal_linea - desc_total
             
-            if producto.aplica_iva == 'SI':
+            if producto.aplica_iva:
                 iva_linea = round(subtotal_linea * Decimal('0.13'), 2)
             else:
                 iva_linea = Decimal('0.00')
             
             subtotal_calculado += subtotal_linea
             iva_calculado += iva_linea
+            
+            filas_detalle.append({
+                "id_producto": detalle['id_producto'],
+                "cantidad": cantidad,
+                "precio_unitario": precio,
+                "descuento_porcentaje": desc_porcentaje,
+                "descuento_monto": desc_monto,
+                "subtotal": subtotal_linea,
+                "iva": iva_linea,
+                "total": subtotal_linea + iva_linea
+            })
     
     # Usar valores calculados o los proporcionados
     subtotal_final = subtotal_calculado if detalles else factura_data.subtotal
@@ -176,13 +213,9 @@ def crear_factura(
     # 5. Crear factura principal
     nueva_factura = Factura(
         numero_factura=numero_factura,
-        id_cliente=factura_data.id_cliente,
+        id_cliente=id_cliente,
         # Campos legacy (compatibilidad)
-        cliente=factura_data.cliente,
-        nit_cliente=factura_data.nit_cliente,
-        direccion_cliente=factura_data.direccion_cliente,
-        telefono_cliente=factura_data.telefono_cliente,
-        email_cliente=factura_data.email_cliente,
+        **datos_cliente,
         producto_servicio=factura_data.producto_servicio,
         subtotal=subtotal_final,
         descuento=descuento_final,
@@ -199,44 +232,24 @@ def crear_factura(
     
     # 6. Crear líneas de detalle y actualizar stock
     if detalles:
-        for detalle in detalles:
-            producto = db.query(ProductoServicio).filter(
-                ProductoServicio.id_producto == detalle['id_producto']
-            ).first()
-            
-            precio = detalle.get('precio_unitario', producto.precio_unitario)
-            cantidad = Decimal(str(detalle['cantidad']))
-            desc_porcentaje = Decimal(str(detalle.get('descuento_porcentaje', 0)))
-            desc_monto = detalle.get('descuento_monto', Decimal('0.00'))
-            
-            subtotal_linea = precio * cantidad
-            desc_total = desc_monto + round(subtotal_linea * (desc_porcentaje / Decimal('100')), 2)
-            subtotal_linea = subtotal_linea - desc_total
-            
-            if producto.aplica_iva == 'SI':
-                iva_linea = round(subtotal_linea * Decimal('0.13'), 2)
-            else:
-                iva_linea = Decimal('0.00')
-            
-            total_linea = subtotal_linea + iva_linea
-            
-            # Crear detalle
-            nuevo_detalle = FacturaDetalle(
-                id_factura=nueva_factura.id_factura,
-                id_producto=detalle['id_producto'],
-                cantidad=cantidad,
-                precio_unitario=precio,
-                descuento_porcentaje=desc_porcentaje,
-                descuento_monto=desc_monto,
-                subtotal=subtotal_linea,
-                iva=iva_linea,
-                total=total_linea
+        for fila in filas_detalle:
+            fila["id_factura"] = nueva_factura.id_factura
+        
+        # Insertar todas las líneas en un solo INSERT (executemany) en lugar de una por línea
+        db.execute(insert(FacturaDetalle), filas_detalle)
+        
+        # Descontar el stock con un solo UPDATE (executemany) en lugar de un UPDATE por producto al hacer flush
+        if descuentos_stock:
+            tabla_productos = ProductoServicio.__table__
+            db.execute(
+                update(tabla_productos)
+                .where(tabla_productos.c.id_producto == bindparam("b_id"))
+                .values(stock_actual=func.coalesce(tabla_productos.c.stock_actual, 0) - bindparam("b_cantidad")),
+                [
+                    {"b_id": id_producto, "b_cantidad": cantidad}
+                    for id_producto, cantidad in descuentos_stock.items()
+                ]
             )
-            db.add(nuevo_detalle)
-            
-            # Actualizar stock si es producto físico
-            if producto.tipo == 'PRODUCTO':
-                producto.stock_actual = (producto.stock_actual or 0) - cantidad
     
     db.commit()
     db.refresh(nueva_factura)
@@ -252,6 +265,20 @@ def obtener_factura_por_id(db: Session, factura_id: uuid.UUID) -> Optional[Factu
     return db.query(Factura).filter(Factura.id_factura == factura_id).first()
 
 
+# =========================================================
+# 🟦 OBTENER FACTURA CON DETALLES Y PRODUCTOS
+# =========================================================
+def obtener_factura_con_detalles(db: Session, factura_id: uuid.UUID) -> Optional[Factura]:
+    """
+    Obtiene una factura con sus líneas y productos precargados.
+    Evita una consulta por línea al generar PDF, Excel o JSON de la factura:
+    2 consultas en total (factura, y líneas con su producto unido por JOIN).
+    """
+    return db.query(Factura).options(
+        selectinload(Factura.detalles).joinedload(FacturaDetalle.producto)
+    ).filter(Factura.id_factura == factura_id).first()
+
+
 # =========================================================
 # 🟦 OBTENER FACTURA POR NÚMERO
 # =========================================================
@@ -269,21 +296,41 @@ def listar_facturas(
     limit: int = 100,
     cliente: Optional[str] = None,
     fecha_desde: Optional[datetime] = None,
-    fecha_hasta: Optional[datetime] = None
-) -> List[Factura]:
-    """Lista facturas con filtros opcionales"""
-    query = db.query(Factura)
+    fecha_hasta: Optional[datetime] = None,
+    despues_de: Optional[Tuple[datetime, uuid.UUID]] = None
+) -> List[Row]:
+    """
+    Lista facturas con filtros opcionales.
+    Devuelve filas con solo las columnas del listado (sin instanciar objetos ORM);
+    `cliente` es el nombre del cliente normalizado o, si no hay, el legacy.
+    Con `despues_de` = (fecha_emision, id_factura) de la última fila vista se pagina
+    por keyset (sin recorrer las filas anteriores) y `skip` se ignora.
+    """
+    query = select(
+        Factura.id_factura,
+        Factura.numero_factura,
+        func.coalesce(Cliente.nombre, func.nullif(Factura.cliente, ""), "Sin cliente").label("cliente"),
+        Factura.monto_total,
+        Factura.fecha_emision,
+    ).outerjoin(Cliente, Factura.id_cliente == Cliente.id_cliente)
     
     if cliente:
-        query = query.filter(Factura.cliente.ilike(f"%{cliente}%"))
+        query = query.where(Factura.cliente.ilike(f"%{cliente}%"))
     
     if fecha_desde:
-        query = query.filter(Factura.fecha_emision >= fecha_desde)
+        query = query.where(Factura.fecha_emision >= fecha_desde)
     
     if fecha_hasta:
-        query = query.filter(Factura.fecha_emision <= fecha_hasta)
+        query = query.where(Factura.fecha_emision <= fecha_hasta)
+    
+    if despues_de:
+        query = query.where(tuple_(Factura.fecha_emision, Factura.id_factura) < despues_de)
+    else:
+        query = query.offset(skip)
     
-    return query.order_by(Factura.fecha_emision.desc()).offset(skip).limit(limit).all()
+    return db.execute(
+        query.order_by(Factura.fecha_emision.desc(), Factura.id_factura.desc()).limit(limit)
+    ).all()
 
 
 # =========================================================
@@ -304,7 +351,7 @@ def actualizar_factura(
         )
     
     # Actualizar solo los campos proporcionados
-    update_data = factura_update.dict(exclude_unset=True)
+    update_data = factura_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(factura, field, value)
     
@@ -348,7 +395,7 @@ def obtener_estadisticas_facturacion(
         func.sum(Factura.subtotal).label('total_subtotal'),
         func.sum(Factura.iva).label('total_iva'),
         func.sum(Factura.descuento).label('total_descuentos'),
-        func.avg(Factura.monto_total).label('promedio_venta')
+        func.avg(Factura.monto_total, type_=Centavos).label('promedio_venta')
     )
     
     if fecha_desde:
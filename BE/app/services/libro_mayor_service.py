@@ -3,7 +3,7 @@ Servicio para generar el Libro Mayor.
 Contiene la lógica de negocio para calcular saldos y agrupar por cuentas mayores.
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy import func, literal, or_
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException
 from BE.app.models.asiento import Asiento
@@ -17,6 +17,13 @@ import logging
 # Configurar logger
 logger = logging.getLogger(__name__)
 
+# Columnas generadas con el código de cuenta mayor, por número de dígitos
+COLUMNAS_CODIGO_MAYOR = {
+    2: CatalogoCuentas.codigo_mayor_2,
+    4: CatalogoCuentas.codigo_mayor_4,
+    6: CatalogoCuentas.codigo_mayor_6,
+}
+
 def generar_libro_mayor_completo(
     db: Session,
     digitos: int,
@@ -43,96 +50,81 @@ def generar_libro_mayor_completo(
     logger.info(f"Generando libro mayor: dígitos={digitos}, fecha_inicio={fecha_inicio}, fecha_fin={fecha_fin}")
     
     try:
-        # Construir query optimizada con OUTER JOIN para incluir cuentas sin movimientos
-        query = db.query(
-            CatalogoCuentas.codigo_cuenta,
-            CatalogoCuentas.nombre_cuenta,
-            CatalogoCuentas.tipo_cuenta,
-            func.coalesce(func.sum(Asiento.debe), Decimal('0')).label('total_debe'),
-            func.coalesce(func.sum(Asiento.haber), Decimal('0')).label('total_haber')
-        ).select_from(CatalogoCuentas).outerjoin(
-            Asiento, Asiento.id_cuenta == CatalogoCuentas.id_cuenta
-        ).outerjoin(
-            Transaccion, Transaccion.id_transaccion == Asiento.id_transaccion
-        )
-    
-        # Aplicar filtros de fecha - manejar NULLs correctamente en OUTER JOIN
-        if fecha_inicio:
-            query = query.filter(
-                or_(
-                    Transaccion.fecha_transaccion.is_(None),
-                    func.date(Transaccion.fecha_transaccion) >= fecha_inicio
-                )
-            )
-        if fecha_fin:
-            query = query.filter(
-                or_(
-                    Transaccion.fecha_transaccion.is_(None),
-                    func.date(Transaccion.fecha_transaccion) <= fecha_fin
-                )
-            )
-    
-        # Agrupar por cuenta y obtener totales
-        query = query.group_by(
-            CatalogoCuentas.codigo_cuenta,
-            CatalogoCuentas.nombre_cuenta,
-            CatalogoCuentas.tipo_cuenta
-        )
-        
-        # Ejecutar query
-        resultados_cuentas = query.all()
-        logger.debug(f"Encontradas {len(resultados_cuentas)} cuentas")
-    
-        # Procesar resultados y agrupar por cuenta mayor
+        codigo_mayor = _expresion_codigo_mayor(digitos)
+
+        # Totales por cuenta mayor agrupados en la base de datos
+        query_mayores = _filtrar_por_fechas(
+            _consulta_movimientos(
+                db,
+                codigo_mayor,
+                func.coalesce(func.sum(Asiento.debe), Decimal('0')).label('total_debe'),
+                func.coalesce(func.sum(Asiento.haber), Decimal('0')).label('total_haber')
+            ),
+            fecha_inicio,
+            fecha_fin
+        ).group_by(codigo_mayor)
+
+        resultados_mayores = query_mayores.all()
+        logger.debug(f"Encontradas {len(resultados_mayores)} cuentas mayores")
+
+        # Nombres de las cuentas mayores (cuenta cuyo código coincide exactamente)
+        # en una sola consulta IN en lugar de una por mayor
+        nombres_mayores = dict(
+            db.query(CatalogoCuentas.codigo_cuenta, CatalogoCuentas.nombre_cuenta).filter(
+                CatalogoCuentas.codigo_cuenta.in_({fila.codigo_mayor for fila in resultados_mayores})
+            ).all()
+        ) if resultados_mayores else {}
+
         mayores_dict: Dict[str, Dict[str, Any]] = {}
-        
-        for cuenta in resultados_cuentas:
-            # Determinar código de cuenta mayor según dígitos (tomar exactamente N dígitos)
-            codigo_completo = cuenta.codigo_cuenta
-            if len(codigo_completo) >= digitos:
-                codigo_mayor = codigo_completo[:digitos]
-            else:
-                codigo_mayor = codigo_completo.ljust(digitos, '0')
-            
+
+        for fila in resultados_mayores:
+            nombre_mayor = nombres_mayores.get(fila.codigo_mayor, f"Cuenta Mayor {fila.codigo_mayor}")
+
             # Mantener precisión decimal para cálculos contables
-            debe = Decimal(str(cuenta.total_debe or 0))
-            haber = Decimal(str(cuenta.total_haber or 0))
-            saldo_cuenta = debe - haber  # Saldo real (puede ser negativo)
-            
-            # Si la cuenta mayor no existe, crearla
-            if codigo_mayor not in mayores_dict:
-                # Obtener nombre de cuenta mayor (buscar cuenta que coincida exactamente)
-                cuenta_mayor = db.query(CatalogoCuentas).filter(
-                    CatalogoCuentas.codigo_cuenta == codigo_mayor
-                ).first()
-                
-                nombre_mayor = cuenta_mayor.nombre_cuenta if cuenta_mayor else f"Cuenta Mayor {codigo_mayor}"
-                
-                mayores_dict[codigo_mayor] = {
-                    "codigo_mayor": codigo_mayor,
-                    "nombre_mayor": nombre_mayor,
-                    "total_debe": Decimal('0'),
-                    "total_haber": Decimal('0'),
-                    "saldo": Decimal('0'),
-                    "subcuentas": []
-                }
-            
-            # Sumar totales a la cuenta mayor (manteniendo precisión)
-            mayores_dict[codigo_mayor]["total_debe"] += debe
-            mayores_dict[codigo_mayor]["total_haber"] += haber
-            mayores_dict[codigo_mayor]["saldo"] += saldo_cuenta
-            
-            # Si se solicita detalle, agregar subcuenta
-            if incluir_detalle:
-                subcuenta = {
+            debe = Decimal(str(fila.total_debe or 0))
+            haber = Decimal(str(fila.total_haber or 0))
+
+            mayores_dict[fila.codigo_mayor] = {
+                "codigo_mayor": fila.codigo_mayor,
+                "nombre_mayor": nombre_mayor,
+                "total_debe": debe,
+                "total_haber": haber,
+                "saldo": debe - haber,  # Saldo real (puede ser negativo)
+                "subcuentas": []
+            }
+
+        # Si se solicita detalle, una segunda consulta agrupada por cuenta
+        if incluir_detalle:
+            query_cuentas = _filtrar_por_fechas(
+                _consulta_movimientos(
+                    db,
+                    codigo_mayor,
+                    CatalogoCuentas.codigo_cuenta,
+                    CatalogoCuentas.nombre_cuenta,
+                    CatalogoCuentas.tipo_cuenta,
+                    func.coalesce(func.sum(Asiento.debe), Decimal('0')).label('total_debe'),
+                    func.coalesce(func.sum(Asiento.haber), Decimal('0')).label('total_haber')
+                ),
+                fecha_inicio,
+                fecha_fin
+            ).group_by(
+                codigo_mayor,
+                CatalogoCuentas.codigo_cuenta,
+                CatalogoCuentas.nombre_cuenta,
+                CatalogoCuentas.tipo_cuenta
+            )
+
+            for cuenta in query_cuentas.all():
+                debe = Decimal(str(cuenta.total_debe or 0))
+                haber = Decimal(str(cuenta.total_haber or 0))
+                mayores_dict[cuenta.codigo_mayor]["subcuentas"].append({
                     "codigo_cuenta": cuenta.codigo_cuenta,
                     "nombre_cuenta": cuenta.nombre_cuenta,
                     "tipo_cuenta": cuenta.tipo_cuenta,
                     "total_debe": float(debe),  # Convertir a float solo para JSON
                     "total_haber": float(haber),
-                    "saldo": float(saldo_cuenta)
-                }
-                mayores_dict[codigo_mayor]["subcuentas"].append(subcuenta)
+                    "saldo": float(debe - haber)
+                })
         
         # Convertir a float para JSON y preparar respuesta
         mayores_lista = []
@@ -166,7 +158,7 @@ def generar_libro_mayor_completo(
             "total_debe_general": total_debe_general,
             "total_haber_general": total_haber_general,
             "diferencia": abs(total_debe_general - total_haber_general),
-            "fecha_generacion": date.today().isoformat()
+            "fecha_generacion": date.today()
         }
         
         logger.info(f"Libro mayor generado exitosamente: {len(mayores_lista)} cuentas mayores")
@@ -176,8 +168,8 @@ def generar_libro_mayor_completo(
             "resumen": resumen,
             "filtros_aplicados": {
                 "digitos": digitos,
-                "fecha_inicio": fecha_inicio.isoformat() if fecha_inicio else None,
-                "fecha_fin": fecha_fin.isoformat() if fecha_fin else None,
+                "fecha_inicio": fecha_inicio,
+                "fecha_fin": fecha_fin,
                 "incluir_detalle": incluir_detalle
             }
         }
@@ -196,6 +188,51 @@ def generar_libro_mayor_completo(
             detail=f"Error interno del servidor: {str(e)}"
         )
 
+def _expresion_codigo_mayor(digitos: int):
+    """
+    Código de cuenta mayor calculado en SQL: los primeros N dígitos del código;
+    los códigos más cortos se completan con ceros a la derecha (N <= 10).
+    Para 2, 4 y 6 dígitos se usa la columna generada e indexada codigo_mayor_N.
+    Los valores van en línea para que SELECT y GROUP BY compartan la misma expresión
+    """
+    columna = COLUMNAS_CODIGO_MAYOR.get(digitos)
+    if columna is not None:
+        return columna.label('codigo_mayor')
+    return func.substr(
+        CatalogoCuentas.codigo_cuenta + literal("0000000000", literal_execute=True),
+        1,
+        literal(digitos, literal_execute=True)
+    ).label('codigo_mayor')
+
+def _consulta_movimientos(db: Session, *columnas):
+    """
+    Query base del libro mayor: catálogo con OUTER JOIN a asientos y transacciones
+    para incluir cuentas sin movimientos
+    """
+    return db.query(*columnas).select_from(CatalogoCuentas).outerjoin(
+        Asiento, Asiento.id_cuenta == CatalogoCuentas.id_cuenta
+    ).outerjoin(
+        Transaccion, Transaccion.id_transaccion == Asiento.id_transaccion
+    )
+
+def _filtrar_por_fechas(query, fecha_inicio: Optional[date], fecha_fin: Optional[date]):
+    """Aplicar filtros de fecha - manejar NULLs correctamente en OUTER JOIN"""
+    if fecha_inicio:
+        query = query.filter(
+            or_(
+                Transaccion.fecha_transaccion.is_(None),
+                func.date(Transaccion.fecha_transaccion) >= fecha_inicio
+            )
+        )
+    if fecha_fin:
+        query = query.filter(
+            or_(
+                Transaccion.fecha_transaccion.is_(None),
+                func.date(Transaccion.fecha_transaccion) <= fecha_fin
+            )
+        )
+    return query
+
 def obtener_resumen_por_digitos(
     db: Session,
     digitos: int,
@@ -12,7 +12,7 @@ from typing import List, Optional
 def create_periodo(db: Session, periodo_data: PeriodoCreate) -> PeriodoContable:
     """Crear un nuevo período contable"""
     try:
-        db_periodo = PeriodoContable(**periodo_data.dict())
+        db_periodo = PeriodoContable(**periodo_data.model_dump())
         db.add(db_periodo)
         db.commit()
         db.refresh(db_periodo)
@@ -45,7 +45,7 @@ def get_periodos_activos(db: Session) -> List[PeriodoContable]:
 def update_periodo(db: Session, periodo_id: int, periodo_data: PeriodoUpdate) -> PeriodoContable:
     """Actualizar un período existente"""
     periodo = get_periodo(db, periodo_id)
-    update_data = periodo_data.dict(exclude_unset=True)
+    update_data = periodo_data.model_dump(exclude_unset=True)
     
     try:
         for key, value in update_data.items():
@@ -3,14 +3,17 @@ Servicio de gestión de productos y servicios.
 Lógica de negocio para CRUD de productos/servicios.
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy import Numeric, Row, case, func, or_, tuple_
 from fastapi import HTTPException, status
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from decimal import Decimal
 
 from BE.app.models.producto_servicio import ProductoServicio
 from BE.app.schemas.producto_servicio_schemas import ProductoServicioCreate, ProductoServicioUpdate
 
+# Tasa de IVA aplicada a los productos con aplica_iva
+TASA_IVA = Decimal('0.13')
+
 
 # =========================================================
 # 🟦 CREAR PRODUCTO/SERVICIO
@@ -83,8 +86,9 @@ def listar_productos(
     tipo: Optional[str] = None,
     categoria: Optional[str] = None,
     activo: Optional[str] = None,
-    bajo_stock: bool = False
-) -> List[ProductoServicio]:
+    bajo_stock: bool = False,
+    despues_de: Optional[Tuple[str, int]] = None
+) -> List[Row]:
     """
     Lista productos/servicios con filtros opcionales.
     busqueda: busca en nombre, código, descripción
@@ -92,8 +96,10 @@ def listar_productos(
     categoria: categoría del producto
     activo: SI o NO
     bajo_stock: solo productos con stock < stock_minimo
+    despues_de: (nombre, id_producto) de la última fila de la página anterior (con cursor se ignora skip)
+    Devuelve filas con todas las columnas (sin construir objetos ORM).
     """
-    query = db.query(ProductoServicio)
+    query = db.query(*ProductoServicio.__table__.columns)
     
     # Filtro de búsqueda general
     if busqueda:
@@ -116,7 +122,7 @@ def listar_productos(
     
     # Filtro por estado activo
     if activo and activo in ['SI', 'NO']:
-        query = query.filter(ProductoServicio.activo == activo)
+        query = query.filter(ProductoServicio.activo if activo == 'SI' else ~ProductoServicio.activo)
     
     # Filtro por bajo stock
     if bajo_stock:
@@ -124,8 +130,17 @@ def listar_productos(
             ProductoServicio.tipo == "PRODUCTO",
             ProductoServicio.stock_actual < ProductoServicio.stock_minimo
         )
-    
-    return query.order_by(ProductoServicio.nombre).offset(skip).limit(limit).all()
+
+    # Paginación por keyset sobre idx_productos_nombre_id; skip solo se usa sin cursor
+    query = query.order_by(ProductoServicio.nombre, ProductoServicio.id_producto)
+    if despues_de:
+        query = query.filter(
+            tuple_(ProductoServicio.nombre, ProductoServicio.id_producto) > despues_de
+        )
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
 
 
 # =========================================================
@@ -153,7 +168,7 @@ def actualizar_producto(
             )
     
     # Actualizar campos proporcionados
-    update_data = producto_update.dict(exclude_unset=True)
+    update_data = producto_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(producto, field, value)
     
@@ -214,7 +229,7 @@ def actualizar_stock(
 def desactivar_producto(db: Session, producto_id: int) -> ProductoServicio:
     """Desactiva un producto (no lo elimina)"""
     producto = obtener_producto_por_id(db, producto_id)
-    producto.activo = "NO"
+    producto.activo = False
     
     db.commit()
     db.refresh(producto)
@@ -233,49 +248,64 @@ def buscar_producto_por_codigo(db: Session, codigo: str) -> Optional[ProductoSer
 # =========================================================
 # 🟦 OBTENER PRODUCTOS CON BAJO STOCK
 # =========================================================
-def obtener_productos_bajo_stock(db: Session) -> List[ProductoServicio]:
-    """Obtiene productos con stock actual menor al mínimo"""
-    return db.query(ProductoServicio).filter(
+def obtener_productos_bajo_stock(
+    db: Session,
+    limit: int = 200,
+    despues_de: Optional[Tuple[Decimal, int]] = None
+) -> List[ProductoServicio]:
+    """
+    Obtiene productos con stock actual menor al mínimo, del más urgente al menos.
+    despues_de: (stock_actual, id_producto) de la última fila de la página anterior
+    """
+    query = db.query(ProductoServicio).filter(
         ProductoServicio.tipo == "PRODUCTO",
-        ProductoServicio.activo == "SI",
+        ProductoServicio.activo,
         ProductoServicio.stock_actual < ProductoServicio.stock_minimo
-    ).order_by(ProductoServicio.stock_actual).all()
+    )
+
+    # Paginación por keyset sobre el índice parcial idx_productos_bajo_stock
+    if despues_de:
+        query = query.filter(
+            tuple_(ProductoServicio.stock_actual, ProductoServicio.id_producto) > despues_de
+        )
+
+    return query.order_by(
+        ProductoServicio.stock_actual, ProductoServicio.id_producto
+    ).limit(limit).all()
 
 
 # =========================================================
 # 🟦 ESTADÍSTICAS DE PRODUCTOS
 # =========================================================
 def obtener_estadisticas_productos(db: Session):
-    """Obtiene estadísticas generales de productos"""
-    total = db.query(func.count(ProductoServicio.id_producto)).scalar()
-    productos = db.query(func.count(ProductoServicio.id_producto)).filter(
-        ProductoServicio.tipo == "PRODUCTO"
-    ).scalar()
-    servicios = db.query(func.count(ProductoServicio.id_producto)).filter(
-        ProductoServicio.tipo == "SERVICIO"
-    ).scalar()
-    activos = db.query(func.count(ProductoServicio.id_producto)).filter(
-        ProductoServicio.activo == "SI"
-    ).scalar()
-    bajo_stock = db.query(func.count(ProductoServicio.id_producto)).filter(
-        ProductoServicio.tipo == "PRODUCTO",
-        ProductoServicio.stock_actual < ProductoServicio.stock_minimo
-    ).scalar()
-    
-    # Valor total del inventario
-    valor_inventario = db.query(
-        func.sum(ProductoServicio.stock_actual * ProductoServicio.precio_unitario)
-    ).filter(
-        ProductoServicio.tipo == "PRODUCTO"
-    ).scalar() or Decimal('0')
+    """Obtiene estadísticas generales de productos en una sola pasada agregada"""
+    es_producto = ProductoServicio.tipo == "PRODUCTO"
+    fila = db.query(
+        func.count(ProductoServicio.id_producto).label("total"),
+        func.count().filter(es_producto).label("productos"),
+        func.count().filter(ProductoServicio.tipo == "SERVICIO").label("servicios"),
+        func.count().filter(ProductoServicio.activo).label("activos"),
+        func.count().filter(
+            es_producto,
+            ProductoServicio.stock_actual < ProductoServicio.stock_minimo
+        ).label("bajo_stock"),
+        # Valor total del inventario
+        func.sum(ProductoServicio.stock_actual * ProductoServicio.precio_unitario).filter(
+            es_producto
+        ).label("valor_inventario")
+    ).one()
+
+    total = fila.total
+    activos = fila.activos
+    valor_inventario = fila.valor_inventario or Decimal('0')
     
     return {
         "total": total,
-        "productos": productos,
-        "servicios": servicios,
+        "productos": fila.productos,
+        "servicios": fila.servicios,
         "activos": activos,
         "inactivos": total - activos,
-        "bajo_stock": bajo_stock,
+        "bajo_stock": fila.bajo_stock,
         "valor_inventario": float(valor_inventario)
     }
 
@@ -284,11 +314,30 @@ def obtener_estadisticas_productos(db: Session):
 # 🟦 CALCULAR PRECIO CON IVA
 # =========================================================
 def calcular_precio_con_iva(
-    precio_unitario: Decimal,
-    aplica_iva: str,
-    tasa_iva: Decimal = Decimal('0.13')
+    db: Session,
+    producto_id: int,
+    tasa_iva: Decimal = TASA_IVA
 ) -> Decimal:
-    """Calcula el precio final incluyendo IVA si aplica"""
-    if aplica_iva == "SI":
-        return precio_unitario * (Decimal('1') + tasa_iva)
-    return precio_unitario
+    """
+    Calcula el precio final incluyendo IVA si aplica.
+    El cálculo se hace en la base de datos: una consulta devuelve el escalar listo
+    sin cargar el producto completo.
+    """
+    precio = db.query(
+        func.round(
+            ProductoServicio.precio_unitario * case(
+                (ProductoServicio.aplica_iva, Decimal('1') + tasa_iva),
+                else_=Decimal('1')
+            ),
+            2,
+            type_=Numeric(12, 2)
+        )
+    ).filter(ProductoServicio.id_producto == producto_id).scalar()
+
+    if precio is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Producto {producto_id} no encontrado"
+        )
+
+    return precio
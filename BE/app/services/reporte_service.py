@@ -8,15 +8,31 @@ from BE.app.models.asiento import Asiento
 from BE.app.models.transaccion import Transaccion
 from BE.app.models.catalogo_cuentas import CatalogoCuentas
 from BE.app.models.periodo import PeriodoContable
-from typing import List, Dict, Any, Optional
-import pandas as pd
-from io import BytesIO
+from typing import BinaryIO, List, Dict, Any, Optional
+from html import escape
+import tempfile
 
-def generar_libro_diario(db: Session, periodo_id: Optional[int] = None) -> List[Dict[str, Any]]:
-    """
-    Generar el reporte del Libro Diario.
-    Retorna una lista de asientos contables con detalles de transacciones y cuentas.
-    """
+# Filas por lote al leer el libro diario para exportarlo
+EXPORT_LOTE_FILAS = 1000
+# Por encima de este tamaño el Excel en construcción pasa de memoria a disco
+EXPORT_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# Columnas del libro diario en el orden de la respuesta JSON y de las exportaciones
+COLUMNAS_LIBRO_DIARIO = (
+    "id_asiento",
+    "id_transaccion",
+    "fecha_transaccion",
+    "descripcion",
+    "tipo_transaccion",
+    "codigo_cuenta",
+    "nombre_cuenta",
+    "tipo_cuenta",
+    "debe",
+    "haber",
+)
+
+def _consulta_libro_diario(db: Session, periodo_id: Optional[int] = None):
+    """Query de los asientos del libro diario con su transacción y cuenta"""
     query = db.query(
         Asiento.id_asiento,
         Asiento.debe,
@@ -39,78 +55,92 @@ def generar_libro_diario(db: Session, periodo_id: Optional[int] = None) -> List[
         query = query.filter(Transaccion.id_periodo == periodo_id)
     
     # Order by transaction date and entry ID
-    query = query.order_by(Transaccion.fecha_transaccion, Asiento.id_asiento)
-    
-    results = query.all()
-    
-    # Convert to list of dictionaries
-    libro_diario = []
-    for row in results:
-        libro_diario.append({
-            "id_asiento": row.id_asiento,
-            "id_transaccion": row.id_transaccion,
-            "fecha_transaccion": row.fecha_transaccion.isoformat(),
-            "descripcion": row.descripcion,
-            "tipo_transaccion": row.tipo,
-            "codigo_cuenta": row.codigo_cuenta,
-            "nombre_cuenta": row.nombre_cuenta,
-            "tipo_cuenta": row.tipo_cuenta,
-            "debe": float(row.debe),
-            "haber": float(row.haber)
-        })
-    
-    return libro_diario
+    return query.order_by(Transaccion.fecha_transaccion, Asiento.id_asiento)
 
-def generar_export_excel(db: Session, periodo_id: Optional[int] = None) -> BytesIO:
+def _fila_libro_diario(row) -> Dict[str, Any]:
+    """Convierte una fila de la consulta en un registro del libro diario"""
+    return {
+        "id_asiento": row.id_asiento,
+        "id_transaccion": row.id_transaccion,
+        "fecha_transaccion": row.fecha_transaccion.isoformat(),
+        "descripcion": row.descripcion,
+        "tipo_transaccion": row.tipo,
+        "codigo_cuenta": row.codigo_cuenta,
+        "nombre_cuenta": row.nombre_cuenta,
+        "tipo_cuenta": row.tipo_cuenta,
+        "debe": float(row.debe),
+        "haber": float(row.haber)
+    }
+
+def generar_libro_diario(db: Session, periodo_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Generar el reporte del Libro Diario.
+    Retorna una lista de asientos contables con detalles de transacciones y cuentas.
+    """
+    return [_fila_libro_diario(row) for row in _consulta_libro_diario(db, periodo_id)]
+
+def generar_export_excel(db: Session, periodo_id: Optional[int] = None) -> BinaryIO:
     """
     Generate Excel export of the General Journal.
-    Returns BytesIO buffer with Excel file content.
+    Las filas se leen por lotes (yield_per) y xlsxwriter en modo constant_memory
+    las vuelca a disco a medida que se escriben: la memoria no crece con el período.
+    Retorna un archivo temporal posicionado al inicio (el llamador debe cerrarlo).
     """
-    # TODO: Implementar formato detallado de Excel
-    data = generar_libro_diario(db, periodo_id)
-    df = pd.DataFrame(data)
-    
-    # Create Excel file in memory
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Libro Diario', index=False)
-        
-        # TODO: Añadir formato, encabezados, totales, etc.
-        
-    buffer.seek(0)
-    return buffer
+    import xlsxwriter
+
+    archivo = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_BYTES)
+    workbook = xlsxwriter.Workbook(archivo, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('Libro Diario')
+
+    # constant_memory exige escribir fila por fila, en orden
+    worksheet.write_row(0, 0, COLUMNAS_LIBRO_DIARIO, workbook.add_format({'bold': True, 'border': 1}))
+    for num_fila, row in enumerate(_consulta_libro_diario(db, periodo_id).yield_per(EXPORT_LOTE_FILAS), start=1):
+        worksheet.write_row(num_fila, 0, tuple(_fila_libro_diario(row).values()))
+
+    workbook.close()
+    archivo.seek(0)
+    return archivo
 
-def generar_export_html(db: Session, periodo_id: Optional[int] = None) -> str:
+_HTML_INICIO = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Libro Diario</title>
+    <style>
+        .table { border-collapse: collapse; width: 100%; }
+        .table th, .table td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        .table th { background-color: #f2f2f2; }
+    </style>
+</head>
+<body>
+    <h1>Libro Diario</h1>
+    <table class="table table-striped" id="libro-diario">
+        <thead><tr>""" + "".join(f"<th>{c}</th>" for c in COLUMNAS_LIBRO_DIARIO) + """</tr></thead>
+        <tbody>
+"""
+
+_HTML_FIN = """        </tbody>
+    </table>
+</body>
+</html>
+"""
+
+def generar_export_html(db: Session, periodo_id: Optional[int] = None) -> BinaryIO:
     """
     Generate HTML export of the General Journal.
-    Returns HTML string with formatted table.
+    Escribe el documento por partes (encabezado, una fila por asiento, cierre) leyendo
+    las filas por lotes en un archivo temporal, igual que el Excel: la consulta termina
+    antes de enviar la respuesta, así un cliente lento no retiene la conexión.
+    Retorna un archivo temporal posicionado al inicio (el llamador debe cerrarlo).
     """
-    # TODO: Implementar formato detallado de HTML con CSS
-    data = generar_libro_diario(db, periodo_id)
-    df = pd.DataFrame(data)
-    
-    html = df.to_html(classes='table table-striped', table_id='libro-diario')
-    
-    # Wrap in basic HTML structure
-    full_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Libro Diario</title>
-        <style>
-            .table {{ border-collapse: collapse; width: 100%; }}
-            .table th, .table td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-            .table th {{ background-color: #f2f2f2; }}
-        </style>
-    </head>
-    <body>
-        <h1>Libro Diario</h1>
-        {html}
-    </body>
-    </html>
-    """
-    
-    return full_html
+    archivo = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_BYTES)
+    archivo.write(_HTML_INICIO.encode("utf-8"))
+    for row in _consulta_libro_diario(db, periodo_id).yield_per(EXPORT_LOTE_FILAS):
+        celdas = "".join(f"<td>{escape(str(valor))}</td>" for valor in _fila_libro_diario(row).values())
+        archivo.write(f"            <tr>{celdas}</tr>\n".encode("utf-8"))
+    archivo.write(_HTML_FIN.encode("utf-8"))
+    archivo.seek(0)
+    return archivo
 
 def generar_balance(db: Session, periodo_id: int) -> Dict[str, Any]:
     """
@@ -1,3 +1,4 @@
+from sqlalchemy import Row, exists, insert, tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
@@ -6,7 +7,7 @@ from BE.app.models.transaccion import Transaccion
 from BE.app.models.periodo import PeriodoContable
 from BE.app.models.asiento import Asiento
 from BE.app.schemas.transaccion import TransaccionCreate, TransaccionUpdate
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 
@@ -26,8 +27,8 @@ def create_transaccion(db: Session, transaccion_data: TransaccionCreate) -> Tran
                 detail="ID de período inválido"
             )
 
-    transaccion_dict = transaccion_data.dict()
-    transaccion_dict["fecha_creacion"] = datetime.now()
+    # fecha_creacion la asigna la base de datos (server_default)
+    transaccion_dict = transaccion_data.model_dump()
 
     try:
         db_transaccion = Transaccion(**transaccion_dict)
@@ -50,6 +51,47 @@ def create_transaccion(db: Session, transaccion_data: TransaccionCreate) -> Tran
         )
 
 
+# ---------------------------------------------------
+# 🟦 CREAR TRANSACCIONES EN LOTE
+# ---------------------------------------------------
+def create_transacciones_bulk(db: Session, transacciones_data: List[TransaccionCreate]) -> List[int]:
+    """
+    Crea varias transacciones con un único INSERT multi-fila y un solo commit.
+    Devuelve los IDs generados en el mismo orden que la entrada.
+    """
+    # Validar todos los períodos referenciados con una sola consulta
+    ids_periodo = {t.id_periodo for t in transacciones_data if t.id_periodo}
+    if ids_periodo:
+        existentes = {
+            id_periodo for (id_periodo,) in db.query(PeriodoContable.id_periodo).filter(
+                PeriodoContable.id_periodo.in_(ids_periodo)
+            )
+        }
+        invalidos = sorted(ids_periodo - existentes)
+        if invalidos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"ID de período inválido: {invalidos}"
+            )
+
+    try:
+        ids = db.scalars(
+            insert(Transaccion).returning(
+                Transaccion.id_transaccion, sort_by_parameter_order=True
+            ),
+            [t.model_dump() for t in transacciones_data]
+        ).all()
+        db.commit()
+        return ids
+
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Error creating transactions: {str(e)}"
+        )
+
+
 # ---------------------------------------------------
 # 🟦 CREAR ASIENTO PARA UNA TRANSACCIÓN
 # ---------------------------------------------------
@@ -58,12 +100,16 @@ def create_asiento_transaccion(db: Session, asiento_data: dict, id_transaccion:
     Crea un asiento contable asociado a una transacción.
     Las facturas se crean independientemente.
     """
-    # Validar que la transacción existe
-    get_transaccion(db, id_transaccion)
+    # Validar que la transacción existe (SELECT EXISTS, sin cargar la fila)
+    if not db.query(exists().where(Transaccion.id_transaccion == id_transaccion)).scalar():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found"
+        )
 
     try:
         # Crear asiento
-        asiento_dict = asiento_data.copy() if isinstance(asiento_data, dict) else asiento_data.dict()
+        asiento_dict = asiento_data.copy() if isinstance(asiento_data, dict) else asiento_data.model_dump()
         asiento_dict["id_transaccion"] = id_transaccion
 
         db_asiento = Asiento(**asiento_dict)
@@ -113,10 +159,15 @@ def get_transacciones(
         fecha_to: Optional[datetime] = None,
         id_periodo: Optional[int] = None,
         tipo: Optional[str] = None,
-        categoria: Optional[str] = None
-) -> List[Transaccion]:
-
-    query = db.query(Transaccion)
+        categoria: Optional[str] = None,
+        despues_de: Optional[Tuple[datetime, int]] = None
+) -> List[Row]:
+    """
+    Lista transacciones como filas con todas las columnas de la tabla
+    (sin construir objetos ORM: el resultado solo se serializa).
+    despues_de: (fecha_transaccion, id_transaccion) de la última fila de la página anterior (con cursor se ignora skip)
+    """
+    query = db.query(*Transaccion.__table__.columns)
 
     if fecha_from:
         query = query.filter(Transaccion.fecha_transaccion >= fecha_from)
@@ -129,7 +180,20 @@ def get_transacciones(
     if categoria:
         query = query.filter(Transaccion.categoria == categoria)
 
-    return query.offset(skip).limit(limit).all()
+    # Mismo orden que los índices idx_transacciones_*_fecha (recorrido sin ordenar)
+    query = query.order_by(
+        Transaccion.fecha_transaccion.desc(), Transaccion.id_transaccion.desc()
+    )
+
+    # Paginación por keyset en orden descendente; skip solo se usa sin cursor
+    if despues_de:
+        query = query.filter(
+            tuple_(Transaccion.fecha_transaccion, Transaccion.id_transaccion) < despues_de
+        )
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
 
 
 # ---------------------------------------------------
@@ -138,7 +202,7 @@ def get_transacciones(
 def update_transaccion(db: Session, transaccion_id: int, transaccion_data: TransaccionUpdate) -> Transaccion:
 
     transaccion = get_transaccion(db, transaccion_id)
-    update_data = transaccion_data.dict(exclude_unset=True)
+    update_data = transaccion_data.model_dump(exclude_unset=True)
 
     if 'id_periodo' in update_data and update_data['id_periodo']:
         periodo = db.query(PeriodoContable).filter(
@@ -199,14 +199,16 @@ def show_export_options(backend_url: str):
 def generate_report_file(backend_url: str, format_type: str, periodo_id: Optional[int] = None):
     """Generar archivo de reporte y guardarlo en session_state"""
     try:
-        params = {"format": format_type}
+        params = {}
         if periodo_id:
             params["periodo_id"] = periodo_id
         
         # Show loading message
         with st.spinner(f"Generando reporte en formato {format_type.upper()}..."):
+            # Un endpoint por formato: /export/xlsx o /export/html
+            ruta_formato = "xlsx" if format_type == "excel" else "html"
             response = requests.get(
-                f"{backend_url}/api/reportes/libro-diario/export",
+                f"{backend_url}/api/reportes/libro-diario/export/{ruta_formato}",
                 params=params,
                 timeout=30  # Longer timeout for file generation
             )
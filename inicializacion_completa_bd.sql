@@ -14,9 +14,11 @@
 -- =============================================
 
 -- =============================================
--- PASO 1: CREAR EXTENSIÓN PARA UUID (si no existe)
+-- PASO 1: CREAR EXTENSIONES (si no existen)
 -- =============================================
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- Trigramas para búsquedas ILIKE '%texto%' indexadas
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- =============================================
 -- PASO 2: CREACIÓN DE TABLAS DEL SISTEMA CONTABLE
@@ -58,8 +60,8 @@ CREATE TABLE IF NOT EXISTS public.asientos (
     id_asiento SERIAL PRIMARY KEY,
     id_transaccion INTEGER NOT NULL REFERENCES public.transacciones(id_transaccion),
     id_cuenta INTEGER NOT NULL REFERENCES public.catalogo_cuentas(id_cuenta),
-    debe NUMERIC(15,2) DEFAULT 0.00,
-    haber NUMERIC(15,2) DEFAULT 0.00,
+    debe BIGINT DEFAULT 0,   -- centavos
+    haber BIGINT DEFAULT 0,  -- centavos
     CONSTRAINT debe_o_haber CHECK (
         (debe > 0 AND haber = 0) OR 
         (haber > 0 AND debe = 0)
@@ -84,7 +86,7 @@ CREATE TABLE IF NOT EXISTS public.clientes (
     departamento VARCHAR(100),
     codigo_postal VARCHAR(10),
     contacto_principal VARCHAR(100),
-    activo VARCHAR(2) DEFAULT 'SI' CHECK (activo IN ('SI', 'NO')),
+    activo BOOLEAN NOT NULL DEFAULT TRUE,
     notas TEXT,
     fecha_registro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     fecha_ultima_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -103,8 +105,8 @@ CREATE TABLE IF NOT EXISTS public.productos_servicios (
     unidad_medida VARCHAR(20) NOT NULL DEFAULT 'Unidad',
     stock_actual NUMERIC(12, 2) DEFAULT 0.00,
     stock_minimo NUMERIC(12, 2) DEFAULT 0.00,
-    aplica_iva VARCHAR(2) DEFAULT 'SI' CHECK (aplica_iva IN ('SI', 'NO')),
-    activo VARCHAR(2) DEFAULT 'SI' CHECK (activo IN ('SI', 'NO')),
+    aplica_iva BOOLEAN NOT NULL DEFAULT TRUE,
+    activo BOOLEAN NOT NULL DEFAULT TRUE,
     fecha_registro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT check_stock_producto CHECK (
         (tipo = 'SERVICIO') OR 
@@ -128,10 +130,10 @@ CREATE TABLE IF NOT EXISTS public.facturas (
     id_cliente INTEGER REFERENCES public.clientes(id_cliente) ON DELETE SET NULL,
     
     -- Montos
-    subtotal NUMERIC(12, 2) NOT NULL DEFAULT 0.00,
-    descuento NUMERIC(12, 2) NOT NULL DEFAULT 0.00,
-    iva NUMERIC(12, 2) NOT NULL DEFAULT 0.00,
-    monto_total NUMERIC(12, 2) NOT NULL,
+    subtotal BIGINT NOT NULL DEFAULT 0,      -- centavos
+    descuento BIGINT NOT NULL DEFAULT 0,     -- centavos
+    iva BIGINT NOT NULL DEFAULT 0,           -- centavos
+    monto_total BIGINT NOT NULL,             -- centavos
     
     -- Producto o Servicio (legacy - deprecado, usar factura_detalle)
     producto_servicio TEXT,
@@ -155,12 +157,18 @@ CREATE TABLE IF NOT EXISTS public.factura_detalle (
     id_factura UUID NOT NULL REFERENCES public.facturas(id_factura) ON DELETE CASCADE,
     id_producto INTEGER NOT NULL REFERENCES public.productos_servicios(id_producto) ON DELETE RESTRICT,
     cantidad NUMERIC(12, 2) NOT NULL CHECK (cantidad > 0),
-    precio_unitario NUMERIC(12, 2) NOT NULL,
+    precio_unitario BIGINT NOT NULL,  -- centavos
     descuento_porcentaje NUMERIC(5, 2) DEFAULT 0.00 CHECK (descuento_porcentaje >= 0 AND descuento_porcentaje <= 100),
-    descuento_monto NUMERIC(12, 2) DEFAULT 0.00 CHECK (descuento_monto >= 0),
-    subtotal NUMERIC(12, 2) NOT NULL,
-    iva NUMERIC(12, 2) DEFAULT 0.00,
-    total_linea NUMERIC(12, 2) NOT NULL
+    descuento_monto BIGINT DEFAULT 0 CHECK (descuento_monto >= 0),  -- centavos
+    subtotal BIGINT NOT NULL,         -- centavos
+    iva BIGINT DEFAULT 0,             -- centavos
+    total_linea BIGINT NOT NULL       -- centavos
+);
+
+-- Tabla: factura_contador (último correlativo FACT-YYYY-NNNN emitido por año)
+CREATE TABLE IF NOT EXISTS public.factura_contador (
+    anio INTEGER PRIMARY KEY,
+    ultimo INTEGER NOT NULL
 );
 
 -- =============================================
@@ -168,26 +176,45 @@ CREATE TABLE IF NOT EXISTS public.factura_detalle (
 -- =============================================
 
 -- Índices sistema contable
-CREATE INDEX IF NOT EXISTS idx_transacciones_fecha ON public.transacciones(fecha_transaccion);
-CREATE INDEX IF NOT EXISTS idx_asientos_transaccion ON public.asientos(id_transaccion);
+-- Orden de listar_transacciones (más recientes primero, id como desempate) con sus filtros
+DROP INDEX IF EXISTS public.idx_transacciones_fecha;
+CREATE INDEX IF NOT EXISTS idx_transacciones_fecha_id ON public.transacciones(fecha_transaccion DESC, id_transaccion DESC);
+CREATE INDEX IF NOT EXISTS idx_transacciones_periodo_fecha ON public.transacciones(id_periodo, fecha_transaccion DESC, id_transaccion DESC);
+CREATE INDEX IF NOT EXISTS idx_transacciones_tipo_categoria_fecha ON public.transacciones(tipo, categoria, fecha_transaccion DESC, id_transaccion DESC);
+-- El índice compuesto cubre también las búsquedas solo por id_transaccion
+DROP INDEX IF EXISTS public.idx_asientos_transaccion;
+CREATE INDEX IF NOT EXISTS idx_asientos_transaccion_cuenta ON public.asientos(id_transaccion, id_cuenta);
+CREATE INDEX IF NOT EXISTS idx_asientos_cuenta ON public.asientos(id_cuenta);
 CREATE INDEX IF NOT EXISTS idx_catalogo_codigo ON public.catalogo_cuentas(codigo_cuenta);
 
 -- Índices clientes
-CREATE INDEX IF NOT EXISTS idx_clientes_nombre ON public.clientes(nombre);
+-- Orden y paginación por keyset de listar_clientes
+DROP INDEX IF EXISTS public.idx_clientes_nombre;
+CREATE INDEX IF NOT EXISTS idx_clientes_nombre_id ON public.clientes(nombre, id_cliente);
 CREATE INDEX IF NOT EXISTS idx_clientes_nit ON public.clientes(nit);
 CREATE INDEX IF NOT EXISTS idx_clientes_activo ON public.clientes(activo);
+-- Búsqueda libre de listar_clientes (ILIKE sobre nombre, nit y email)
+CREATE INDEX IF NOT EXISTS idx_clientes_nombre_trgm ON public.clientes USING gin (nombre gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_clientes_nit_trgm ON public.clientes USING gin (nit gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_clientes_email_trgm ON public.clientes USING gin (email gin_trgm_ops);
 
 -- Índices productos
 CREATE INDEX IF NOT EXISTS idx_productos_codigo ON public.productos_servicios(codigo);
-CREATE INDEX IF NOT EXISTS idx_productos_nombre ON public.productos_servicios(nombre);
+-- Orden y paginación por keyset de listar_productos
+DROP INDEX IF EXISTS public.idx_productos_nombre;
+CREATE INDEX IF NOT EXISTS idx_productos_nombre_id ON public.productos_servicios(nombre, id_producto);
 CREATE INDEX IF NOT EXISTS idx_productos_tipo ON public.productos_servicios(tipo);
 CREATE INDEX IF NOT EXISTS idx_productos_activo ON public.productos_servicios(activo);
 
 -- Índices facturas
 CREATE INDEX IF NOT EXISTS idx_facturas_numero ON public.facturas(numero_factura);
 CREATE INDEX IF NOT EXISTS idx_facturas_cliente_legacy ON public.facturas(cliente);
+-- Filtro por cliente de listar_facturas (ILIKE '%texto%')
+CREATE INDEX IF NOT EXISTS idx_facturas_cliente_trgm ON public.facturas USING gin (cliente gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_facturas_id_cliente ON public.facturas(id_cliente);
-CREATE INDEX IF NOT EXISTS idx_facturas_fecha ON public.facturas(fecha_emision);
+-- Listado paginado: ORDER BY fecha_emision DESC, id_factura DESC (reemplaza idx_facturas_fecha)
+DROP INDEX IF EXISTS public.idx_facturas_fecha;
+CREATE INDEX IF NOT EXISTS idx_facturas_fecha_id ON public.facturas(fecha_emision DESC, id_factura DESC);
 CREATE INDEX IF NOT EXISTS idx_facturas_nit ON public.facturas(nit_cliente);
 
 -- Índices factura_detalle
@@ -293,7 +320,7 @@ BEGIN
         AND column_name = 'subtotal'
     ) THEN
         ALTER TABLE public.facturas 
-        ADD COLUMN subtotal NUMERIC(12, 2) NOT NULL DEFAULT 0.00;
+        ADD COLUMN subtotal BIGINT NOT NULL DEFAULT 0;
         RAISE NOTICE 'Columna subtotal agregada a facturas';
     END IF;
     
@@ -305,7 +332,7 @@ BEGIN
         AND column_name = 'descuento'
     ) THEN
         ALTER TABLE public.facturas 
-        ADD COLUMN descuento NUMERIC(12, 2) NOT NULL DEFAULT 0.00;
+        ADD COLUMN descuento BIGINT NOT NULL DEFAULT 0;
         RAISE NOTICE 'Columna descuento agregada a facturas';
     END IF;
     
@@ -317,7 +344,7 @@ BEGIN
         AND column_name = 'iva'
     ) THEN
         ALTER TABLE public.facturas 
-        ADD COLUMN iva NUMERIC(12, 2) NOT NULL DEFAULT 0.00;
+        ADD COLUMN iva BIGINT NOT NULL DEFAULT 0;
         RAISE NOTICE 'Columna iva agregada a facturas';
     END IF;
     
@@ -395,7 +422,7 @@ BEGIN
         AND column_name = 'total_linea'
     ) THEN
         ALTER TABLE public.factura_detalle 
-        ADD COLUMN total_linea NUMERIC(12, 2);
+        ADD COLUMN total_linea BIGINT;
         
         -- Calcular valores existentes
         UPDATE public.factura_detalle 
@@ -410,6 +437,100 @@ BEGIN
     END IF;
 END $$;
 
+-- Convertir activo/aplica_iva de texto 'SI'/'NO' a BOOLEAN si aún no se ha hecho
+DO $$
+DECLARE
+    col RECORD;
+BEGIN
+    FOR col IN
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+        AND (table_name, column_name) IN (
+            ('clientes', 'activo'),
+            ('productos_servicios', 'activo'),
+            ('productos_servicios', 'aplica_iva')
+        )
+        AND data_type = 'character varying'
+    LOOP
+        EXECUTE format('ALTER TABLE public.%I DROP CONSTRAINT IF EXISTS %I',
+                       col.table_name, col.table_name || '_' || col.column_name || '_check');
+        EXECUTE format('ALTER TABLE public.%I ALTER COLUMN %I DROP DEFAULT',
+                       col.table_name, col.column_name);
+        EXECUTE format('ALTER TABLE public.%I ALTER COLUMN %I TYPE BOOLEAN USING (COALESCE(%I, ''SI'') = ''SI'')',
+                       col.table_name, col.column_name, col.column_name);
+        EXECUTE format('ALTER TABLE public.%I ALTER COLUMN %I SET DEFAULT TRUE',
+                       col.table_name, col.column_name);
+        EXECUTE format('ALTER TABLE public.%I ALTER COLUMN %I SET NOT NULL',
+                       col.table_name, col.column_name);
+        RAISE NOTICE 'Columna %.% convertida a BOOLEAN', col.table_name, col.column_name;
+    END LOOP;
+END $$;
+
+-- Convertir montos NUMERIC a BIGINT en centavos si aún no se ha hecho
+-- (las vistas dependientes se eliminan aquí y se recrean en el PASO 7)
+DO $$
+DECLARE
+    col RECORD;
+BEGIN
+    FOR col IN
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+        AND (table_name, column_name) IN (
+            ('asientos', 'debe'),
+            ('asientos', 'haber'),
+            ('facturas', 'subtotal'),
+            ('facturas', 'descuento'),
+            ('facturas', 'iva'),
+            ('facturas', 'monto_total'),
+            ('factura_detalle', 'precio_unitario'),
+            ('factura_detalle', 'descuento_monto'),
+            ('factura_detalle', 'subtotal'),
+            ('factura_detalle', 'iva'),
+            ('factura_detalle', 'total_linea')
+        )
+        AND data_type = 'numeric'
+    LOOP
+        DROP VIEW IF EXISTS v_facturas_completas, v_facturas_detalladas,
+                            v_ventas_por_cliente, v_productos_mas_vendidos;
+        EXECUTE format('ALTER TABLE public.%I ALTER COLUMN %I DROP DEFAULT',
+                       col.table_name, col.column_name);
+        EXECUTE format('ALTER TABLE public.%I ALTER COLUMN %I TYPE BIGINT USING round(%I * 100)::BIGINT',
+                       col.table_name, col.column_name, col.column_name);
+        IF col.column_name NOT IN ('monto_total', 'precio_unitario', 'total_linea') THEN
+            EXECUTE format('ALTER TABLE public.%I ALTER COLUMN %I SET DEFAULT 0',
+                           col.table_name, col.column_name);
+        END IF;
+        RAISE NOTICE 'Columna %.% convertida a BIGINT (centavos)', col.table_name, col.column_name;
+    END LOOP;
+END $$;
+
+-- Índice parcial de clientes activos (requiere activo BOOLEAN), en el orden del keyset
+DROP INDEX IF EXISTS public.idx_clientes_activos_nombre;
+CREATE INDEX IF NOT EXISTS idx_clientes_activos_nombre_id ON public.clientes(nombre, id_cliente) WHERE activo;
+
+-- Código de cuenta mayor precalculado (2, 4 y 6 dígitos) para agrupar el libro mayor
+ALTER TABLE public.catalogo_cuentas
+    ADD COLUMN IF NOT EXISTS codigo_mayor_2 VARCHAR(2) GENERATED ALWAYS AS (substr(codigo_cuenta || '0000000000', 1, 2)) STORED,
+    ADD COLUMN IF NOT EXISTS codigo_mayor_4 VARCHAR(4) GENERATED ALWAYS AS (substr(codigo_cuenta || '0000000000', 1, 4)) STORED,
+    ADD COLUMN IF NOT EXISTS codigo_mayor_6 VARCHAR(6) GENERATED ALWAYS AS (substr(codigo_cuenta || '0000000000', 1, 6)) STORED;
+CREATE INDEX IF NOT EXISTS idx_catalogo_codigo_mayor_2 ON public.catalogo_cuentas(codigo_mayor_2);
+CREATE INDEX IF NOT EXISTS idx_catalogo_codigo_mayor_4 ON public.catalogo_cuentas(codigo_mayor_4);
+CREATE INDEX IF NOT EXISTS idx_catalogo_codigo_mayor_6 ON public.catalogo_cuentas(codigo_mayor_6);
+
+-- Índice parcial de alertas de bajo stock en el orden de la paginación por keyset
+CREATE INDEX IF NOT EXISTS idx_productos_bajo_stock ON public.productos_servicios(stock_actual, id_producto)
+    WHERE tipo = 'PRODUCTO' AND activo AND stock_actual < stock_minimo;
+
+-- Correlativos de factura: continuar desde el mayor número ya emitido en cada año
+INSERT INTO public.factura_contador (anio, ultimo)
+SELECT split_part(numero_factura, '-', 2)::INTEGER, max(split_part(numero_factura, '-', 3)::INTEGER)
+FROM public.facturas
+WHERE numero_factura ~ '^FACT-[0-9]{4}-[0-9]+$'
+GROUP BY 1
+ON CONFLICT (anio) DO UPDATE SET ultimo = GREATEST(public.factura_contador.ultimo, EXCLUDED.ultimo);
+
 -- =============================================
 -- PASO 5: INSERTAR DATOS INICIALES (solo si las tablas están vacías)
 -- =============================================
@@ -754,14 +875,14 @@ END $$;
 
 -- Insertar cliente genérico (solo si no existen clientes)
 INSERT INTO public.clientes (nombre, tipo_cliente, activo)
-SELECT 'Cliente Contado', 'INDIVIDUAL', 'SI'
+SELECT 'Cliente Contado', 'INDIVIDUAL', TRUE
 WHERE NOT EXISTS (SELECT 1 FROM public.clientes WHERE nombre = 'Cliente Contado');
 
 -- Insertar productos de ejemplo (solo si no existen productos)
 INSERT INTO public.productos_servicios (codigo, nombre, tipo, precio_unitario, unidad_medida, aplica_iva, activo)
 SELECT * FROM (VALUES
-    ('SERV-001', 'Servicio de Consultoría', 'SERVICIO', 50.00, 'Hora', 'SI', 'SI'),
-    ('PROD-GEN', 'Producto Genérico', 'PRODUCTO', 10.00, 'Unidad', 'SI', 'SI')
+    ('SERV-001', 'Servicio de Consultoría', 'SERVICIO', 50.00, 'Hora', TRUE, TRUE),
+    ('PROD-GEN', 'Producto Genérico', 'PRODUCTO', 10.00, 'Unidad', TRUE, TRUE)
 ) AS v(codigo, nombre, tipo, precio_unitario, unidad_medida, aplica_iva, activo)
 WHERE NOT EXISTS (SELECT 1 FROM public.productos_servicios WHERE codigo = v.codigo);
 
@@ -777,11 +898,11 @@ BEGIN
     IF (SELECT COUNT(*) FROM public.clientes WHERE nombre != 'Cliente Contado') = 0 THEN
         INSERT INTO public.clientes (nombre, tipo_cliente, nit, telefono, email, direccion, activo, notas)
         VALUES
-            ('Empresa ABC S.A. de C.V.', 'EMPRESA', '0614-151289-101-5', '2245-6789', 'ventas@empresaabc.com', 'Blvd. Los Próceres #123, San Salvador', 'SI', 'Cliente corporativo principal'),
-            ('Juan Carlos Pérez', 'INDIVIDUAL', NULL, '7890-1234', 'jcperez@email.com', 'Col. Escalón, Calle Principal #45, San Salvador', 'SI', 'Cliente frecuente'),
-            ('Tienda El Ahorro', 'EMPRESA', '0614-220190-102-3', '2234-5678', 'compras@elahorro.com', 'Centro Comercial Plaza Norte, Santa Tecla', 'SI', NULL),
-            ('María Rodríguez', 'INDIVIDUAL', NULL, '6123-4567', 'maria.r@email.com', 'Urbanización Los Jardines #78, Antiguo Cuscatlán', 'SI', NULL),
-            ('Distribuidora XYZ', 'EMPRESA', '0614-180295-103-1', '2256-7890', 'info@xyzdistr.com', 'Zona Industrial, Santa Ana', 'SI', 'Cliente mayorista');
+            ('Empresa ABC S.A. de C.V.', 'EMPRESA', '0614-151289-101-5', '2245-6789', 'ventas@empresaabc.com', 'Blvd. Los Próceres #123, San Salvador', TRUE, 'Cliente corporativo principal'),
+            ('Juan Carlos Pérez', 'INDIVIDUAL', NULL, '7890-1234', 'jcperez@email.com', 'Col. Escalón, Calle Principal #45, San Salvador', TRUE, 'Cliente frecuente'),
+            ('Tienda El Ahorro', 'EMPRESA', '0614-220190-102-3', '2234-5678', 'compras@elahorro.com', 'Centro Comercial Plaza Norte, Santa Tecla', TRUE, NULL),
+            ('María Rodríguez', 'INDIVIDUAL', NULL, '6123-4567', 'maria.r@email.com', 'Urbanización Los Jardines #78, Antiguo Cuscatlán', TRUE, NULL),
+            ('Distribuidora XYZ', 'EMPRESA', '0614-180295-103-1', '2256-7890', 'info@xyzdistr.com', 'Zona Industrial, Santa Ana', TRUE, 'Cliente mayorista');
         
         RAISE NOTICE 'Clientes de ejemplo insertados (5 registros)';
     END IF;
@@ -795,25 +916,25 @@ BEGIN
         (codigo, nombre, descripcion, tipo, categoria, precio_unitario, precio_costo, unidad_medida, stock_actual, stock_minimo, aplica_iva, activo)
         VALUES
             -- PRODUCTOS
-            ('PROD-001', 'Laptop Dell Inspiron 15', 'Laptop para oficina, Intel i5, 8GB RAM, 256GB SSD', 'PRODUCTO', 'Electrónica', 650.00, 500.00, 'Unidad', 15.00, 5.00, 'SI', 'SI'),
-            ('PROD-002', 'Mouse Inalámbrico Logitech', 'Mouse ergonómico inalámbrico con receptor USB', 'PRODUCTO', 'Accesorios', 25.00, 15.00, 'Unidad', 50.00, 10.00, 'SI', 'SI'),
-            ('PROD-003', 'Teclado Mecánico RGB', 'Teclado mecánico retroiluminado para gaming', 'PRODUCTO', 'Accesorios', 85.00, 60.00, 'Unidad', 20.00, 5.00, 'SI', 'SI'),
-            ('PROD-004', 'Monitor LED 24 pulgadas', 'Monitor Full HD 1920x1080, HDMI y VGA', 'PRODUCTO', 'Electrónica', 180.00, 130.00, 'Unidad', 12.00, 3.00, 'SI', 'SI'),
-            ('PROD-005', 'Impresora Multifuncional HP', 'Impresora, escáner y copiadora, WiFi', 'PRODUCTO', 'Electrónica', 220.00, 170.00, 'Unidad', 8.00, 2.00, 'SI', 'SI'),
-            ('PROD-006', 'Cable HDMI 2m', 'Cable HDMI 2.0 de alta velocidad', 'PRODUCTO', 'Accesorios', 12.00, 7.00, 'Unidad', 100.00, 20.00, 'SI', 'SI'),
-            ('PROD-007', 'Disco Duro Externo 1TB', 'Disco duro portátil USB 3.0', 'PRODUCTO', 'Almacenamiento', 65.00, 45.00, 'Unidad', 25.00, 5.00, 'SI', 'SI'),
-            ('PROD-008', 'Memoria USB 32GB', 'Memoria flash USB 3.0', 'PRODUCTO', 'Almacenamiento', 15.00, 10.00, 'Unidad', 75.00, 15.00, 'SI', 'SI'),
-            ('PROD-009', 'Silla Ergonómica de Oficina', 'Silla con soporte lumbar y brazos ajustables', 'PRODUCTO', 'Mobiliario', 150.00, 100.00, 'Unidad', 10.00, 3.00, 'SI', 'SI'),
-            ('PROD-010', 'Escritorio Ejecutivo', 'Escritorio de madera 1.60m x 0.80m', 'PRODUCTO', 'Mobiliario', 280.00, 200.00, 'Unidad', 5.00, 1.00, 'SI', 'SI'),
+            ('PROD-001', 'Laptop Dell Inspiron 15', 'Laptop para oficina, Intel i5, 8GB RAM, 256GB SSD', 'PRODUCTO', 'Electrónica', 650.00, 500.00, 'Unidad', 15.00, 5.00, TRUE, TRUE),
+            ('PROD-002', 'Mouse Inalámbrico Logitech', 'Mouse ergonómico inalámbrico con receptor USB', 'PRODUCTO', 'Accesorios', 25.00, 15.00, 'Unidad', 50.00, 10.00, TRUE, TRUE),
+            ('PROD-003', 'Teclado Mecánico RGB', 'Teclado mecánico retroiluminado para gaming', 'PRODUCTO', 'Accesorios', 85.00, 60.00, 'Unidad', 20.00, 5.00, TRUE, TRUE),
+            ('PROD-004', 'Monitor LED 24 pulgadas', 'Monitor Full HD 1920x1080, HDMI y VGA', 'PRODUCTO', 'Electrónica', 180.00, 130.00, 'Unidad', 12.00, 3.00, TRUE, TRUE),
+            ('PROD-005', 'Impresora Multifuncional HP', 'Impresora, escáner y copiadora, WiFi', 'PRODUCTO', 'Electrónica', 220.00, 170.00, 'Unidad', 8.00, 2.00, TRUE, TRUE),
+            ('PROD-006', 'Cable HDMI 2m', 'Cable HDMI 2.0 de alta velocidad', 'PRODUCTO', 'Accesorios', 12.00, 7.00, 'Unidad', 100.00, 20.00, TRUE, TRUE),
+            ('PROD-007', 'Disco Duro Externo 1TB', 'Disco duro portátil USB 3.0', 'PRODUCTO', 'Almacenamiento', 65.00, 45.00, 'Unidad', 25.00, 5.00, TRUE, TRUE),
+            ('PROD-008', 'Memoria USB 32GB', 'Memoria flash USB 3.0', 'PRODUCTO', 'Almacenamiento', 15.00, 10.00, 'Unidad', 75.00, 15.00, TRUE, TRUE),
+            ('PROD-009', 'Silla Ergonómica de Oficina', 'Silla con soporte lumbar y brazos ajustables', 'PRODUCTO', 'Mobiliario', 150.00, 100.00, 'Unidad', 10.00, 3.00, TRUE, TRUE),
+            ('PROD-010', 'Escritorio Ejecutivo', 'Escritorio de madera 1.60m x 0.80m', 'PRODUCTO', 'Mobiliario', 280.00, 200.00, 'Unidad', 5.00, 1.00, TRUE, TRUE),
             
             -- SERVICIOS
-            ('SERV-002', 'Mantenimiento Preventivo PC', 'Limpieza, optimización y actualización de software', 'SERVICIO', 'Soporte Técnico', 35.00, NULL, 'Servicio', NULL, NULL, 'SI', 'SI'),
-            ('SERV-003', 'Instalación de Software', 'Instalación y configuración de programas', 'SERVICIO', 'Soporte Técnico', 25.00, NULL, 'Servicio', NULL, NULL, 'SI', 'SI'),
-            ('SERV-004', 'Reparación de Hardware', 'Diagnóstico y reparación de componentes', 'SERVICIO', 'Soporte Técnico', 45.00, NULL, 'Hora', NULL, NULL, 'SI', 'SI'),
-            ('SERV-005', 'Diseño Gráfico', 'Diseño de logos, flyers y material publicitario', 'SERVICIO', 'Diseño', 75.00, NULL, 'Hora', NULL, NULL, 'SI', 'SI'),
-            ('SERV-006', 'Desarrollo Web', 'Desarrollo de sitios web responsivos', 'SERVICIO', 'Desarrollo', 60.00, NULL, 'Hora', NULL, NULL, 'SI', 'SI'),
-            ('SERV-007', 'Capacitación Office', 'Capacitación en Microsoft Office (Word, Excel, PowerPoint)', 'SERVICIO', 'Capacitación', 40.00, NULL, 'Hora', NULL, NULL, 'SI', 'SI'),
-            ('SERV-008', 'Backup y Recuperación', 'Servicio de respaldo y recuperación de datos', 'SERVICIO', 'Soporte Técnico', 55.00, NULL, 'Servicio', NULL, NULL, 'SI', 'SI');
+            ('SERV-002', 'Mantenimiento Preventivo PC', 'Limpieza, optimización y actualización de software', 'SERVICIO', 'Soporte Técnico', 35.00, NULL, 'Servicio', NULL, NULL, TRUE, TRUE),
+            ('SERV-003', 'Instalación de Software', 'Instalación y configuración de programas', 'SERVICIO', 'Soporte Técnico', 25.00, NULL, 'Servicio', NULL, NULL, TRUE, TRUE),
+            ('SERV-004', 'Reparación de Hardware', 'Diagnóstico y reparación de componentes', 'SERVICIO', 'Soporte Técnico', 45.00, NULL, 'Hora', NULL, NULL, TRUE, TRUE),
+            ('SERV-005', 'Diseño Gráfico', 'Diseño de logos, flyers y material publicitario', 'SERVICIO', 'Diseño', 75.00, NULL, 'Hora', NULL, NULL, TRUE, TRUE),
+            ('SERV-006', 'Desarrollo Web', 'Desarrollo de sitios web responsivos', 'SERVICIO', 'Desarrollo', 60.00, NULL, 'Hora', NULL, NULL, TRUE, TRUE),
+            ('SERV-007', 'Capacitación Office', 'Capacitación en Microsoft Office (Word, Excel, PowerPoint)', 'SERVICIO', 'Capacitación', 40.00, NULL, 'Hora', NULL, NULL, TRUE, TRUE),
+            ('SERV-008', 'Backup y Recuperación', 'Servicio de respaldo y recuperación de datos', 'SERVICIO', 'Soporte Técnico', 55.00, NULL, 'Servicio', NULL, NULL, TRUE, TRUE);
         
         RAISE NOTICE 'Productos y servicios de ejemplo insertados (17 registros)';
     END IF;
@@ -866,26 +987,26 @@ BEGIN
         -- Asientos para Venta 1 (partida doble: Debe en Caja, Haber en Ventas)
         INSERT INTO public.asientos (id_transaccion, id_cuenta, debe, haber)
         VALUES 
-            (v_trans_venta_1, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '11010101'), 1800.00, 0.00),  -- Caja General (debe)
-            (v_trans_venta_1, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '510102'), 0.00, 1800.00);    -- Ventas a contribuyentes (haber)
+            (v_trans_venta_1, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '11010101'), 180000, 0),  -- Caja General (debe)
+            (v_trans_venta_1, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '510102'), 0, 180000);    -- Ventas a contribuyentes (haber)
         
         -- Asientos para Venta 2
         INSERT INTO public.asientos (id_transaccion, id_cuenta, debe, haber)
         VALUES 
-            (v_trans_venta_2, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '110102'), 350.00, 0.00),     -- Bancos (debe)
-            (v_trans_venta_2, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '5102'), 0.00, 350.00);       -- Ingresos por servicios (haber)
+            (v_trans_venta_2, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '110102'), 35000, 0),     -- Bancos (debe)
+            (v_trans_venta_2, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '5102'), 0, 35000);       -- Ingresos por servicios (haber)
         
         -- Asientos para Compra
         INSERT INTO public.asientos (id_transaccion, id_cuenta, debe, haber)
         VALUES 
-            (v_trans_compra, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '110701'), 1200.00, 0.00),     -- Mercadería (debe)
-            (v_trans_compra, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '110102'), 0.00, 1200.00);     -- Bancos (haber)
+            (v_trans_compra, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '110701'), 120000, 0),     -- Mercadería (debe)
+            (v_trans_compra, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '110102'), 0, 120000);     -- Bancos (haber)
         
         -- Asientos para Gasto
         INSERT INTO public.asientos (id_transaccion, id_cuenta, debe, haber)
         VALUES 
-            (v_trans_gasto, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '410421'), 150.00, 0.00),       -- Energía eléctrica (debe)
-            (v_trans_gasto, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '11010101'), 0.00, 150.00);     -- Caja General (haber)
+            (v_trans_gasto, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '410421'), 15000, 0),       -- Energía eléctrica (debe)
+            (v_trans_gasto, (SELECT id_cuenta FROM public.catalogo_cuentas WHERE codigo_cuenta = '11010101'), 0, 15000);     -- Caja General (haber)
         
         RAISE NOTICE 'Transacciones y asientos de ejemplo insertados (4 transacciones, 8 asientos)';
     END IF;
@@ -920,7 +1041,7 @@ BEGIN
                 WHEN LENGTH(NULLIF(TRIM(nit_cliente), '')) > 10 THEN 'EMPRESA'
                 ELSE 'INDIVIDUAL'
             END AS tipo_cliente,
-            'SI' AS activo
+            TRUE AS activo
         FROM public.facturas
         WHERE nit_cliente IS NOT NULL 
             AND TRIM(nit_cliente) != ''
@@ -934,7 +1055,7 @@ BEGIN
             NULLIF(TRIM(email_cliente), '') AS email,
             NULLIF(TRIM(direccion_cliente), '') AS direccion,
             'INDIVIDUAL' AS tipo_cliente,
-            'SI' AS activo
+            TRUE AS activo
         FROM public.facturas
         WHERE cliente IS NOT NULL 
             AND TRIM(cliente) != ''
@@ -980,10 +1101,10 @@ BEGIN
                 WHEN LOWER(producto_servicio) LIKE '%servicio%' OR LOWER(producto_servicio) LIKE '%consultoría%' THEN 'SERVICIO'
                 ELSE 'PRODUCTO'
             END AS tipo,
-            COALESCE(AVG(subtotal), 100.00) AS precio_unitario,
+            COALESCE(AVG(subtotal) / 100.0, 100.00) AS precio_unitario,
             'Unidad' AS unidad_medida,
-            CASE WHEN AVG(iva) > 0 THEN 'SI' ELSE 'NO' END AS aplica_iva,
-            'SI' AS activo
+            AVG(iva) > 0 AS aplica_iva,
+            TRUE AS activo
         FROM public.facturas
         WHERE producto_servicio IS NOT NULL
             AND TRIM(producto_servicio) != ''
@@ -1052,10 +1173,10 @@ SELECT
     COALESCE(c.email, f.email_cliente) AS cliente_email,
     COALESCE(c.direccion, f.direccion_cliente) AS cliente_direccion,
     c.tipo_cliente,
-    f.subtotal,
-    f.descuento,
-    f.iva,
-    f.monto_total,
+    f.subtotal / 100.0 AS subtotal,
+    f.descuento / 100.0 AS descuento,
+    f.iva / 100.0 AS iva,
+    f.monto_total / 100.0 AS monto_total,
     f.condiciones_pago,
     f.vendedor,
     f.notas,
@@ -1078,12 +1199,12 @@ SELECT
     ps.nombre AS producto_nombre,
     ps.tipo AS producto_tipo,
     fd.cantidad,
-    fd.precio_unitario,
+    fd.precio_unitario / 100.0 AS precio_unitario,
     fd.descuento_porcentaje,
-    fd.descuento_monto,
-    fd.subtotal,
-    fd.iva,
-    fd.total_linea
+    fd.descuento_monto / 100.0 AS descuento_monto,
+    fd.subtotal / 100.0 AS subtotal,
+    fd.iva / 100.0 AS iva,
+    fd.total_linea / 100.0 AS total_linea
 FROM public.facturas f
 LEFT JOIN public.clientes c ON f.id_cliente = c.id_cliente
 INNER JOIN public.factura_detalle fd ON f.id_factura = fd.id_factura
@@ -1096,8 +1217,8 @@ SELECT
     COALESCE(c.nombre, f.cliente) AS cliente_nombre,
     c.tipo_cliente,
     COUNT(f.id_factura) AS total_facturas,
-    SUM(f.monto_total) AS monto_total_vendido,
-    AVG(f.monto_total) AS monto_promedio,
+    SUM(f.monto_total) / 100.0 AS monto_total_vendido,
+    AVG(f.monto_total) / 100.0 AS monto_promedio,
     MAX(f.fecha_emision) AS ultima_compra
 FROM public.facturas f
 LEFT JOIN public.clientes c ON f.id_cliente = c.id_cliente
@@ -1113,8 +1234,8 @@ SELECT
     ps.categoria,
     COUNT(DISTINCT fd.id_factura) AS num_facturas,
     SUM(fd.cantidad) AS cantidad_total_vendida,
-    SUM(fd.total_linea) AS monto_total_vendido,
-    AVG(fd.precio_unitario) AS precio_promedio
+    SUM(fd.total_linea) / 100.0 AS monto_total_vendido,
+    AVG(fd.precio_unitario) / 100.0 AS precio_promedio
 FROM public.productos_servicios ps
 INNER JOIN public.factura_detalle fd ON ps.id_producto = fd.id_producto
 GROUP BY ps.id_producto, ps.codigo, ps.nombre, ps.tipo, ps.categoria
@@ -1154,7 +1275,7 @@ BEGIN
     IF EXISTS (
         SELECT 1 FROM public.productos_servicios ps 
         WHERE ps.id_producto = NEW.id_producto 
-        AND ps.aplica_iva = 'SI'
+        AND ps.aplica_iva
     ) THEN
         NEW.iva = NEW.subtotal * 0.13;
     ELSE
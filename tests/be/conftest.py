@@ -0,0 +1,14 @@
+"""
+Configuración común de las pruebas del backend.
+"""
+import pytest
+
+from BE.app.cache import limpiar_caches
+
+
+@pytest.fixture(autouse=True)
+def limpiar_caches_en_memoria():
+    """Cada prueba recrea la BD: evitar que las cachés en memoria arrastren datos"""
+    limpiar_caches()
+    yield
+    limpiar_caches()
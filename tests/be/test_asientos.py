@@ -123,6 +123,14 @@ def test_create_asiento_neither_debe_haber(test_client):
     
     assert response.status_code == 422  # Pydantic validation error
 
+def test_create_asiento_sin_montos_omitidos(test_client):
+    """Omitir debe y haber equivale a ambos en 0 (inválido)"""
+    asiento_data = {"id_transaccion": 1, "id_cuenta": 1}
+
+    response = test_client.post("/api/asientos/", json=asiento_data)
+
+    assert response.status_code == 422
+
 def test_create_asiento_credit_only(test_client):
     """Prueba de creación exitosa de asiento contable solo con haber"""
     asiento_data = {
@@ -172,3 +180,77 @@ def test_list_asientos_by_transaction(test_client):
 # - Probar validación de balance entre múltiples asientos
 # - Probar montos negativos (deben fallar)
 # - Probar manejo de precisión decimal
+
+def test_resumen_libro_mayor_refleja_nuevo_asiento(test_client):
+    """El resumen del libro mayor en caché se invalida al crear asientos"""
+    response = test_client.get("/api/libro_mayor/resumen", params={"digitos": 4})
+    assert response.status_code == 200
+    assert float(response.json()["resumen"]["total_debe_general"]) == 0
+
+    asiento_data = {"id_transaccion": 1, "id_cuenta": 1, "debe": 250.00, "haber": 0.00}
+    assert test_client.post("/api/asientos/", json=asiento_data).status_code == 201
+
+    response = test_client.get("/api/libro_mayor/resumen", params={"digitos": 4})
+    assert response.status_code == 200
+    assert float(response.json()["resumen"]["total_debe_general"]) == 250.0
+
+def test_libro_mayor_agrupa_por_digitos_con_detalle(test_client):
+    """El libro mayor agrupa por prefijo del código y lista las subcuentas de cada mayor"""
+    for codigo, nombre in (("1002", "Bancos"), ("2", "Pasivo")):
+        response = test_client.post(
+            "/api/catalogo-cuentas/",
+            json={"codigo_cuenta": codigo, "nombre_cuenta": nombre, "tipo_cuenta": "Activo"}
+        )
+        assert response.status_code == 201
+    for id_cuenta, debe in ((1, 100.00), (2, 50.00), (3, 25.00)):
+        asiento_data = {"id_transaccion": 1, "id_cuenta": id_cuenta, "debe": debe, "haber": 0.00}
+        assert test_client.post("/api/asientos/", json=asiento_data).status_code == 201
+
+    response = test_client.get("/api/libro_mayor", params={"digitos": 2, "incluir_detalle": True})
+    assert response.status_code == 200
+    mayores = {m["codigo_mayor"]: m for m in response.json()["mayores"]}
+
+    assert set(mayores) == {"10", "20"}
+    assert float(mayores["10"]["total_debe"]) == 150.0
+    assert [s["codigo_cuenta"] for s in mayores["10"]["subcuentas"]] == ["1001", "1002"]
+    assert float(mayores["20"]["total_debe"]) == 25.0
+    assert float(response.json()["resumen"]["total_debe_general"]) == 175.0
+    # Los montos anidados también se serializan como número
+    assert isinstance(mayores["10"]["subcuentas"][0]["total_debe"], float)
+
+    # Con un número de dígitos sin columna precalculada se agrupa por expresión
+    response = test_client.get("/api/libro_mayor", params={"digitos": 3})
+    assert [m["codigo_mayor"] for m in response.json()["mayores"]] == ["100", "200"]
+
+    # Nombre de la cuenta con el código exacto del mayor, o genérico si no existe
+    response = test_client.get("/api/libro_mayor", params={"digitos": 4})
+    assert [m["nombre_mayor"] for m in response.json()["mayores"]] == ["Caja", "Bancos", "Cuenta Mayor 2000"]
+
+def test_exportar_libro_diario_excel(test_client):
+    """La exportación Excel del libro diario incluye encabezados y una fila por asiento"""
+    from io import BytesIO
+    from openpyxl import load_workbook
+
+    for debe in (100.00, 40.00):
+        asiento_data = {"id_transaccion": 1, "id_cuenta": 1, "debe": debe, "haber": 0.00}
+        assert test_client.post("/api/asientos/", json=asiento_data).status_code == 201
+
+    response = test_client.get("/api/reportes/libro-diario/export/xlsx")
+    assert response.status_code == 200
+
+    hoja = load_workbook(BytesIO(response.content))["Libro Diario"]
+    filas = list(hoja.iter_rows(values_only=True))
+    assert filas[0][0] == "id_asiento"
+    assert [fila[8] for fila in filas[1:]] == [100.0, 40.0]
+
+def test_exportar_libro_diario_html(test_client):
+    """La exportación HTML del libro diario se envía por bloques con una fila por asiento"""
+    asiento_data = {"id_transaccion": 1, "id_cuenta": 1, "debe": 75.00, "haber": 0.00}
+    assert test_client.post("/api/asientos/", json=asiento_data).status_code == 201
+
+    response = test_client.get("/api/reportes/libro-diario/export/html")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.text.count("<tr><td>") == 1
+    assert "<td>Caja</td>" in response.text
+    assert response.text.rstrip().endswith("</html>")
@@ -176,3 +176,62 @@ def test_buscar_cliente_por_nit(test_client):
     assert response.status_code == 200
     data = response.json()
     assert data["nit"] == nit_buscar
+
+def test_listar_clientes_refleja_actualizacion(test_client):
+    """Probar que el listado en caché se invalida al actualizar un cliente"""
+    cliente_data = {
+        "nombre": "Cliente Cache",
+        "tipo_cliente": "INDIVIDUAL",
+        "nit": "0614-050190-101-7"
+    }
+    cliente_id = test_client.post("/api/clientes/", json=cliente_data).json()["id_cliente"]
+    
+    assert test_client.get("/api/clientes/").json()[0]["nombre"] == "Cliente Cache"
+    
+    test_client.put(f"/api/clientes/{cliente_id}", json={"nombre": "Cliente Renombrado"})
+    
+    assert test_client.get("/api/clientes/").json()[0]["nombre"] == "Cliente Renombrado"
+
+def test_listar_clientes_paginado_con_cursor(test_client):
+    """La cabecera X-Next-Cursor recorre los clientes por nombre sin repetidos"""
+    for letra in ("C", "A", "B"):
+        test_client.post("/api/clientes/", json={
+            "nombre": f"Keyset {letra}",
+            "tipo_cliente": "INDIVIDUAL",
+            "activo": True
+        })
+
+    params = {"limit": 2, "busqueda": "Keyset"}
+    primera = test_client.get("/api/clientes/", params=params)
+    cursor = primera.headers["X-Next-Cursor"]
+    segunda = test_client.get("/api/clientes/", params={**params, "cursor": cursor})
+
+    assert [c["nombre"] for c in primera.json()] == ["Keyset A", "Keyset B"]
+    assert [c["nombre"] for c in segunda.json()] == ["Keyset C"]
+    assert "X-Next-Cursor" not in segunda.headers
+    # Con cursor se ignora un skip sobrante (no salta filas)
+    con_skip = test_client.get("/api/clientes/", params={**params, "cursor": cursor, "skip": 1})
+    assert [c["nombre"] for c in con_skip.json()] == ["Keyset C"]
+
+def test_estadisticas_clientes(test_client):
+    """Los conteos del resumen salen de un único agregado con FILTER"""
+    ids = [
+        test_client.post("/api/clientes/", json={"nombre": nombre, "tipo_cliente": tipo}).json()["id_cliente"]
+        for nombre, tipo in (("E1", "EMPRESA"), ("I1", "INDIVIDUAL"), ("I2", "INDIVIDUAL"))
+    ]
+    test_client.put(f"/api/clientes/{ids[-1]}", json={"activo": "NO"})
+
+    response = test_client.get("/api/clientes/estadisticas/resumen")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "total_clientes": 3,
+        "activos": 2,
+        "inactivos": 1,
+        "individuales": 2,
+        "empresas": 1
+    }
+
+    # La caché del resumen se invalida al crear un cliente
+    test_client.post("/api/clientes/", json={"nombre": "E2", "tipo_cliente": "EMPRESA"})
+    assert test_client.get("/api/clientes/estadisticas/resumen").json()["empresas"] == 2
@@ -93,6 +93,28 @@ def test_crear_factura_basica(test_client, setup_data):
     assert data["id_cliente"] == setup_data["cliente_id"]
     assert float(data["monto_total"]) == 113.00
 
+def test_crear_factura_email_cliente(test_client, setup_data):
+    """El email del cliente legacy se valida con EmailStr; un string vacío equivale a omitirlo"""
+    factura_data = {
+        "cliente": "Cliente de mostrador",
+        "subtotal": 100.00,
+        "iva": 13.00,
+        "monto_total": 113.00,
+    }
+
+    invalido = test_client.post("/api/facturas/", json={**factura_data, "email_cliente": "no-es-email"})
+    vacio = test_client.post("/api/facturas/", json={**factura_data, "email_cliente": ""})
+    # Con id_cliente se usa la forma normalizada: los campos de cliente legacy no aplican
+    normalizada = test_client.post("/api/facturas/", json={
+        **factura_data, "id_cliente": setup_data["cliente_id"], "email_cliente": "no-es-email"
+    })
+
+    assert invalido.status_code == 422
+    assert vacio.status_code == 201
+    assert vacio.json()["cliente"] == "Cliente de mostrador"
+    assert normalizada.status_code == 201
+    assert normalizada.json()["email_cliente"] is None
+
 def test_crear_factura_con_detalles(test_client, setup_data):
     """Probar creación de factura completa con líneas de detalle"""
     fecha_vencimiento = (datetime.now() + timedelta(days=30)).isoformat()
@@ -125,6 +147,89 @@ def test_crear_factura_con_detalles(test_client, setup_data):
     assert "numero_factura" in data
     assert float(data["monto_total"]) == pytest.approx(197.75, 0.01)
 
+def test_crear_factura_con_descuento_monto_en_linea(test_client, setup_data):
+    """El descuento en monto de una línea también se refleja en los totales de la factura"""
+    factura_data = {
+        "id_cliente": setup_data["cliente_id"],
+        "detalles": [
+            {
+                "id_producto": setup_data["producto1_id"],
+                "cantidad": 2,
+                "precio_unitario": 50.00,
+                "descuento_monto": 10.00
+            }
+        ]
+    }
+
+    response = test_client.post("/api/facturas/con-detalles", json=factura_data)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["subtotal"] == pytest.approx(90.00)
+    assert data["monto_total"] == pytest.approx(101.70)
+
+def test_crear_factura_descuenta_stock(test_client, setup_data):
+    """El stock se descuenta una vez por producto, sumando las líneas repetidas"""
+    factura_data = {
+        "id_cliente": setup_data["cliente_id"],
+        "detalles": [
+            {"id_producto": setup_data["producto1_id"], "cantidad": 2, "precio_unitario": 50.00},
+            {"id_producto": setup_data["producto2_id"], "cantidad": 1, "precio_unitario": 75.00},
+            {"id_producto": setup_data["producto1_id"], "cantidad": 3, "precio_unitario": 50.00}
+        ]
+    }
+
+    response = test_client.post("/api/facturas/con-detalles", json=factura_data)
+
+    assert response.status_code == 201
+    producto1 = test_client.get(f"/api/productos/{setup_data['producto1_id']}").json()
+    producto2 = test_client.get(f"/api/productos/{setup_data['producto2_id']}").json()
+    assert float(producto1["stock_actual"]) == 95
+    assert float(producto2["stock_actual"]) == 49
+
+def test_crear_factura_lineas_repetidas_sin_stock(test_client, setup_data):
+    """El stock se valida contra la suma de las líneas repetidas del mismo producto"""
+    producto_id = test_client.post("/api/productos", json={
+        "codigo": "FACT-PROD-STOCK",
+        "nombre": "Producto con poco stock",
+        "tipo": "PRODUCTO",
+        "precio_unitario": 10.00,
+        "stock_actual": 5,
+        "stock_minimo": 1,
+        "aplica_iva": "SI",
+        "activo": "SI"
+    }).json()["id_producto"]
+    factura_data = {
+        "id_cliente": setup_data["cliente_id"],
+        "detalles": [
+            {"id_producto": producto_id, "cantidad": 3, "precio_unitario": 10.00},
+            {"id_producto": producto_id, "cantidad": 3, "precio_unitario": 10.00}
+        ]
+    }
+
+    response = test_client.post("/api/facturas/con-detalles", json=factura_data)
+
+    assert response.status_code == 400
+    assert "Stock insuficiente" in response.json()["detail"]
+    producto = test_client.get(f"/api/productos/{producto_id}").json()
+    assert float(producto["stock_actual"]) == 5
+
+def test_crear_factura_con_productos_inexistentes(test_client, setup_data):
+    """Los productos inexistentes se reportan juntos en un solo 404"""
+    factura_data = {
+        "id_cliente": setup_data["cliente_id"],
+        "detalles": [
+            {"id_producto": setup_data["producto1_id"], "cantidad": 1, "precio_unitario": 50.00},
+            {"id_producto": 998, "cantidad": 1, "precio_unitario": 10.00},
+            {"id_producto": 999, "cantidad": 1, "precio_unitario": 10.00}
+        ]
+    }
+
+    response = test_client.post("/api/facturas/con-detalles", json=factura_data)
+
+    assert response.status_code == 404
+    assert "998, 999" in response.json()["detail"]
+
 def test_crear_factura_con_descuento(test_client, setup_data):
     """Probar creación de factura con descuento"""
     fecha_emision = datetime.now().isoformat()
@@ -177,6 +282,7 @@ def test_listar_facturas(test_client, setup_data):
     assert response.status_code == 200
     data = response.json()
     assert len(data) >= 2
+    assert data[0]["cliente"] == "Cliente Test Factura"
 
 def test_obtener_factura_por_id(test_client, setup_data):
     """Probar obtención de factura por ID"""
@@ -206,6 +312,23 @@ def test_obtener_factura_por_id(test_client, setup_data):
     assert data["id_factura"] == factura_id
     assert data["numero_factura"] == numero_factura
 
+def test_numero_factura_correlativo(test_client, setup_data):
+    """Cada factura toma el siguiente correlativo del año desde factura_contador"""
+    factura_data = {
+        "id_cliente": setup_data["cliente_id"],
+        "subtotal": 10.00,
+        "iva": 1.30,
+        "monto_total": 11.30,
+    }
+
+    numeros = [
+        test_client.post("/api/facturas/", json=factura_data).json()["numero_factura"]
+        for _ in range(2)
+    ]
+
+    año = datetime.now().year
+    assert numeros == [f"FACT-{año}-0001", f"FACT-{año}-0002"]
+
 def test_actualizar_estado_factura(test_client, setup_data):
     """Probar actualización de factura (notas)"""
     fecha_vencimiento = (datetime.now() + timedelta(days=30)).isoformat()
@@ -281,3 +404,108 @@ def test_factura_multiples_productos_con_iva_mixto(test_client, setup_data):
     data = response.json()
     assert float(data["iva"]) == pytest.approx(6.50, 0.01)
     assert float(data["monto_total"]) == pytest.approx(156.50, 0.01)
+
+def test_descargar_factura_pdf_excel_json(test_client, setup_data):
+    """Probar descargas de factura con líneas de detalle precargadas"""
+    factura_data = {
+        "id_cliente": setup_data["cliente_id"],
+        "condiciones_pago": "Contado",
+        "descuento_global": 0.00,
+        "detalles": [
+            {
+                "id_producto": setup_data["producto1_id"],
+                "cantidad": 2,
+                "precio_unitario": 50.00,
+                "descuento_monto": 0.00
+            }
+        ]
+    }
+    factura_id = test_client.post("/api/facturas/con-detalles", json=factura_data).json()["id_factura"]
+    
+    pdf = test_client.get(f"/api/facturas/{factura_id}/descargar-pdf")
+    assert pdf.status_code == 200
+    assert pdf.headers["content-type"] == "application/pdf"
+    assert pdf.content.startswith(b"%PDF")
+    
+    # Segunda descarga con el ETag recibido: 304 sin regenerar el PDF
+    no_modificado = test_client.get(
+        f"/api/facturas/{factura_id}/descargar-pdf",
+        headers={"If-None-Match": pdf.headers["etag"]}
+    )
+    assert no_modificado.status_code == 304
+    
+    excel = test_client.get(f"/api/facturas/{factura_id}/descargar-excel")
+    assert excel.status_code == 200
+    assert excel.content.startswith(b"PK")
+    
+    data = test_client.get(f"/api/facturas/{factura_id}/descargar-json").json()
+    assert len(data["detalles"]) == 1
+    assert data["detalles"][0]["producto"]["nombre"] == "Producto Factura 1"
+
+
+def test_descargar_factura_demasiado_grande(test_client, setup_data):
+    """Probar que no se genera PDF/Excel para facturas que exceden los límites"""
+    factura_data = {
+        "id_cliente": setup_data["cliente_id"],
+        "notas": "x" * 10_001,
+        "detalles": [
+            {
+                "id_producto": setup_data["producto1_id"],
+                "cantidad": 1,
+                "precio_unitario": 50.00
+            }
+        ]
+    }
+    factura_id = test_client.post("/api/facturas/con-detalles", json=factura_data).json()["id_factura"]
+    
+    assert test_client.get(f"/api/facturas/{factura_id}/descargar-pdf").status_code == 413
+    assert test_client.get(f"/api/facturas/{factura_id}/descargar-excel").status_code == 413
+
+
+def test_listar_facturas_con_cursor(test_client, setup_data):
+    """Probar paginación por cursor (keyset) del listado de facturas"""
+    for _ in range(3):
+        test_client.post("/api/facturas/", json={
+            "id_cliente": setup_data["cliente_id"],
+            "subtotal": 100.00,
+            "descuento": 0.00,
+            "iva": 13.00,
+            "monto_total": 113.00
+        })
+    
+    primera = test_client.get("/api/facturas/", params={"limit": 2})
+    assert primera.status_code == 200
+    assert len(primera.json()) == 2
+    cursor = primera.headers["x-next-cursor"]
+    
+    segunda = test_client.get("/api/facturas/", params={"limit": 2, "cursor": cursor})
+    assert segunda.status_code == 200
+    assert len(segunda.json()) == 1
+    assert "x-next-cursor" not in segunda.headers
+    
+    ids = {f["id_factura"] for f in primera.json() + segunda.json()}
+    assert len(ids) == 3
+    
+    assert test_client.get("/api/facturas/", params={"cursor": "no-es-un-cursor"}).status_code == 400
+
+
+def test_estadisticas_reflejan_nueva_factura(test_client, setup_data):
+    """Probar que las estadísticas en caché se invalidan al crear una factura"""
+    factura_data = {
+        "id_cliente": setup_data["cliente_id"],
+        "subtotal": 100.00,
+        "descuento": 0.00,
+        "iva": 13.00,
+        "monto_total": 113.00
+    }
+    test_client.post("/api/facturas/", json=factura_data)
+    
+    resumen = test_client.get("/api/facturas/estadisticas/resumen").json()
+    assert resumen["total_facturas"] == 1
+    
+    test_client.post("/api/facturas/", json=factura_data)
+    
+    resumen = test_client.get("/api/facturas/estadisticas/resumen").json()
+    assert resumen["total_facturas"] == 2
+    top = test_client.get("/api/facturas/estadisticas/top-clientes").json()
+    assert top[0]["total_compras"] == 2
@@ -9,6 +9,7 @@ import pytest
 from fastapi.testclient import TestClient
 from BE.app.main import app
 from BE.app.db import Base, engine
+from BE.app.paginacion import codificar_cursor
 
 @pytest.fixture
 def test_client():
@@ -58,6 +59,14 @@ def test_crear_servicio(test_client):
     data = response.json()
     assert data["tipo"] == "SERVICIO"
 
+def test_crear_producto_tipo_invalido(test_client):
+    """El tipo solo admite PRODUCTO o SERVICIO"""
+    response = test_client.post("/api/productos/", json={
+        "nombre": "Caja", "tipo": "INSUMO", "precio_unitario": 1.00
+    })
+
+    assert response.status_code == 422
+
 def test_listar_productos(test_client):
     """Probar listado de productos"""
     prod1 = {
@@ -76,3 +85,79 @@ def test_listar_productos(test_client):
     data = response.json()
     assert isinstance(data, list)
     assert len(data) >= 1
+
+def test_estadisticas_productos(test_client):
+    """Probar las estadísticas del catálogo (una sola consulta agregada)"""
+    productos = [
+        {"codigo": "P-1", "nombre": "Cuaderno", "tipo": "PRODUCTO", "precio_unitario": 2.50,
+         "stock_actual": 4, "stock_minimo": 10, "aplica_iva": "SI"},
+        {"codigo": "P-2", "nombre": "Lápiz", "tipo": "PRODUCTO", "precio_unitario": 1.00,
+         "stock_actual": 20, "stock_minimo": 5, "aplica_iva": "SI"},
+        {"codigo": "S-1", "nombre": "Asesoría", "tipo": "SERVICIO", "precio_unitario": 40.00,
+         "aplica_iva": "NO"},
+    ]
+    for producto in productos:
+        assert test_client.post("/api/productos/", json=producto).status_code == 201
+
+    response = test_client.get("/api/productos/estadisticas/resumen")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["productos"] == 2
+    assert data["servicios"] == 1
+    assert data["activos"] == 3
+    assert data["inactivos"] == 0
+    assert data["bajo_stock"] == 1
+    assert data["valor_inventario"] == 30.0
+
+    # Las estadísticas en caché se invalidan al modificar el stock
+    response = test_client.patch("/api/productos/1/stock", params={"cantidad": 10})
+    assert response.status_code == 200
+    data = test_client.get("/api/productos/estadisticas/resumen").json()
+    assert data["bajo_stock"] == 0
+    assert data["valor_inventario"] == 55.0
+
+def test_precio_con_iva(test_client):
+    """Probar el precio con IVA calculado en la base de datos"""
+    con_iva = test_client.post("/api/productos/", json={
+        "codigo": "IVA-1", "nombre": "Mochila", "tipo": "PRODUCTO",
+        "precio_unitario": 25.00, "aplica_iva": "SI"
+    }).json()
+    sin_iva = test_client.post("/api/productos/", json={
+        "codigo": "IVA-2", "nombre": "Libro", "tipo": "PRODUCTO",
+        "precio_unitario": 10.00, "aplica_iva": "NO"
+    }).json()
+
+    response = test_client.get(f"/api/productos/{con_iva['id_producto']}/precio-iva")
+    assert response.status_code == 200
+    assert float(response.json()["precio_con_iva"]) == 28.25
+
+    response = test_client.get(f"/api/productos/{sin_iva['id_producto']}/precio-iva")
+    assert float(response.json()["precio_con_iva"]) == 10.00
+
+    assert test_client.get("/api/productos/999/precio-iva").status_code == 404
+
+def test_bajo_stock_paginado_con_cursor(test_client):
+    """Probar la paginación por cursor de las alertas de bajo stock"""
+    for i, stock in enumerate((3, 1, 2, 50)):
+        response = test_client.post("/api/productos/", json={
+            "codigo": f"BS-{i}", "nombre": f"Producto {i}", "tipo": "PRODUCTO",
+            "precio_unitario": 1.00, "stock_actual": stock, "stock_minimo": 10
+        })
+        assert response.status_code == 201
+
+    primera = test_client.get("/api/productos/alertas/bajo-stock", params={"limit": 2})
+    assert primera.status_code == 200
+    assert [p["codigo"] for p in primera.json()] == ["BS-1", "BS-2"]
+    cursor = primera.headers["X-Next-Cursor"]
+
+    segunda = test_client.get("/api/productos/alertas/bajo-stock", params={"limit": 2, "cursor": cursor})
+    assert [p["codigo"] for p in segunda.json()] == ["BS-0"]
+    assert "X-Next-Cursor" not in segunda.headers
+
+def test_bajo_stock_cursor_invalido(test_client):
+    """Un cursor manipulado con un stock no numérico devuelve 400, no 500"""
+    response = test_client.get(
+        "/api/productos/alertas/bajo-stock", params={"cursor": codificar_cursor("abc", 1)}
+    )
+    assert response.status_code == 400
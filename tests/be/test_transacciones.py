@@ -103,4 +103,126 @@ def test_list_transactions_empty(test_client):
 # - Probar filtrado de transacciones por fecha, período, tipo
 # - Probar validación de período cuando se especifica
 # - Probar creación concurrente de transacciones
-# - Probar transacción con asientos asociados
\ No newline at end of file
+# - Probar transacción con asientos asociados
+
+
+def test_create_transactions_bulk(test_client):
+    """Probar la creación de transacciones en lote con un solo commit"""
+    transacciones = [
+        {
+            "fecha_transaccion": f"2025-08-0{dia}T10:00:00",
+            "descripcion": f"Venta {dia}",
+            "tipo": "INGRESO",
+            "categoria": "VENTA",
+            "usuario_creacion": "estudiante1",
+            "id_periodo": 1
+        }
+        for dia in (1, 2, 3)
+    ]
+
+    response = test_client.post("/api/transacciones/bulk", json=transacciones)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["total"] == 3
+    assert len(set(data["ids_transaccion"])) == 3
+    listado = test_client.get("/api/transacciones/").json()
+    assert sorted(t["descripcion"] for t in listado) == ["Venta 1", "Venta 2", "Venta 3"]
+
+def test_create_transactions_bulk_invalid_period(test_client):
+    """Un período inexistente rechaza todo el lote"""
+    transacciones = [
+        {
+            "fecha_transaccion": "2025-08-01T10:00:00",
+            "descripcion": "Venta",
+            "tipo": "INGRESO",
+            "categoria": "VENTA",
+            "usuario_creacion": "estudiante1",
+            "id_periodo": id_periodo
+        }
+        for id_periodo in (1, 999)
+    ]
+
+    response = test_client.post("/api/transacciones/bulk", json=transacciones)
+
+    assert response.status_code == 400
+    assert test_client.get("/api/transacciones/").json() == []
+
+def test_periodos_activos_refleja_cierre(test_client):
+    """La lista de períodos activos en caché se invalida al cerrar un período"""
+    response = test_client.get("/api/periodos/activos")
+    assert response.status_code == 200
+    assert [p["id_periodo"] for p in response.json()] == [1]
+
+    response = test_client.put("/api/periodos/1", json={"estado": "CERRADO"})
+    assert response.status_code == 200
+
+    assert test_client.get("/api/periodos/activos").json() == []
+
+def test_periodos_activos_etag(test_client):
+    """Con If-None-Match igual al ETag vigente se responde 304 sin cuerpo"""
+    response = test_client.get("/api/periodos/activos")
+    etag = response.headers["ETag"]
+
+    response = test_client.get("/api/periodos/activos", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    test_client.put("/api/periodos/1", json={"estado": "CERRADO"})
+    response = test_client.get("/api/periodos/activos", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_list_transactions_ordered_by_fecha_desc(test_client):
+    """El listado filtrado devuelve primero las transacciones más recientes"""
+    transacciones = [
+        {
+            "fecha_transaccion": fecha,
+            "descripcion": descripcion,
+            "tipo": "INGRESO",
+            "categoria": "VENTA",
+            "usuario_creacion": "estudiante1",
+            "id_periodo": 1
+        }
+        for fecha, descripcion in (
+            ("2025-08-02T10:00:00", "Segunda"),
+            ("2025-08-03T10:00:00", "Tercera"),
+            ("2025-08-01T10:00:00", "Primera"),
+            ("2025-08-03T10:00:00", "Tercera bis"),
+        )
+    ]
+    test_client.post("/api/transacciones/bulk", json=transacciones)
+
+    response = test_client.get("/api/transacciones/", params={"id_periodo": 1})
+
+    assert response.status_code == 200
+    assert [t["descripcion"] for t in response.json()] == [
+        "Tercera bis", "Tercera", "Segunda", "Primera"
+    ]
+
+def test_list_transactions_paginado_con_cursor(test_client):
+    """La cabecera X-Next-Cursor recorre el listado sin OFFSET ni repetidos"""
+    transacciones = [
+        {
+            "fecha_transaccion": f"2025-08-0{dia}T10:00:00",
+            "descripcion": f"Venta {dia}",
+            "tipo": "INGRESO",
+            "categoria": "VENTA",
+            "usuario_creacion": "estudiante1",
+            "id_periodo": 1
+        }
+        for dia in (1, 2, 3)
+    ]
+    test_client.post("/api/transacciones/bulk", json=transacciones)
+
+    primera = test_client.get("/api/transacciones/", params={"limit": 2})
+    cursor = primera.headers["X-Next-Cursor"]
+    segunda = test_client.get("/api/transacciones/", params={"limit": 2, "cursor": cursor})
+
+    assert [t["descripcion"] for t in primera.json()] == ["Venta 3", "Venta 2"]
+    assert [t["descripcion"] for t in segunda.json()] == ["Venta 1"]
+    assert "X-Next-Cursor" not in segunda.headers
+    # Con cursor se ignora un skip sobrante (no salta filas)
+    con_skip = test_client.get("/api/transacciones/", params={"limit": 2, "cursor": cursor, "skip": 1})
+    assert con_skip.json() == segunda.json()
+    assert test_client.get("/api/transacciones/", params={"cursor": "no-valido"}).status_code == 400